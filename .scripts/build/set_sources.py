@@ -1,6 +1,7 @@
 import json
 import os
 import sys
+import time
 
 import boto3
 from botocore.exceptions import ClientError, NoCredentialsError, PartialCredentialsError
@@ -37,6 +38,39 @@ def get_dynamodb_table_from_ssm(ssm_client: boto3.client) -> str:
     return table_name
 
 
+def to_dynamodb_value(value: object) -> dict:
+    """
+    Converts a JSON value (string, list or object) into the DynamoDB attribute value format.
+    """
+    if isinstance(value, dict):
+        return {"M": {key: to_dynamodb_value(item) for key, item in value.items()}}
+    if isinstance(value, list):
+        return {"L": [to_dynamodb_value(item) for item in value]}
+    return {"S": str(value)}
+
+
+def bump_source_versions(dynamodb_client: boto3.client, table_name: str, partitions: set[str]) -> None:
+    """
+    Writes a new version stamp for every source partition that was loaded.
+    Warm reader containers compare it with the version they cached and reload the sources when it changed.
+
+    Args:
+        dynamodb_client: The boto3 client for DynamoDB.
+        table_name: The name of the news table.
+        partitions: The SOURCE#{country}#{language} partition keys to bump.
+    """
+    version = str(time.time_ns())
+    for pk_value in sorted(partitions):
+        try:
+            dynamodb_client.put_item(
+                TableName=table_name,
+                Item={"pk": {"S": pk_value}, "sk": {"S": "VERSION"}, "Version": {"S": version}},
+            )
+            print(f"Bumped source version of {pk_value} to {version}")
+        except ClientError as e:
+            print(f"AWS Error bumping source version of '{pk_value}': {e}")
+
+
 # --- Helper Function to Transform Source to DynamoDB Item ---
 def transform_source_to_dynamodb_item(source_data: dict) -> dict | None:
     """
@@ -89,6 +123,11 @@ def transform_source_to_dynamodb_item(source_data: dict) -> dict | None:
         # Assign the transformed map to the 'Feeds' key in the DynamoDB item
         dynamodb_item["Feeds"] = {"M": dynamodb_feeds_map}
 
+        # Optional field mapping for the generic feed parser (SourceName, SourceId, Fields, Namespaces)
+        parser_mapping = source_data.get("PARSER")
+        if isinstance(parser_mapping, dict):
+            dynamodb_item["Parser"] = to_dynamodb_value(parser_mapping)
+
         return dynamodb_item
 
     except Exception as e:  # noqa: BLE001
@@ -141,6 +180,7 @@ def main() -> None:  # noqa: C901, PLR0915
     print(f"Found {len(sources_list)} source(s) to process.")
     items_added = 0
     items_failed = 0
+    updated_partitions: set[str] = set()
 
     for source_data in sources_list:
         print("-" * 20)
@@ -161,6 +201,7 @@ def main() -> None:  # noqa: C901, PLR0915
             dynamodb_client.put_item(TableName=table_name, Item=dynamodb_item)
             print(f"Successfully added source: {short_name}")
             items_added += 1
+            updated_partitions.add(dynamodb_item["pk"]["S"])
         except ClientError as e:
             print(f"AWS Error putting item for '{short_name}': {e}")
             items_failed += 1
@@ -168,6 +209,9 @@ def main() -> None:  # noqa: C901, PLR0915
             print(f"An unexpected error occurred putting item for '{short_name}': {e}")
             items_failed += 1
 
+    print("-" * 20)
+    bump_source_versions(dynamodb_client, table_name, updated_partitions)
+
     print("-" * 20)
     print("Finished processing sources.")
     print(f"Summary: Added={items_added}, Failed/Skipped={items_failed}")
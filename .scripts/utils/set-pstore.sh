@@ -6,4 +6,10 @@ PROJECT_NAME=$(cat config.json | jq -r '.PROJECT_NAME' | tr -d ' ')
 geminiApiKey=$(aws dynamodb get-item --table-name "${PROJECT_NAME}-Table" --key '{"pk": {"S": "APP#DATA"}, "sk": {"S": "GEMINI"}}' --query "Item.API_KEY.S" --output text)
 
 # Add to a SSM Parameter Store
-aws ssm put-parameter --name "/${PROJECT_NAME}/keys/GEMINI_API_KEY" --value "${geminiApiKey}" --type "SecureString" --overwrite
\ No newline at end of file
+aws ssm put-parameter --name "/${PROJECT_NAME}/keys/GEMINI_API_KEY" --value "${geminiApiKey}" --type "SecureString" --overwrite
+
+# Create the WebSub secret once. Subscription secrets and callback tokens derive from it,
+# so it is never overwritten: a new secret would invalidate every subscription.
+if ! aws ssm get-parameter --name "/${PROJECT_NAME}/keys/WEBSUB_SECRET" > /dev/null 2>&1; then
+    aws ssm put-parameter --name "/${PROJECT_NAME}/keys/WEBSUB_SECRET" --value "$(openssl rand -hex 32)" --type "SecureString"
+fi
@@ -6,16 +6,22 @@ import defaults from "./Defaults.json";
 ////////////////////////////////////////////////////////////
 const APP_NAME = config.PROJECT_NAME.trim().replace(/ /g, "");
 const READ_SCHEDULE_HOURS = defaults.READ_SCHEDULE_HOURS;
+const READ_TICK_MINUTES = defaults.READ_TICK_MINUTES;
+const READ_CONSOLIDATED_UPLOAD = defaults.READ_CONSOLIDATED_UPLOAD;
+const READ_WORKER_BATCH_SIZE = defaults.READ_WORKER_BATCH_SIZE;
 const NEWS_TTL_DAYS = defaults.NEWS_TTL_DAYS;
 const NEWS_FEED_BUCKET = defaults.NEWS_FEED_BUCKET;
 const ARN_POWERTOOLS_LAYER = "arn:aws:lambda:us-east-1:017000801446:layer:AWSLambdaPowertoolsPythonV3-python312-x86_64:18";
 const GEMINI_MODEL_NAME = "gemma-3-27b-it";
 
-const LOG_LEVEL = "DEBUG";
+const LOG_LEVEL = "INFO";
 
 export const CONSTANTS = {
     APP_NAME,
     READ_SCHEDULE_HOURS,
+    READ_TICK_MINUTES,
+    READ_CONSOLIDATED_UPLOAD,
+    READ_WORKER_BATCH_SIZE,
     NEWS_TTL_DAYS,
     NEWS_FEED_BUCKET,
     ARN_POWERTOOLS_LAYER,
@@ -31,6 +37,7 @@ export const PARAMS = {
     PROCESSED_QUEUE_ARN: `/${APP_NAME}/common/processed-queue-arn`,
     SUMMARISED_QUEUE_ARN: `/${APP_NAME}/common/summarised-queue-arn`,
     GEMINI_API_KEY: `/${APP_NAME}/keys/GEMINI_API_KEY`,
+    WEBSUB_SECRET: `/${APP_NAME}/keys/WEBSUB_SECRET`,
 };
 
 export type ParamsType = typeof PARAMS;
@@ -5,8 +5,11 @@ import {
     aws_events as events,
     aws_logs as logs,
     aws_events_targets as targets,
+    aws_iam as iam,
     aws_ssm as ssm,
     aws_dynamodb as dynamodb,
+    aws_sqs as sqs,
+    aws_lambda_event_sources as lambdaEventSources,
     Duration,
     RemovalPolicy,
 } from "aws-cdk-lib";
@@ -53,7 +56,35 @@ export class ReaderStack extends Stack {
         // Configure the News Table
         const newsTable = dynamodb.Table.fromTableName(this, `${props.constants.APP_NAME}-NewsTable`, tableName.stringValue);
 
-        // Configure the Reader Lambda
+        // Work queue: the dispatcher sends small batches of due feeds, which the workers read
+        const workDLQ = new sqs.Queue(this, `${props.constants.APP_NAME}-ReaderWorkDLQ`, {
+            queueName: `${props.constants.APP_NAME}-ReaderWorkDLQ`,
+        });
+
+        const workQueue = new sqs.Queue(this, `${props.constants.APP_NAME}-ReaderWorkQueue`, {
+            queueName: `${props.constants.APP_NAME}-ReaderWorkQueue`,
+            removalPolicy: RemovalPolicy.DESTROY,
+            visibilityTimeout: Duration.seconds(180),
+            deadLetterQueue: {
+                maxReceiveCount: 2,
+                queue: workDLQ,
+            },
+        });
+
+        const readerEnvironment = {
+            NEWS_FEED_BUCKET: props.constants.NEWS_FEED_BUCKET,
+            NEWS_TABLE_NAME: tableName.stringValue,
+            POWERTOOLS_LOG_LEVEL: props.constants.LOG_LEVEL,
+            // Each feed is polled between once per tick and once per READ_SCHEDULE_HOURS, depending on how often it publishes
+            READER_MIN_INTERVAL_MINUTES: String(props.constants.READ_TICK_MINUTES),
+            READER_MAX_INTERVAL_MINUTES: String(props.constants.READ_SCHEDULE_HOURS * 60),
+            // Write one manifest-plus-items object per run instead of one object per feed
+            READER_CONSOLIDATED_UPLOAD: String(props.constants.READ_CONSOLIDATED_UPLOAD),
+            READER_WORK_QUEUE_NAME: workQueue.queueName,
+            READER_WORKER_BATCH_SIZE: String(props.constants.READ_WORKER_BATCH_SIZE),
+        };
+
+        // Configure the Reader Lambda: dispatches the due feeds of a source to the work queue
         const readerFn = new lambda.Function(this, `${props.constants.APP_NAME}-Reader`, {
             functionName: `${props.constants.APP_NAME}-Reader`,
             runtime: lambda.Runtime.PYTHON_3_12,
@@ -61,19 +92,75 @@ export class ReaderStack extends Stack {
             code: lambda.Code.fromAsset(join(__dirname, "fn/reader")),
             layers: [commonLayer, powertoolsLayer],
             timeout: Duration.seconds(120),
+            environment: readerEnvironment,
+        });
+
+        // Configure the Reader Worker Lambda: fetches, parses and uploads a batch of feeds per message
+        const readerWorkerFn = new lambda.Function(this, `${props.constants.APP_NAME}-ReaderWorker`, {
+            functionName: `${props.constants.APP_NAME}-ReaderWorker`,
+            runtime: lambda.Runtime.PYTHON_3_12,
+            handler: "app.worker",
+            code: lambda.Code.fromAsset(join(__dirname, "fn/reader")),
+            layers: [commonLayer, powertoolsLayer],
+            timeout: Duration.seconds(120),
+            environment: readerEnvironment,
+        });
+
+        readerWorkerFn.addEventSource(
+            new lambdaEventSources.SqsEventSource(workQueue, {
+                enabled: true,
+                batchSize: 1,
+                reportBatchItemFailures: true,
+            })
+        );
+        workQueue.grantSendMessages(readerFn);
+        // Workers hand the feeds they cannot start before their deadline back to the queue
+        workQueue.grantSendMessages(readerWorkerFn);
+
+        // Configure the Reader Push Lambda: the WebSub callback, which reads the content hubs push for subscribed feeds
+        const readerPushFn = new lambda.Function(this, `${props.constants.APP_NAME}-ReaderPush`, {
+            functionName: `${props.constants.APP_NAME}-ReaderPush`,
+            runtime: lambda.Runtime.PYTHON_3_12,
+            handler: "app.push",
+            code: lambda.Code.fromAsset(join(__dirname, "fn/reader")),
+            layers: [commonLayer, powertoolsLayer],
+            timeout: Duration.seconds(60),
             environment: {
-                NEWS_FEED_BUCKET: props.constants.NEWS_FEED_BUCKET,
-                NEWS_TABLE_NAME: tableName.stringValue,
-                POWERTOOLS_LOG_LEVEL: props.constants.LOG_LEVEL,
+                ...readerEnvironment,
+                // Pushed content is read in place, never handed off to the workers
+                READER_WORK_QUEUE_NAME: "",
+                SSM_WEBSUB_SECRET: props.params.WEBSUB_SECRET,
             },
         });
 
+        // Hubs call the callback without AWS credentials. Requests are checked with the subscription's secret instead.
+        const readerPushUrl = readerPushFn.addFunctionUrl({
+            authType: lambda.FunctionUrlAuthType.NONE,
+        });
+
+        // The dispatcher subscribes the feeds that advertise a hub, and renews their leases
+        readerFn.addEnvironment("WEBSUB_CALLBACK_URL", readerPushUrl.url);
+        readerFn.addEnvironment("SSM_WEBSUB_SECRET", props.params.WEBSUB_SECRET);
+
+        const websubSecretPolicy = new iam.PolicyStatement({
+            effect: iam.Effect.ALLOW,
+            actions: ["ssm:GetParameter"],
+            resources: [`arn:aws:ssm:${this.region}:${this.account}:parameter${props.params.WEBSUB_SECRET}`],
+        });
+        readerFn.addToRolePolicy(websubSecretPolicy);
+        readerPushFn.addToRolePolicy(websubSecretPolicy);
+
         const bucket = s3.Bucket.fromBucketName(this, `${props.constants.APP_NAME}-NewsFeedBucket`, props.constants.NEWS_FEED_BUCKET);
         bucket.grantReadWrite(readerFn);
-        newsTable.grantReadData(readerFn);
+        bucket.grantReadWrite(readerWorkerFn);
+        bucket.grantReadWrite(readerPushFn);
+        newsTable.grantReadWriteData(readerFn);
+        newsTable.grantReadWriteData(readerWorkerFn);
+        newsTable.grantReadWriteData(readerPushFn);
         const rule = new events.Rule(this, `${props.constants.APP_NAME}-ReaderSchedulerRule`, {
             ruleName: `${props.constants.APP_NAME}-ReaderSchedulerRule`,
-            schedule: events.Schedule.rate(Duration.hours(props.constants.READ_SCHEDULE_HOURS)),
+            // Frequent tick. The reader only fetches the feeds whose next due time has passed
+            schedule: events.Schedule.rate(Duration.minutes(props.constants.READ_TICK_MINUTES)),
         });
 
         const newsSources = JSON.parse(readFileSync(join(__dirname, "../../NewsSources.json"), "utf8"));
@@ -95,5 +182,17 @@ export class ReaderStack extends Stack {
             removalPolicy: RemovalPolicy.DESTROY,
             retention: logs.RetentionDays.TWO_WEEKS,
         });
+
+        new logs.LogGroup(this, `${props.constants.APP_NAME}-ReaderWorkerLogGroup`, {
+            logGroupName: `/aws/lambda/${props.constants.APP_NAME}-ReaderWorker`,
+            removalPolicy: RemovalPolicy.DESTROY,
+            retention: logs.RetentionDays.TWO_WEEKS,
+        });
+
+        new logs.LogGroup(this, `${props.constants.APP_NAME}-ReaderPushLogGroup`, {
+            logGroupName: `/aws/lambda/${props.constants.APP_NAME}-ReaderPush`,
+            removalPolicy: RemovalPolicy.DESTROY,
+            retention: logs.RetentionDays.TWO_WEEKS,
+        });
     }
 }
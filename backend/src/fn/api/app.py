@@ -5,6 +5,7 @@
 
 # ==================================================================================================
 # Python imports
+import logging
 from typing import Annotated, Optional
 
 # ==================================================================================================
@@ -17,7 +18,7 @@ from aws_lambda_powertools.utilities.typing import LambdaContext
 # Module imports
 from lib.feed_handler import get_feed
 from shared.lambda_response import RESPONSE
-from shared.logger import logger
+from shared.logger import log_payload, logger
 from shared.news_model import BatchActionModel
 
 # ==================================================================================================
@@ -51,7 +52,7 @@ def feed() -> dict:
     # Fetch all news items that are published in last 24 hours
 
     response = {"message": "Hello, World!"}  # get_feed(duration_hours=DURATION_HOURS)
-    logger.info(response)
+    log_payload("Response", response)
     logger.info(f"Count: {len(response)}")
 
     return RESPONSE(response)
@@ -98,7 +99,7 @@ def feed_latest(
         params=response_params,
     )
 
-    logger.info(response)
+    log_payload("Response", response)
 
     return RESPONSE(response)
 
@@ -144,7 +145,7 @@ def feed_top(
         params=response_params,
     )
 
-    logger.info(response)
+    log_payload("Response", response)
 
     return RESPONSE(response)
 
@@ -179,5 +180,5 @@ def main(event: dict, context: LambdaContext) -> dict:
     The lambda handler method: It resolves the proxy route and invokes the appropriate method
     """
 
-    logger.info(event)
+    log_payload("Event", event, level=logging.INFO)
     return app.resolve(event, context)
@@ -5,11 +5,9 @@
 
 # ==================================================================================================
 # Python imports
-import json  # noqa: I001
+import logging
 import os
 
-from pydantic import ValidationError
-
 # ==================================================================================================
 # AWS imports
 import boto3
@@ -19,15 +17,16 @@ from aws_lambda_powertools.utilities.typing import LambdaContext
 # ==================================================================================================
 # Module imports
 from lib.aws_utils import get_feed_from_s3
-from lib.preprocess import inject_data, validate_feed_items
-from shared.logger import logger
-from shared.news_model import ProcessedNewsItemModel
+from lib.batch_sender import BatchSender
+from lib.preprocess import inject_data, serialise_feed_items, validate_feed_items
+from shared.logger import log_payload, logger
 
 # ==================================================================================================
 # Global declarations
 
 PROCESSED_NEWS_QUEUE_NAME = os.environ["PROCESSED_NEWS_QUEUE_NAME"]
 processed_news_queue = boto3.resource("sqs").get_queue_by_name(QueueName=PROCESSED_NEWS_QUEUE_NAME)
+processed_news_sender = BatchSender(processed_news_queue.meta.client, processed_news_queue.url)
 
 
 @event_source(data_class=EventBridgeEvent)
@@ -36,7 +35,7 @@ def main(event: EventBridgeEvent, context: LambdaContext) -> dict:
     This function is used to read RSS feeds
     """
     logger.info("Processing feed!")
-    logger.info(event.raw_event)
+    log_payload("Event", event.raw_event, level=logging.INFO)
     logger.info(context)
 
     bucket_name: str = event["detail"]["bucket"]["name"]
@@ -46,28 +45,25 @@ def main(event: EventBridgeEvent, context: LambdaContext) -> dict:
 
     logger.info("Reading file from S3")
 
-    try:
-        feed = get_feed_from_s3(bucket_name, object_name)
-    except ValidationError as e:
-        logger.error(f"Validation error for feed {object_name}", exc_info=e)
-        raise e
+    feed_data = get_feed_from_s3(bucket_name, object_name)
 
-    feed_with_metadata = inject_data(feed)
+    # Each item is validated once, here, and serialised once, when it is sent
+    validated_feed, defective_feed = validate_feed_items(feed_data)
 
-    validated_feed, defective_feed = validate_feed_items(feed_with_metadata.model_dump()["feed"])
+    logger.info(f"Validated {len(validated_feed.feed)} items, {len(defective_feed)} defective")
+    if defective_feed:
+        log_payload("Defective feed", defective_feed, level=logging.WARNING)
 
-    logger.info(f"Validated feed: {validated_feed}")
-    logger.info(f"Defective feed: {defective_feed}")
+    feed_with_metadata = inject_data(validated_feed)
+    messages = serialise_feed_items(feed_with_metadata)
+    log_payload("Processed feed", messages)
 
-    # Send the message to SQS
-    for item in validated_feed:
-        logger.info(f"Processing item {item}")
-        ProcessedNewsItemModel.model_validate(item)
-        # query dynamodb to see if the item exists by using "item_hash" as the sk in LSI named "byItemHash"
-        try:
-            processed_news_queue.send_message(MessageBody=json.dumps(item))
-        except Exception as e:
-            logger.error(f"Error sending message to SQS: {e}")
-            raise e
+    # Send the messages to SQS in batches
+    try:
+        calls = processed_news_sender.send(messages)
+    except Exception as e:
+        logger.error(f"Error sending messages to SQS: {e}")
+        raise e
+    logger.info(f"Sent {len(messages)} items to SQS in {calls} batches")
 
     return {"statusCode": 200, "body": "Success"}
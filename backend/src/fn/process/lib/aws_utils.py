@@ -6,8 +6,7 @@
 
 # ==================================================================================================
 # Python imports
-import json
-from pathlib import Path
+import logging
 
 # ==================================================================================================
 # AWS imports
@@ -16,30 +15,34 @@ from botocore.exceptions import ClientError
 
 # ==================================================================================================
 # Module imports
-from shared.logger import logger
-from shared.news_model import SourceNewsFeedModel, SourceNewsItemModel
+from shared.feed_codec import decode_feed, split_feed
+from shared.logger import log_payload, logger
 
 # ==================================================================================================
 # Global declarations
 
 
-def get_feed_from_s3(bucket_name: str, s3_object_name: str) -> SourceNewsFeedModel:
+def get_feed_from_s3(bucket_name: str, s3_object_name: str) -> list[dict]:
     """
-    This function gets the stored feed from S3
+    This function gets the stored feed items from S3. They are validated by validate_feed_items.
     """
     logger.info(f"Getting feed from S3: {bucket_name}/{s3_object_name}")
     s3_client = boto3.client("s3")
 
     try:
-        s3_client.download_file(bucket_name, s3_object_name, f"/tmp/{s3_object_name}")  # noqa: S108
+        response = s3_client.get_object(Bucket=bucket_name, Key=s3_object_name)
+        body = response["Body"].read()
     except ClientError as s3_error:
         logger.error(f"Error getting feed from S3: {s3_error}")
         raise s3_error
 
-    with Path(f"/tmp/{s3_object_name}").open("r", encoding="utf-8") as infile:  # noqa: S108
-        feed_data = json.load(infile)
+    # Objects written before compression was introduced have no Content-Encoding and are plain JSON
+    # A consolidated run object carries the items of every feed of a source, led by a manifest
+    manifest, feed_data = split_feed(decode_feed(body, response.get("ContentEncoding")))
+    if manifest is not None:
+        log_payload("Run manifest", manifest, level=logging.INFO)
 
-    logger.info(f"Feed data: {feed_data}")
-    feed = SourceNewsFeedModel(feed=[SourceNewsItemModel.model_validate(item) for item in feed_data])
+    logger.info(f"Read {len(feed_data)} items from {s3_object_name}")
+    log_payload("Feed data", feed_data)
 
-    return feed
+    return feed_data
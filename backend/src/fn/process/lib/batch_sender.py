@@ -0,0 +1,150 @@
+"""
+# --*-- coding: utf-8 --*--
+# Batch sender
+# Sends the processed items of a feed to SQS with SendMessageBatch instead of one SendMessage per item.
+# Messages are packed into batches of up to 10 entries under the 256 KB request limit, the batches are sent
+# concurrently, and only the entries SQS reports as failed are retried.
+"""
+
+# ==================================================================================================
+# Python imports
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from botocore.client import BaseClient
+
+# ==================================================================================================
+# Module imports
+from shared.logger import logger
+
+# ==================================================================================================
+# Global declarations
+
+# SQS accepts at most 10 entries and 256 KB of message bodies per SendMessageBatch call
+SQS_MAX_BATCH_ENTRIES = 10
+SQS_MAX_BATCH_BYTES = 256 * 1024
+MAX_WORKERS = int(os.environ.get("PROCESS_SEND_MAX_WORKERS", "4"))
+# Attempts per entry, including the first one
+MAX_ATTEMPTS = int(os.environ.get("PROCESS_SEND_MAX_ATTEMPTS", "3"))
+RETRY_BASE_SECONDS = 0.2
+
+
+class BatchSendError(Exception):
+    """
+    Raised when some messages could not be sent after every attempt
+    """
+
+    def __init__(self, failed: dict[str, str]) -> None:
+        self.failed = failed
+        super().__init__(f"{len(failed)} messages could not be sent: {', '.join(sorted(set(failed.values())))}")
+
+
+def build_batches(
+    entries: dict[str, str],
+    max_entries: int = SQS_MAX_BATCH_ENTRIES,
+    max_bytes: int = SQS_MAX_BATCH_BYTES,
+) -> tuple[list[list[dict]], dict[str, str]]:
+    """
+    Packs the message bodies, keyed by entry id, into SendMessageBatch entry lists in order.
+    Returns the batches and the entries that are too large to be sent at all, with the reason.
+    """
+    batches: list[list[dict]] = []
+    oversized: dict[str, str] = {}
+    batch: list[dict] = []
+    batch_bytes = 0
+
+    for entry_id, body in entries.items():
+        size = len(body.encode("utf-8"))
+        if size > max_bytes:
+            oversized[entry_id] = f"message of {size} bytes exceeds the {max_bytes} byte limit"
+            continue
+        if batch and (len(batch) >= max_entries or batch_bytes + size > max_bytes):
+            batches.append(batch)
+            batch, batch_bytes = [], 0
+        batch.append({"Id": entry_id, "MessageBody": body})
+        batch_bytes += size
+
+    if batch:
+        batches.append(batch)
+    return batches, oversized
+
+
+class BatchSender:
+    """
+    Sends messages to an SQS queue in batches. Safe to share between invocations.
+    """
+
+    def __init__(self, client: "BaseClient", queue_url: str, max_workers: int = MAX_WORKERS, max_attempts: int = MAX_ATTEMPTS) -> None:
+        # A low level client, since unlike the resources it is thread safe
+        self.client = client
+        self.queue_url = queue_url
+        self.max_workers = max(1, max_workers)
+        self.max_attempts = max(1, max_attempts)
+
+    def send(self, bodies: list[str]) -> int:
+        """
+        Sends the message bodies. Returns the number of SendMessageBatch calls made.
+
+        Raises:
+            BatchSendError: If some messages could not be sent after every attempt.
+        """
+        pending = {str(index): body for index, body in enumerate(bodies)}
+        failed: dict[str, str] = {}
+        errors: dict[str, str] = {}
+        calls = 0
+
+        for attempt in range(self.max_attempts):
+            if not pending:
+                break
+            if attempt:
+                time.sleep(RETRY_BASE_SECONDS * 2 ** (attempt - 1))
+                logger.warning(f"Retrying {len(pending)} messages, attempt {attempt + 1}/{self.max_attempts}")
+
+            batches, oversized = build_batches(pending)
+            failed.update(oversized)
+            calls += len(batches)
+
+            if len(batches) <= 1 or self.max_workers <= 1:
+                results = [self._send_batch(batch) for batch in batches]
+            else:
+                with ThreadPoolExecutor(max_workers=min(self.max_workers, len(batches))) as executor:
+                    results = list(executor.map(self._send_batch, batches))
+
+            retry: dict[str, str] = {}
+            for retriable, permanent in results:
+                retry.update({entry_id: pending[entry_id] for entry_id in retriable})
+                errors.update(retriable)
+                failed.update(permanent)
+            pending = retry
+
+        # Entries that are still pending after the last attempt fail with their last error
+        failed.update({entry_id: errors[entry_id] for entry_id in pending})
+        if failed:
+            raise BatchSendError(failed)
+        return calls
+
+    def _send_batch(self, batch: list[dict]) -> tuple[dict[str, str], dict[str, str]]:
+        """
+        Sends one batch. Returns the entries worth retrying and the entries that failed for good, with their error.
+        """
+        try:
+            response = self.client.send_message_batch(QueueUrl=self.queue_url, Entries=batch)
+        except Exception as e:  # noqa: BLE001
+            # Throttling, network or service errors: the whole batch is retried
+            logger.error(f"Error sending a batch of {len(batch)} messages to SQS: {e}")
+            return {entry["Id"]: str(e) for entry in batch}, {}
+
+        retriable: dict[str, str] = {}
+        permanent: dict[str, str] = {}
+        for failure in response.get("Failed", []):
+            message = f"{failure.get('Code')}: {failure.get('Message')}"
+            logger.error(f"Message {failure['Id']} was not sent: {message}")
+            # Sender faults, such as an invalid message, fail the same way on every attempt
+            if failure.get("SenderFault"):
+                permanent[failure["Id"]] = message
+            else:
+                retriable[failure["Id"]] = message
+        return retriable, permanent
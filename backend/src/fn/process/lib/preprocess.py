@@ -6,15 +6,12 @@ Inserts metadata into news items
 # ==================================================================================================
 # Python imports
 import os  # noqa: I001
-from datetime import datetime, timedelta, timezone
 
-from dateutil import parser
 from pydantic import ValidationError
 
 # ==================================================================================================
 # Module imports
-from shared.logger import logger
-from shared.time import time_to_unix
+from shared.logger import LOG_RATE_LIMIT_PER_MINUTE, log_payload, logger
 from shared.score import calculate_score, set_random_counts
 from shared.news_model import (
     MetricsModel,
@@ -24,12 +21,13 @@ from shared.news_model import (
     SourceNewsItemModel,
 )
 from shared.url_hasher import hasher
-from shared.uuid import uuid7
+from shared.uuid import uuid7_ms
 
 # ==================================================================================================
 # Global declarations
 
 TTL_DAYS = int(os.environ.get("NEWS_TTL_DAYS", "14"))  # TODO: To be changed to parameter in future
+TTL_SECONDS = TTL_DAYS * 24 * 60 * 60
 
 
 class FeedError(Exception):
@@ -43,86 +41,72 @@ class ParserNotFoundError(FeedError):
 def inject_data(news_items: SourceNewsFeedModel) -> ProcessedNewsFeedModel:
     """
     Inject metadata into news items.
-    Assumes 'published' is an ISO 8601 string. Calculates 'ttl' as a Unix timestamp.
+    The keys and 'ttl' (a Unix timestamp) derive from 'published_ms', so 'published' is not parsed again.
+    The items were validated by validate_feed_items and the metadata is computed here,
+    so the processed items are constructed without being validated again.
     """
     news_items_with_metadata: list[ProcessedNewsItemModel] = []
     for item in news_items.feed:
-        SourceNewsItemModel.model_validate(item)
-
         pk = f"NEWS#{item.country}#{item.language}"
-        sk = str(uuid7(time_to_unix(item.published)))
+        sk = uuid7_ms(item.published_ms)
+        # Stored articles are keyed by the hash of the link as published, so hashing canonical_url instead would
+        # miss every stored article whose link is not canonical. The reader already merges the variants of an
+        # article within a run, and filters the ones a feed has emitted before, by canonical_url.
         item_hash = hasher(f"{pk}#{item.news_url}")
 
         random_counts = set_random_counts()
 
         sk_top = calculate_score(random_counts, sk)
 
-        # Calculate TTL based on the ISO published string
-        ttl = _calculate_ttl(item.published)
+        ttl = item.published_ms // 1000 + TTL_SECONDS
 
         # TODO: This is a temporary solution to set the metrics. This will be set to 0 in the future.
-        metrics = MetricsModel(
+        metrics = MetricsModel.model_construct(
             views=random_counts["view"],
             likes=random_counts["like"],
             shares=random_counts["share"],
             bookmarks=random_counts["bookmark"],
         )
 
+        # The field values of the validated item are reused as they are, media included
         news_items_with_metadata.append(
-            ProcessedNewsItemModel(
+            ProcessedNewsItemModel.model_construct(
                 pk=pk,
                 sk=sk,
                 item_hash=item_hash,
-                **item.model_dump(),
+                **item.__dict__,
                 sk_top=sk_top,
                 ttl=ttl,
                 metrics=metrics,
             ),
         )
 
-    return ProcessedNewsFeedModel(feed=news_items_with_metadata)
+    return ProcessedNewsFeedModel.model_construct(feed=news_items_with_metadata)
 
 
-def validate_feed_items(feed: list[dict]) -> tuple[list[dict], list[dict]]:
+def validate_feed_items(feed: list[dict]) -> tuple[SourceNewsFeedModel, list[dict]]:
     """
-    This function validates the feed items
+    This function validates the feed items read from S3. It is the only place Process validates them.
+    Returns the valid items as a feed, and the defective items as they were read.
     TODO: Also check if any of the mandatory fields are set to null / None.
     """
     logger.info(f"Validating feed items: {len(feed)}")
-    if len(feed) > 0:
-        valid_items = []
-        invalid_items = []
-        for item in feed:
-            try:
-                logger.info(f"Validating item: {item}")
-                news_item = ProcessedNewsItemModel.model_validate(item)
-                valid_items.append(news_item.model_dump())
-            except ValidationError as exception:
-                logger.error(repr(exception.errors()[0]["type"]))
-                invalid_items.append(item)
-
-        return (valid_items, invalid_items)
+    valid_items = []
+    invalid_items = []
+    for item in feed:
+        try:
+            log_payload("Validating item", item, max_per_minute=LOG_RATE_LIMIT_PER_MINUTE)
+            valid_items.append(SourceNewsItemModel.model_validate(item))
+        except ValidationError as exception:
+            logger.error(repr(exception.errors()[0]["type"]))
+            invalid_items.append(item)
 
-    return ([], [])
+    return SourceNewsFeedModel.model_construct(feed=valid_items), invalid_items
 
 
-def _calculate_ttl(published: str) -> int:
+def serialise_feed_items(feed: ProcessedNewsFeedModel) -> list[str]:
     """
-    This function calculates the TTL for a news item
+    Serialises each processed item once, to the JSON body of its queue message
     """
-    try:
-        published_dt = parser.parse(published)
-        # Ensure timezone awareness - if naive, assume UTC as per time_to_iso fallback
-        if published_dt.tzinfo is None:
-            published_dt = published_dt.replace(tzinfo=timezone.utc)
-
-        ttl_dt = published_dt + timedelta(days=TTL_DAYS)
-        ttl = int(ttl_dt.timestamp())
-    except (ValueError, parser.ParserError, TypeError) as e:
-        logger.error(f"Error processing published date '{published}' for TTL calculation: {e}")
-        # Fallback: Set TTL based on current time, or handle error appropriately
-        now_dt = datetime.now(timezone.utc)
-        ttl_dt = now_dt + timedelta(days=TTL_DAYS)
-        ttl = int(ttl_dt.timestamp())
-
-    return ttl
+    return [item.model_dump_json() for item in feed.feed]
+
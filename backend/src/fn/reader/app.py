@@ -5,35 +5,399 @@
 
 # ==================================================================================================
 # Python imports
+import base64
+import json
+import logging
 import os
+import time
+from dataclasses import dataclass, field
 
 # ==================================================================================================
 # AWS imports
-from aws_lambda_powertools.utilities.data_classes import EventBridgeEvent, event_source
+from aws_lambda_powertools.utilities.data_classes import EventBridgeEvent, LambdaFunctionUrlEvent, SQSEvent, event_source
 from aws_lambda_powertools.utilities.typing import LambdaContext
 
 # ==================================================================================================
 # Module imports
-from lib.aws_utils import get_source_metadata, upload_feed_to_s3
-from lib.feed_handler import get_feed_from_rss
-from shared.logger import logger
+from lib.aws_utils import get_source_metadata, invoke_continuation, upload_feed_to_s3, upload_run_to_s3
+from lib.circuit_breaker import CircuitBreaker, get_host_state_store
+from lib.concurrency import HostLimiter, run_concurrently
+from lib.deadline import Deadline
+from lib.feed_handler import FeedNotModifiedError, HostUnavailableError, get_feed_from_rss, parse_feed_content
+from lib.feed_state import FeedState, get_feed_state_store
+from lib.fingerprint import feed_fingerprint
+from lib.merge import merge_feeds
+from lib.scheduler import FeedScheduler
+from lib.seen_items import filter_seen, remember_seen
+from lib.tasks import FeedTask, build_feed_tasks, run_s3_key
+from lib.websub import get_subscription_manager
+from lib.work_queue import build_work_items, get_work_queue, parse_work_item
+from shared.logger import log_payload, logger
+from shared.news_model import SourceNewsFeedModel, SourceNewsItemModel
 
 # ==================================================================================================
 # Global declarations
 
 BUCKET_NAME = os.environ["NEWS_FEED_BUCKET"]
 LOG_LEVEL = os.environ["POWERTOOLS_LOG_LEVEL"]
+MAX_WORKERS = int(os.environ.get("READER_MAX_WORKERS", "8"))
+MAX_REQUESTS_PER_HOST = int(os.environ.get("READER_MAX_REQUESTS_PER_HOST", "4"))
+# Upload every feed of a run as a single manifest-plus-items object, which Process handles in one invocation
+CONSOLIDATED_UPLOAD = os.environ.get("READER_CONSOLIDATED_UPLOAD", "false").lower() == "true"
+RUN_MANIFEST_VERSION = 1
+# Feeds that are not started before the deadline are handed off to a continuation, at most this many times in a row
+MAX_CONTINUATIONS = int(os.environ.get("READER_MAX_CONTINUATIONS", "3"))
 
 logger.service = "Reader"
 logger.setLevel(LOG_LEVEL)
 
+host_limiter = HostLimiter(MAX_REQUESTS_PER_HOST)
+feed_state_store = get_feed_state_store()
+scheduler = FeedScheduler()
+# Skips the feeds of hosts that keep failing, instead of waiting for every one of them to time out
+circuit_breaker = CircuitBreaker(get_host_state_store(), failure_types=(HostUnavailableError,), success_types=(FeedNotModifiedError,))
+# Set when the feeds are fanned out to workers instead of being read by the dispatcher
+work_queue = get_work_queue()
+# Set when WebSub is configured: feeds that advertise a hub are subscribed and have their items pushed to push
+subscription_manager = get_subscription_manager()
+
+# Outcomes of a feed task
+FEED_UPLOADED = "uploaded"
+FEED_UNCHANGED = "unchanged"
+FEED_FAILED = "failed"
+# Not fetched because the circuit of its host is open
+FEED_SKIPPED = "skipped"
+# Not started before the deadline, and handed off to a continuation
+FEED_DEFERRED = "deferred"
+# Fetched with new items, which are merged with the other feeds of the run before they are uploaded
+FEED_NEW = "new"
+
+
+@dataclass
+class FeedResult:
+    """
+    The outcome of fetching a single feed URL, and the new items it has to upload
+    """
+
+    task: FeedTask
+    outcome: str
+    state: FeedState
+    items: list[SourceNewsItemModel] = field(default_factory=list)
+    keys: list[str] = field(default_factory=list)
+
+
+def fetch_feed_task(task: FeedTask, source_metadata: dict, state: FeedState, deadline: Deadline) -> FeedResult:
+    """
+    Fetches and parses a single feed URL and keeps the items it has not emitted before.
+    The returned state is only persisted as it is when there is nothing to upload.
+    """
+    news_source = source_metadata["name_short"]
+    pending_state = state.model_copy()
+    now = int(time.time())
+    try:
+        logger.info(f"Processing URL {task.index+1}/{task.total} for category {task.category}: {task.feed_url}")
+
+        with host_limiter.limit(task.feed_url):
+            # No fetch is started near the deadline, and the ones that are finish, retries included, in the time that is left
+            timeout = deadline.request_timeout()
+            if timeout is None:
+                logger.warning(f"Deadline reached. Deferring category {task.category}, URL: {task.feed_url}")
+                return FeedResult(task, FEED_DEFERRED, state)
+
+            # Checked once a slot is free, so feeds queued behind a host that just failed are skipped too
+            if not circuit_breaker.allow(task.feed_url, now):
+                logger.warning(f"Circuit for the host of {task.feed_url} is open. Skipping category {task.category}")
+                return FeedResult(task, FEED_SKIPPED, state)
+
+            with circuit_breaker.guard(task.feed_url, now):
+                feed = get_feed_from_rss(
+                    news_source,
+                    task.feed_url,
+                    task.category,
+                    source_metadata["language"],
+                    source_metadata["country"],
+                    state=pending_state,
+                    parser_config=source_metadata.get("parser"),
+                    timeout=timeout,
+                )
+
+        if not feed:
+            logger.warning(f"No feed data received for category: {task.category}, URL: {task.feed_url}")
+            return FeedResult(task, FEED_FAILED, _failed_state(state, now))
+
+        return ingest_feed(task, feed, state, pending_state, now)
+
+    except FeedNotModifiedError:
+        # Nothing to parse or upload, so nothing is sent downstream either
+        unchanged_state = state.model_copy()
+        scheduler.record_fetch(unchanged_state, [], now, new_items=0)
+        return FeedResult(task, FEED_UNCHANGED, unchanged_state)
+    except Exception as e:  # noqa: BLE001
+        # Report the failure instead of raising so the other feeds are still processed
+        logger.error(f"Error processing category {task.category} URL {task.feed_url}: {e}")
+        return FeedResult(task, FEED_FAILED, _failed_state(state, now))
+
+
+def ingest_feed(task: FeedTask, feed: SourceNewsFeedModel, state: FeedState, pending_state: FeedState, now: int) -> FeedResult:
+    """
+    Keeps the items of a fetched or pushed feed that it has not emitted before, and records the fetch in pending_state
+    """
+    # Skip the upload (and everything it triggers downstream) when the items have not changed
+    content_hash = feed_fingerprint(feed)
+    if content_hash == state.content_hash:
+        logger.info(f"Feed content unchanged for category: {task.category}, URL: {task.feed_url}. Skipping upload")
+        scheduler.record_fetch(pending_state, [], now, new_items=0)
+        return FeedResult(task, FEED_UNCHANGED, pending_state)
+    pending_state.content_hash = content_hash
+
+    # Only the items this feed has not emitted before are uploaded
+    new_feed, new_keys = filter_seen(feed, state)
+    scheduler.record_fetch(pending_state, [item.published_ms for item in feed.feed], now, new_items=len(new_keys))
+    if not new_feed.feed:
+        logger.info(f"No new items for category: {task.category}, URL: {task.feed_url}. Skipping upload")
+        return FeedResult(task, FEED_UNCHANGED, pending_state)
+
+    logger.info(f"Found {len(new_feed.feed)}/{len(feed.feed)} new items for category: {task.category}, URL: {task.feed_url}")
+    return FeedResult(task, FEED_NEW, pending_state, new_feed.feed, new_keys)
+
+
+def upload_feed(s3_key: str, items: list[SourceNewsItemModel], manifest: dict | None = None) -> bool:
+    """
+    Uploads the merged items of a feed, or of a whole run with its manifest, to S3. Returns whether the upload succeeded.
+    """
+    try:
+        logger.info(f"Uploading {len(items)} items to S3 with key: {s3_key}")
+        if manifest is None:
+            upload_feed_to_s3(items, s3_key, BUCKET_NAME)
+        else:
+            upload_run_to_s3(manifest, items, s3_key, BUCKET_NAME)
+    except Exception as e:  # noqa: BLE001
+        # The feeds whose items were in this upload are failed, the other uploads still go ahead
+        logger.error(f"Error uploading {s3_key}: {e}")
+        return False
+    return True
+
+
+def upload_run(
+    news_source: str,
+    source_metadata: dict,
+    results: list[FeedResult],
+    merged: dict[str, list[SourceNewsItemModel]],
+    s3_key: str,
+) -> bool:
+    """
+    Uploads the merged items of every feed of the run as a single object. Returns whether the upload succeeded.
+    """
+    items = [item for feed_items in merged.values() for item in feed_items]
+    manifest = {
+        "version": RUN_MANIFEST_VERSION,
+        "source": news_source,
+        "country": source_metadata["country"],
+        "language": source_metadata["language"],
+        "created_ms": time.time_ns() // 1_000_000,
+        "item_count": len(items),
+        "feeds": [
+            {"category": result.task.category, "feed_url": result.task.feed_url, "items": len(merged[result.task.s3_key])}
+            for result in results
+        ],
+    }
+    return upload_feed(s3_key, items, manifest)
+
+
+def settle_feed_result(result: FeedResult, stored_state: FeedState, owners: dict[str, str], uploaded: set[str]) -> tuple[str, FeedState]:
+    """
+    Returns the outcome and the feed state to persist, which only moves forward once every new item of the feed
+    is uploaded, whichever feed of the run uploaded it
+    """
+    if result.outcome != FEED_NEW:
+        return result.outcome, result.state
+
+    # The items are only remembered once they are uploaded, so a failed upload is retried with them next run
+    uploaded_keys = [key for item, key in zip(result.items, result.keys, strict=True) if owners[item.canonical_url] in uploaded]
+    if len(uploaded_keys) < len(result.keys):
+        failed_state = _failed_state(stored_state, int(time.time()))
+        remember_seen(failed_state, uploaded_keys)
+        return FEED_FAILED, failed_state
+
+    remember_seen(result.state, result.keys)
+    return FEED_UPLOADED, result.state
+
+
+def _failed_state(state: FeedState, now: int) -> FeedState:
+    """
+    Keeps the stored state of a failed feed, only pushing back its next due time
+    """
+    failed_state = state.model_copy()
+    scheduler.record_failure(failed_state, now)
+    return failed_state
+
+
+def hand_off_feeds(news_source: str, source_metadata: dict, tasks: list[FeedTask], context: LambdaContext, continuation: int) -> bool:
+    """
+    Hands the feeds that were not started before the deadline to a continuation: work items on the work queue,
+    or else an asynchronous invocation of this function. Returns whether they were handed off.
+    Feeds that are not handed off keep their state, so they are still due on the next tick.
+    """
+    if continuation >= MAX_CONTINUATIONS:
+        logger.warning(f"Not handing off {len(tasks)} feeds of {news_source} after {continuation} continuations")
+        return False
+
+    country, language = source_metadata["country"], source_metadata["language"]
+    try:
+        if work_queue is not None:
+            work_items = build_work_items(news_source, country, language, tasks)
+            for work_item in work_items:
+                work_item["Continuation"] = continuation + 1
+            handed_off = work_queue.send(work_items) == 0
+        else:
+            payload = {
+                "NewsSource": news_source,
+                "Country": country,
+                "Language": language,
+                "Feeds": [task.feed_url for task in tasks],
+                "Continuation": continuation + 1,
+            }
+            invoke_continuation(context.function_name, payload)
+            handed_off = True
+    except Exception as e:  # noqa: BLE001
+        logger.error(f"Error handing off {len(tasks)} feeds of {news_source}: {e}")
+        return False
+
+    logger.info(f"Handed off {len(tasks)} feeds of {news_source} to continuation {continuation + 1}")
+    return handed_off
+
+
+def publish_results(
+    news_source: str,
+    source_metadata: dict,
+    results: list[FeedResult],
+    stored_states: dict[str, FeedState],
+    run_key: str,
+) -> list[tuple[str, FeedState]]:
+    """
+    Merges and uploads the new items of the results, then saves the state of their feeds.
+    run_key is the key of the single object uploaded with CONSOLIDATED_UPLOAD.
+    Returns the settled outcome and state of every result.
+    """
+    # Merge the articles listed in several feeds, so each one is uploaded once with all of its categories
+    new_results = [result for result in results if result.outcome == FEED_NEW]
+    merged, owners = merge_feeds((result.task.s3_key, result.items) for result in new_results)
+    new_items = sum(len(result.items) for result in new_results)
+    logger.info(f"Merged {new_items} new items from {len(new_results)} feeds into {len(owners)} articles")
+
+    if not owners:
+        uploaded: set[str] = set()
+    elif CONSOLIDATED_UPLOAD:
+        # A single object for the run, so S3 and Process see one write instead of one per feed
+        uploaded = set(merged) if upload_run(news_source, source_metadata, new_results, merged, run_key) else set()
+    else:
+        # Upload the merged feeds concurrently
+        uploads = [(s3_key, items) for s3_key, items in merged.items() if items]
+        upload_results = run_concurrently(lambda upload: upload_feed(*upload), uploads, max_workers=MAX_WORKERS)
+        uploaded = {s3_key for (s3_key, _), ok in zip(uploads, upload_results, strict=True) if ok}
+
+    settled = [settle_feed_result(result, stored_states[result.task.feed_url], owners, uploaded) for result in results]
+    feed_state_store.save(news_source, [state for _, state in settled])
+    return settled
+
+
+def renew_subscriptions(news_source: str, country: str, language: str, tasks: list[FeedTask], states: dict[str, FeedState]) -> None:
+    """
+    Subscribes the feeds that advertise a WebSub hub, and renews the subscriptions whose lease is about to expire
+    """
+    now = int(time.time())
+    pending = [
+        (task, states[task.feed_url])
+        for task in tasks
+        if task.feed_url in states and subscription_manager.needs_subscription(states[task.feed_url], now)
+    ]
+    if not pending:
+        return
+
+    # Saved before the requests are sent, since a hub may verify the intent before it answers
+    for _, state in pending:
+        state.subscription_requested = now
+    feed_state_store.save(news_source, [state for _, state in pending])
+
+    requested = run_concurrently(
+        lambda pending_feed: subscription_manager.subscribe(
+            pending_feed[1],
+            subscription_manager.callback(news_source, country, language, pending_feed[0].feed_url),
+        ),
+        pending,
+        max_workers=MAX_WORKERS,
+    )
+    logger.info(f"Requested WebSub subscriptions for {sum(requested)}/{len(pending)} feeds of {news_source}")
+
+
+def read_feeds(  # noqa: PLR0913
+    news_source: str,
+    source_metadata: dict,
+    tasks: list[FeedTask],
+    states: dict[str, FeedState],
+    *,
+    context: LambdaContext | None = None,
+    failed_feeds: int = 0,
+    batched: bool = False,
+    continuation: int = 0,
+) -> dict:
+    """
+    Fetches, merges and uploads the feeds of the tasks, then saves their state.
+    Used by the dispatcher for local runs and by the workers for their batch of feeds.
+    Feeds that cannot be started before the invocation's deadline are handed off to a continuation.
+    """
+    stored_states = {task.feed_url: states.get(task.feed_url, FeedState(feed_url=task.feed_url)) for task in tasks}
+    circuit_breaker.load()
+    deadline = Deadline.from_context(context)
+
+    # Fetch and parse the feeds concurrently, so the run takes as long as the slowest feed
+    results = run_concurrently(
+        lambda task: fetch_feed_task(task, source_metadata, stored_states[task.feed_url], deadline),
+        tasks,
+        max_workers=MAX_WORKERS,
+    )
+
+    run_key = run_s3_key(news_source, tasks[0] if batched else None)
+    settled = publish_results(news_source, source_metadata, results, stored_states, run_key)
+    circuit_breaker.save()
+
+    deferred_tasks = [result.task for result in results if result.outcome == FEED_DEFERRED]
+    if deferred_tasks:
+        hand_off_feeds(news_source, source_metadata, deferred_tasks, context, continuation)
+
+    outcomes = [outcome for outcome, _ in settled]
+    successful_feeds = outcomes.count(FEED_UPLOADED)
+    unchanged_feeds = outcomes.count(FEED_UNCHANGED)
+    skipped_feeds = outcomes.count(FEED_SKIPPED)
+    deferred_feeds = outcomes.count(FEED_DEFERRED)
+    failed_feeds += outcomes.count(FEED_FAILED)
+
+    # Hosts whose circuit is open or half open, as a structured field to alert on
+    circuits = circuit_breaker.summary(int(time.time()))
+    logger.info(
+        f"Feed processing completed. Successful: {successful_feeds}, Unchanged: {unchanged_feeds}, "
+        f"Skipped: {skipped_feeds}, Deferred: {deferred_feeds}, Failed: {failed_feeds}",
+        extra={"open_circuits": circuits},
+    )
+
+    if successful_feeds + unchanged_feeds + deferred_feeds == 0:
+        return {"statusCode": 500, "body": f"All feeds failed to process for {news_source}", "circuits": circuits}
+
+    total_feeds = successful_feeds + unchanged_feeds + skipped_feeds + deferred_feeds + failed_feeds
+    body = (
+        f"Success - Processed {successful_feeds}/{total_feeds} feeds, {unchanged_feeds} unchanged, "
+        f"{skipped_feeds} skipped, {deferred_feeds} deferred"
+    )
+    return {"statusCode": 200, "body": body, "circuits": circuits}
+
 
 @event_source(data_class=EventBridgeEvent)
 def main(event: EventBridgeEvent, context: LambdaContext) -> dict:
     """
-    This function is used to read RSS feeds
+    This function is used to read RSS feeds.
+    With a work queue it only dispatches the due feeds of the source to the workers.
     """
-    logger.info(f"Event: {event.raw_event}")
+    log_payload("Event", event.raw_event, level=logging.INFO)
     logger.info(f"Context: {context}")
 
     news_source = str(event.get("NewsSource"))
@@ -49,63 +413,155 @@ def main(event: EventBridgeEvent, context: LambdaContext) -> dict:
     feeds = source_metadata.get("feeds", {})
     logger.info(f"Processing feeds for {news_source}: {list(feeds.keys())}")
 
-    successful_feeds = 0
-    failed_feeds = 0
+    tasks, failed_feeds = build_feed_tasks(news_source, feeds)
+    states = feed_state_store.load(news_source)
 
-    for category, feed_value in feeds.items():
-        logger.info(f"Processing category: {category}")
+    # Renewed on every tick, whether or not the feeds are due, so the leases never run out
+    if subscription_manager is not None and subscription_manager.callback_url:
+        renew_subscriptions(news_source, country, language, tasks, states)
 
-        # Handle both single URLs and arrays of URLs
-        urls_to_process = []
-        if isinstance(feed_value, list):
-            urls_to_process = feed_value
-            logger.info(f"Found {len(urls_to_process)} URLs for category {category}")
-        elif isinstance(feed_value, str):
-            urls_to_process = [feed_value]
-            logger.info(f"Found 1 URL for category {category}")
-        else:
-            logger.error(f"Invalid feed value type for category {category}: {type(feed_value)}")
-            failed_feeds += 1
+    # A continuation only reads the feeds its run could not start before the deadline
+    continued_feeds = event.get("Feeds")
+    if continued_feeds:
+        tasks = [task for task in tasks if task.feed_url in set(continued_feeds)]
+        logger.info(f"Continuing {len(tasks)} feeds of {news_source}")
+    # The reader runs on a frequent tick, so only the feeds that are due are fetched unless the run is forced
+    elif not event.get("Force"):
+        now = int(time.time())
+        all_tasks = len(tasks)
+        tasks = [task for task in tasks if scheduler.is_due(states.get(task.feed_url, FeedState(feed_url=task.feed_url)), now)]
+        logger.info(f"{len(tasks)}/{all_tasks} feeds of {news_source} are due")
+        if not tasks:
+            return {"statusCode": 200, "body": f"No feeds due for {news_source}"}
+
+    if work_queue is None:
+        continuation = int(event.get("Continuation") or 0)
+        return read_feeds(
+            news_source,
+            source_metadata,
+            tasks,
+            states,
+            context=context,
+            failed_feeds=failed_feeds,
+            continuation=continuation,
+        )
+
+    # Fan the due feeds out to the workers, a small batch per message
+    work_items = build_work_items(news_source, country, language, tasks)
+    failed_items = work_queue.send(work_items)
+    logger.info(f"Dispatched {len(tasks)} feeds of {news_source} in {len(work_items) - failed_items}/{len(work_items)} work items")
+
+    if failed_items == len(work_items):
+        return {"statusCode": 500, "body": f"Failed to dispatch the feeds of {news_source}"}
+    return {"statusCode": 200, "body": f"Dispatched {len(tasks)} feeds of {news_source} in {len(work_items)} work items"}
+
+
+@event_source(data_class=SQSEvent)
+def worker(event: SQSEvent, context: LambdaContext) -> dict:
+    """
+    This function reads the batch of feeds of each work item sent by the dispatcher.
+    Feeds that fail are rescheduled through their state, so only work items that could not be read at all are retried.
+    """
+    batch_item_failures = []
+    for record in event.records:
+        try:
+            work_item, tasks = parse_work_item(record.body)
+            news_source, country, language = work_item["NewsSource"], work_item["Country"], work_item["Language"]
+        except (json.JSONDecodeError, KeyError, TypeError) as e:
+            # Retrying cannot fix a malformed message, so it is dropped
+            logger.error(f"Dropping malformed work item {record.message_id}: {e}")
             continue
 
-        # Process each URL in the category
-        for i, feed_url in enumerate(urls_to_process):
-            try:
-                logger.info(f"Processing URL {i+1}/{len(urls_to_process)} for category {category}: {feed_url}")
-
-                # Validate that feed_url is a string
-                if not isinstance(feed_url, str):
-                    logger.error(f"Invalid feed URL type for category {category}: {type(feed_url)}")
-                    failed_feeds += 1
-                    continue
-
-                feed = get_feed_from_rss(news_source, feed_url, category, language, country)
-
-                if feed:  # Check if feed retrieval was successful
-                    # Upload the json feed to S3
-                    # For multiple URLs in same category, add index to S3 key to avoid overwrites
-                    s3_key = f"{news_source}-{category}"
-                    if len(urls_to_process) > 1:
-                        s3_key += f"-{i+1}"
-                    s3_key += ".json"
-
-                    logger.info(f"Uploading feed to S3 with key: {s3_key}")
-                    upload_feed_to_s3(feed.model_dump()["feed"], s3_key, BUCKET_NAME)
-                    logger.info(f"Uploaded feed for {category} (URL {i+1}) to S3 successfully")
-                    successful_feeds += 1
-                else:
-                    logger.warning(f"No feed data received for category: {category}, URL: {feed_url}")
-                    failed_feeds += 1
-
-            except Exception as e:
-                logger.error(f"Error processing category {category} URL {feed_url}: {e}")
-                failed_feeds += 1
-                # Continue processing other feeds instead of raising exception
+        batch = work_item.get("Batch")
+        try:
+            logger.info(f"Reading batch {batch} of {len(tasks)} feeds for {news_source}")
+            source_metadata = get_source_metadata(news_source, country, language)
+            if not source_metadata or not isinstance(source_metadata, dict):
+                logger.error(f"Invalid source metadata structure received for {news_source}: {source_metadata}")
                 continue
 
-    logger.info(f"Feed processing completed. Successful: {successful_feeds}, Failed: {failed_feeds}")
+            result = read_feeds(
+                news_source,
+                source_metadata,
+                tasks,
+                feed_state_store.load(news_source),
+                context=context,
+                batched=True,
+                continuation=int(work_item.get("Continuation") or 0),
+            )
+            logger.info(f"Batch {batch} of {news_source}: {result['body']}")
+        except Exception as e:  # noqa: BLE001
+            logger.error(f"Error reading work item {record.message_id}: {e}")
+            batch_item_failures.append({"itemIdentifier": record.message_id})
+
+    return {"batchItemFailures": batch_item_failures}
+
+
+@event_source(data_class=LambdaFunctionUrlEvent)
+def push(event: LambdaFunctionUrlEvent, context: LambdaContext) -> dict:  # noqa: ARG001, PLR0911
+    """
+    This function is the WebSub callback. It answers the verification requests of the hubs (GET)
+    and reads the content they push (POST) through the same parser, merge and upload path as the polled feeds.
+    The callback query identifies the feed: source, country, language and feed, and carries the token that
+    shows the reader handed the callback out.
+    """
+    params = event.query_string_parameters or {}
+    if subscription_manager is None:
+        logger.error("Rejecting a callback request: WebSub has no secret. See 'WebSub secret' in docs/DEVELOPMENT.md")
+        return {"statusCode": 404, "body": "Unknown subscription"}
+    if not subscription_manager.verify_callback(params):
+        logger.warning("Rejecting a callback request without a valid token")
+        return {"statusCode": 404, "body": "Unknown subscription"}
+    news_source, country, language, feed_url = (params[key] for key in ("source", "country", "language", "feed"))
+
+    try:
+        source_metadata = get_source_metadata(news_source, country, language)
+    except ValueError as e:
+        logger.warning(f"Callback for a source that is not registered: {e}")
+        return {"statusCode": 404, "body": "Unknown subscription"}
+    if not source_metadata or not isinstance(source_metadata, dict):
+        logger.error(f"Invalid source metadata structure received for {news_source}: {source_metadata}")
+        return {"statusCode": 404, "body": "Unknown subscription"}
+
+    tasks, _ = build_feed_tasks(news_source, source_metadata.get("feeds", {}))
+    task = next((task for task in tasks if task.feed_url == feed_url), None)
+    if task is None:
+        logger.warning(f"Callback for a feed {news_source} does not list: {feed_url}")
+        return {"statusCode": 404, "body": "Unknown subscription"}
+
+    state = feed_state_store.load(news_source).get(feed_url, FeedState(feed_url=feed_url))
+    now = int(time.time())
+
+    if event.request_context.http.method == "GET":
+        challenge = subscription_manager.verify_intent(params, state, now)
+        if challenge is None:
+            return {"statusCode": 404, "body": "Unknown subscription"}
+        feed_state_store.save(news_source, [state])
+        return {"statusCode": 200, "headers": {"Content-Type": "text/plain"}, "body": challenge}
+
+    body = base64.b64decode(event.body or "") if event.is_base64_encoded else (event.body or "").encode("utf-8")
+    # Content that is not signed with the secret of the subscription is acknowledged, but ignored
+    if not state.topic or not subscription_manager.verify_signature(state.topic, body, event.headers.get("X-Hub-Signature")):
+        logger.warning(f"Ignoring pushed content with an invalid signature for {feed_url}")
+        return {"statusCode": 202, "body": "Ignored"}
 
-    if successful_feeds == 0:
-        return {"statusCode": 500, "body": f"All feeds failed to process for {news_source}"}
+    logger.info(f"Received {len(body)} bytes of pushed content for category {task.category}, URL: {feed_url}")
+    try:
+        feed = parse_feed_content(
+            news_source,
+            body,
+            feed_url,
+            task.category,
+            language,
+            country,
+            parser_config=source_metadata.get("parser"),
+        )
+        result = ingest_feed(task, feed, state, state.model_copy(), now)
+    except Exception as e:  # noqa: BLE001
+        # The hub does not retry on errors, the items are still picked up by the safety poll
+        logger.error(f"Error reading pushed content for {feed_url}: {e}")
+        return {"statusCode": 202, "body": "Not processed"}
 
-    return {"statusCode": 200, "body": f"Success - Processed {successful_feeds}/{successful_feeds + failed_feeds} feeds"}
+    [(outcome, _)] = publish_results(news_source, source_metadata, [result], {feed_url: state}, run_s3_key(news_source, task))
+    logger.info(f"Pushed content for category {task.category}, URL: {feed_url}: {outcome}")
+    return {"statusCode": 202, "body": outcome}
@@ -8,7 +8,6 @@
 # Python imports
 import json
 import os
-from pathlib import Path
 
 # ==================================================================================================
 # AWS imports
@@ -17,49 +16,91 @@ from botocore.exceptions import ClientError
 
 # ==================================================================================================
 # Module imports
+from shared.feed_codec import encode_feed_items, encode_feed_run
 from shared.logger import logger
+from shared.news_model import SourceNewsItemModel
+
+from .source_registry import SourceRegistry
 
 # ==================================================================================================
+# Global declarations
+
+# boto3 clients are thread-safe, but creating them from the default session is not,
+# so the client is created once and shared by the concurrent feed uploads
+s3_client = boto3.client("s3")
+lambda_client = boto3.client("lambda")
+
+# Served from memory while the container is warm
+source_registry = SourceRegistry(os.environ["NEWS_TABLE_NAME"])
 
 
-def upload_feed_to_s3(feed: list[dict], s3_key: str, bucket_name: str) -> None:
+def upload_feed_to_s3(feed: list[SourceNewsItemModel], s3_key: str, bucket_name: str) -> None:
     """
-    This function uploads the feed to S3
+    This function uploads the feed to S3 straight from memory, as compact and compressed JSON.
+    The items are already validated, so they are serialised as they are.
     """
-    temp_file_path = Path(f"/tmp/{s3_key}")  # noqa: S108
+    body, content_encoding = encode_feed_items(feed)
+    _put_feed(body, content_encoding, s3_key, bucket_name)
 
-    # Write the feed to a temporary file
-    with temp_file_path.open("w", encoding="utf-8") as outfile:
-        json.dump(feed, outfile, ensure_ascii=False, indent=4)
 
-    # Upload the file to S3 using the correct S3 key
-    s3_client = boto3.client("s3")
+def upload_run_to_s3(manifest: dict, feed: list[SourceNewsItemModel], s3_key: str, bucket_name: str) -> None:
+    """
+    This function uploads the items of every feed of a run to S3 as a single object, led by the run manifest
+    """
+    body, content_encoding = encode_feed_run(manifest, feed)
+    _put_feed(body, content_encoding, s3_key, bucket_name)
+
+
+def _put_feed(body: bytes, content_encoding: str | None, s3_key: str, bucket_name: str) -> None:
+    """
+    Writes an encoded feed object, recording its compression as the Content-Encoding
+    """
+    put_args = {"Bucket": bucket_name, "Key": s3_key, "Body": body, "ContentType": "application/json"}
+    if content_encoding:
+        put_args["ContentEncoding"] = content_encoding
+
     try:
-        s3_client.upload_file(str(temp_file_path), bucket_name, s3_key)
+        s3_client.put_object(**put_args)
     except ClientError as s3_error:
         logger.error(f"Failed to upload {s3_key} to {bucket_name}: {s3_error}")
         raise s3_error
-    finally:
-        # Clean up the temporary file
-        if temp_file_path.exists():
-            temp_file_path.unlink()
 
 
-def get_source_metadata(news_source: str, country: str, language: str) -> tuple[dict, str]:
+def invoke_continuation(function_name: str, payload: dict) -> None:
     """
-    This function gets the news url dictionary for the given news source
+    Invokes the function asynchronously with the payload, to continue a run that ran out of time
+    """
+    try:
+        lambda_client.invoke(FunctionName=function_name, InvocationType="Event", Payload=json.dumps(payload).encode("utf-8"))
+    except ClientError as lambda_error:
+        logger.error(f"Failed to invoke {function_name}: {lambda_error}")
+        raise lambda_error
+
+
+def _parser_config(item: dict) -> dict | None:
+    """
+    Builds the parser field mapping from the optional 'Parser' attribute of a source item
     """
-    logger.info(f"Getting news url for {news_source}")
-    logger.info(f"News table name: {os.environ['NEWS_TABLE_NAME']}")
+    parser = item.get("Parser")
+    if not parser:
+        return None
 
-    dynamodb = boto3.resource("dynamodb")
-    table = dynamodb.Table(os.environ["NEWS_TABLE_NAME"])
-    logger.info(f"Country: {country}, Language: {language}")
+    return {
+        "source_name": parser.get("SourceName", item.get("Name").get("Long")),
+        "source_id": parser.get("SourceId", item.get("Name").get("Short")),
+        "fields": parser.get("Fields", {}),
+        "namespaces": parser.get("Namespaces", {}),
+        "query_allowlist": parser.get("QueryAllowlist"),
+    }
 
-    response = table.get_item(Key={"pk": f"SOURCE#{country}#{language}", "sk": f"NAME#{news_source}"})
-    item = response.get("Item")
 
-    logger.info(f"Item: {item}")
+def get_source_metadata(news_source: str, country: str, language: str) -> tuple[dict, str]:
+    """
+    This function gets the news url dictionary for the given news source
+    """
+    logger.info(f"Getting source metadata for {news_source} ({country}, {language})")
+
+    item = source_registry.get(news_source, country, language)
 
     if item:
         # Process the feeds to handle both single URLs and arrays of URLs
@@ -75,6 +116,7 @@ def get_source_metadata(news_source: str, country: str, language: str) -> tuple[
             "language": item.get("Language"),
             "country": item.get("Country"),
             "feeds": processed_feeds,
+            "parser": _parser_config(item),
         }
         return source_metadata
 
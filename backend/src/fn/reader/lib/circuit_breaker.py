@@ -0,0 +1,234 @@
+"""
+# --*-- coding: utf-8 --*--
+# Circuit breaker
+# Stops the reader from waiting on hosts that are down. After a number of consecutive failed fetches the circuit
+# of the host opens and its feeds are skipped for a cooldown window. The window is persisted, so it spans runs.
+# Once it has passed the circuit is half open: a single probe request decides whether it closes or opens again.
+# State lives in the news table under HOSTSTATE, or in the local feed state file as a stand-in.
+"""
+
+# ==================================================================================================
+# Python imports
+import os
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+from pydantic import BaseModel, Field
+
+# ==================================================================================================
+# Module imports
+from shared.logger import logger
+
+from .concurrency import host_of
+from .partition_store import DynamoDBPartitionStore, JsonFilePartitionStore, PartitionStore
+
+# ==================================================================================================
+# Global declarations
+
+FAILURE_THRESHOLD = int(os.environ.get("READER_BREAKER_FAILURE_THRESHOLD", "3"))
+COOLDOWN_SECONDS = int(os.environ.get("READER_BREAKER_COOLDOWN_SECONDS", "1800"))
+
+CIRCUIT_CLOSED = "closed"
+CIRCUIT_OPEN = "open"
+CIRCUIT_HALF_OPEN = "half_open"
+
+HOST_STATE_PK = "HOSTSTATE"
+
+
+class HostState(BaseModel):
+    """
+    This class defines the circuit state kept for a single host between runs
+    """
+
+    host: str
+    consecutive_failures: int = Field(default=0)
+    # UNIX seconds at which the circuit opened. None while it is closed.
+    opened_at: int | None = Field(default=None)
+
+
+# ==================================================================================================
+# Stores
+
+
+class HostStateStore(PartitionStore):
+    """
+    Base class for host state stores: pk=HOSTSTATE, sk=HOST#{host}
+    """
+
+    SK_PREFIX = "HOST#"
+    ID_FIELD = "host"
+
+    def load(self) -> dict[str, HostState]:
+        """
+        Loads the state of every host with a failure on record, keyed by host
+        """
+        return {item["host"]: HostState.model_validate(item) for item in self._read(HOST_STATE_PK)}
+
+    def save(self, states: list[HostState]) -> None:
+        """
+        Writes the given host states
+        """
+        if states:
+            self._write(HOST_STATE_PK, {state.host: state.model_dump() for state in states})
+
+
+class DynamoDBHostStateStore(DynamoDBPartitionStore, HostStateStore):
+    """
+    Stores host state in the news table
+    """
+
+
+class JsonFileHostStateStore(JsonFilePartitionStore, HostStateStore):
+    """
+    Stores host state in a local JSON file, next to the feed states
+    """
+
+
+def get_host_state_store() -> HostStateStore:
+    """
+    Returns the JSON file store when FEED_STATE_FILE is set, otherwise the DynamoDB store on the news table
+    """
+    state_file = os.environ.get("FEED_STATE_FILE")
+    if state_file:
+        return JsonFileHostStateStore(state_file)
+    return DynamoDBHostStateStore(os.environ["NEWS_TABLE_NAME"])
+
+
+# ==================================================================================================
+# Circuit breaker
+
+
+class CircuitBreaker:
+    """
+    Keeps one circuit per host. Safe to use from the concurrent feed tasks of a run.
+    """
+
+    def __init__(
+        self,
+        store: HostStateStore,
+        failure_threshold: int = FAILURE_THRESHOLD,
+        cooldown_seconds: int = COOLDOWN_SECONDS,
+        failure_types: tuple[type[BaseException], ...] = (),
+        success_types: tuple[type[BaseException], ...] = (),
+    ) -> None:
+        self.store = store
+        self.failure_threshold = max(1, failure_threshold)
+        self.cooldown_seconds = cooldown_seconds
+        # Exceptions that mean the host is unavailable, and exceptions that still mean it answered (e.g. 304)
+        self.failure_types = failure_types
+        self.success_types = success_types
+        self._states: dict[str, HostState] = {}
+        self._loaded: dict[str, dict] = {}
+        self._probing: set[str] = set()
+        self._lock = threading.Lock()
+
+    def load(self) -> None:
+        """
+        Loads the persisted circuits. Called at the start of a run.
+        """
+        states = self.store.load()
+        with self._lock:
+            self._states = states
+            self._loaded = {host: state.model_dump() for host, state in states.items()}
+            self._probing = set()
+
+    def save(self) -> None:
+        """
+        Writes back the circuits that changed during the run
+        """
+        with self._lock:
+            changed = [state for host, state in self._states.items() if self._loaded.get(host) != state.model_dump()]
+            self._loaded.update({state.host: state.model_dump() for state in changed})
+
+        if changed:
+            logger.info(f"Saving circuit state for {len(changed)} hosts")
+            self.store.save(changed)
+
+    def state(self, host: str, now: int) -> str:
+        """
+        Returns whether the circuit of the host is closed, open or half open
+        """
+        with self._lock:
+            return self._state(host, now)
+
+    def allow(self, url: str, now: int) -> bool:
+        """
+        Returns whether the URL may be fetched. A half open circuit lets a single probe through.
+        """
+        host = host_of(url)
+        with self._lock:
+            circuit = self._state(host, now)
+            if circuit == CIRCUIT_CLOSED:
+                return True
+            if circuit == CIRCUIT_HALF_OPEN and host not in self._probing:
+                logger.info(f"Circuit for {host} is half open. Probing with {url}")
+                self._probing.add(host)
+                return True
+            return False
+
+    @contextmanager
+    def guard(self, url: str, now: int) -> Iterator[None]:
+        """
+        Records the outcome of the fetch in the block against the circuit of the URL's host.
+        Exceptions that are neither failure nor success types (e.g. a parse error) leave the circuit as it is.
+        """
+        host = host_of(url)
+        try:
+            yield
+        except self.failure_types:
+            self.record_failure(host, now)
+            raise
+        except self.success_types:
+            self.record_success(host)
+            raise
+        except BaseException:
+            self._release(host)
+            raise
+        self.record_success(host)
+
+    def record_success(self, host: str) -> None:
+        """
+        Closes the circuit of the host
+        """
+        with self._lock:
+            self._probing.discard(host)
+            state = self._states.get(host)
+            if state is None or (state.consecutive_failures == 0 and state.opened_at is None):
+                return
+            if state.opened_at is not None:
+                logger.info(f"Circuit for {host} closed")
+            self._states[host] = HostState(host=host)
+
+    def record_failure(self, host: str, now: int) -> None:
+        """
+        Counts a failed fetch against the host and opens its circuit at the threshold, or again after a failed probe
+        """
+        with self._lock:
+            probe = host in self._probing
+            self._probing.discard(host)
+            state = self._states.setdefault(host, HostState(host=host))
+            state.consecutive_failures += 1
+            if probe or (state.opened_at is None and state.consecutive_failures >= self.failure_threshold):
+                state.opened_at = now
+                logger.warning(f"Circuit for {host} opened after {state.consecutive_failures} consecutive failures")
+
+    def summary(self, now: int) -> dict[str, str]:
+        """
+        Returns the hosts whose circuit is not closed, with their state
+        """
+        with self._lock:
+            circuits = {host: self._state(host, now) for host in self._states}
+        return {host: circuit for host, circuit in circuits.items() if circuit != CIRCUIT_CLOSED}
+
+    def _release(self, host: str) -> None:
+        with self._lock:
+            self._probing.discard(host)
+
+    def _state(self, host: str, now: int) -> str:
+        state = self._states.get(host)
+        if state is None or state.opened_at is None:
+            return CIRCUIT_CLOSED
+        if now - state.opened_at < self.cooldown_seconds:
+            return CIRCUIT_OPEN
+        return CIRCUIT_HALF_OPEN
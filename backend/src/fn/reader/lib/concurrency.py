@@ -0,0 +1,71 @@
+"""
+# --*-- coding: utf-8 --*--
+# Concurrency helpers
+# Runs feed tasks on a thread pool while capping the number of in-flight requests per host
+"""
+
+# ==================================================================================================
+# Python imports
+import threading
+from collections.abc import Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, TypeVar
+from urllib.parse import urlsplit
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+# ==================================================================================================
+# Global declarations
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+def host_of(url: str) -> str:
+    """
+    Returns the lower-cased host of a URL, used as the key for per-host limits
+    """
+    return (urlsplit(url).hostname or "").lower()
+
+
+class HostLimiter:
+    """
+    Hands out one bounded semaphore per host so a single slow publisher cannot take every worker
+    """
+
+    def __init__(self, max_per_host: int) -> None:
+        self.max_per_host = max(1, max_per_host)
+        self._semaphores: dict[str, threading.BoundedSemaphore] = {}
+        self._lock = threading.Lock()
+
+    def _semaphore(self, host: str) -> threading.BoundedSemaphore:
+        with self._lock:
+            semaphore = self._semaphores.get(host)
+            if semaphore is None:
+                semaphore = threading.BoundedSemaphore(self.max_per_host)
+                self._semaphores[host] = semaphore
+            return semaphore
+
+    @contextmanager
+    def limit(self, url: str) -> "Iterator[None]":
+        """
+        Blocks until a slot for the URL's host is free and holds it for the duration of the block
+        """
+        semaphore = self._semaphore(host_of(url))
+        with semaphore:
+            yield
+
+
+def run_concurrently(func: Callable[[T], R], items: Iterable[T], max_workers: int) -> list[R]:
+    """
+    Applies func to every item on a thread pool and returns the results in input order.
+    With max_workers <= 1 the items are processed serially on the calling thread.
+    """
+    items = list(items)
+    if max_workers <= 1 or len(items) <= 1:
+        return [func(item) for item in items]
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(items))) as executor:
+        return list(executor.map(func, items))
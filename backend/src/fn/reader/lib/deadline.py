@@ -0,0 +1,59 @@
+"""
+# --*-- coding: utf-8 --*--
+# Deadline
+# Tracks the time left in the Lambda invocation, so the reader shrinks its request timeouts as the budget
+# runs out and stops starting new fetches in time to upload what it has and hand the other feeds off.
+"""
+
+# ==================================================================================================
+# Python imports
+import os
+import time
+
+# ==================================================================================================
+# Global declarations
+
+REQUEST_TIMEOUT_SECONDS = float(os.environ.get("READER_REQUEST_TIMEOUT_SECONDS", "30"))
+# Kept back from the Lambda timeout for merging, uploading, saving state and handing off deferred feeds
+RESERVE_SECONDS = float(os.environ.get("READER_DEADLINE_RESERVE_SECONDS", "20"))
+# A fetch is not started with less time than this, since it would most likely time out
+MIN_REQUEST_TIMEOUT_SECONDS = float(os.environ.get("READER_MIN_REQUEST_TIMEOUT_SECONDS", "5"))
+
+
+class Deadline:
+    """
+    The time by which the fetches of a run have to be done, on the monotonic clock. None means no deadline.
+    """
+
+    def __init__(self, remaining_seconds: float | None, reserve_seconds: float = RESERVE_SECONDS) -> None:
+        self.expires_at = None if remaining_seconds is None else time.monotonic() + remaining_seconds - reserve_seconds
+
+    @classmethod
+    def from_context(cls, context: object, reserve_seconds: float = RESERVE_SECONDS) -> "Deadline":
+        """
+        Returns the deadline of a Lambda invocation. Local runs without a context have none.
+        """
+        get_remaining_time = getattr(context, "get_remaining_time_in_millis", None)
+        if get_remaining_time is None:
+            return cls(None)
+        return cls(get_remaining_time() / 1000, reserve_seconds)
+
+    def remaining(self) -> float | None:
+        """
+        Returns the seconds left before the deadline, or None without a deadline
+        """
+        if self.expires_at is None:
+            return None
+        return max(self.expires_at - time.monotonic(), 0.0)
+
+    def request_timeout(self, default: float = REQUEST_TIMEOUT_SECONDS, minimum: float = MIN_REQUEST_TIMEOUT_SECONDS) -> float | None:
+        """
+        Returns the timeout for a request started now, shrunk to the time left.
+        None when too little time is left to start one.
+        """
+        remaining = self.remaining()
+        if remaining is None:
+            return default
+        if remaining < minimum:
+            return None
+        return min(default, remaining)
@@ -6,8 +6,13 @@
 
 # ==================================================================================================
 # Python imports
+import os
+import time
+from collections.abc import Iterable, Iterator
+
 import requests
 import requests.exceptions
+import urllib3.exceptions
 from lxml import etree as ET  # noqa: N812
 from pydantic import ValidationError
 
@@ -17,6 +22,10 @@ from shared.logger import logger  # Import the Powertools logger
 from shared.news_model import SourceNewsFeedModel
 
 from . import parsers
+from .deadline import REQUEST_TIMEOUT_SECONDS
+from .feed_state import FeedState
+from .http_client import get_within_budget, session
+from .parsers.engine import ITEMS_XPATH
 
 # ==================================================================================================
 
@@ -30,6 +39,10 @@ class FeedFetchError(FeedError):
     """Error during feed fetching."""
 
 
+class HostUnavailableError(FeedFetchError):
+    """The host did not answer, or answered with a server error or 429 (counted by the circuit breaker)."""
+
+
 class FeedParseError(FeedError):
     """Error during XML parsing."""
 
@@ -42,41 +55,75 @@ class ParserExecutionError(FeedError):
     """Error occurred within a specific feed parser."""
 
 
+class FeedNotModifiedError(FeedError):
+    """The feed has not changed since the last fetch (HTTP 304)."""
+
+
 SUCCESS_STATUS_CODE = 200
-HEADERS = {"User-Agent": "SnapNewsReader/1.0"}  # It's good practice to identify your bot
+NOT_MODIFIED_STATUS_CODE = 304
+TOO_MANY_REQUESTS_STATUS_CODE = 429
+SERVER_ERROR_STATUS_CODE = 500
 
 # Define expected XML content types
 XML_CONTENT_TYPES = ["application/xml", "text/xml", "application/rss+xml", "application/atom+xml"]
 
+# Streaming parse settings. The caps bound the memory and time spent on huge or runaway feeds.
+STREAM_PARSING = os.environ.get("READER_STREAM_PARSING", "true").lower() == "true"
+MAX_FEED_BYTES = int(os.environ.get("READER_MAX_FEED_BYTES", str(5 * 1024 * 1024)))
+MAX_FEED_ITEMS = int(os.environ.get("READER_MAX_FEED_ITEMS", "500"))
+CHUNK_SIZE = 16 * 1024
 
-def get_feed_from_rss(feed_source: str, feed_url: str, category: str, language: str, country: str) -> SourceNewsFeedModel:
-    """
-    Fetches and parses an RSS feed using lxml and custom parsers, raising specific exceptions on failure.
+# RSS 2.0 items, RSS 1.0 (RDF) items and Atom entries
+ITEM_TAGS = ("item", "{http://purl.org/rss/1.0/}item", "{http://www.w3.org/2005/Atom}entry")
 
-    Args:
-        feed_source: The name of the parser class (e.g., 'TimesOfIndia', 'NDTV').
-        feed_url: The URL of the RSS feed.
+# Feed-level links advertising a WebSub hub and the topic URL to subscribe to
+ATOM_LINK = "{http://www.w3.org/2005/Atom}link"
+FEED_LINK_PARENTS = ("channel", "{http://purl.org/rss/1.0/}channel", "{http://www.w3.org/2005/Atom}feed")
+WEBSUB_RELS = ("hub", "self")
 
-    Returns:
-        A list of SourceNewsModel objects representing the feed items.
 
-    Raises:
-        FeedFetchError: If the feed cannot be fetched (network, timeout, bad status).
-        FeedParseError: If the fetched content is not valid XML or has wrong content type.
-        ParserNotFoundError: If the specified parser class doesn't exist.
-        ParserExecutionError: If an error occurs within the custom parser logic.
+def _conditional_headers(state: FeedState | None) -> dict:
+    """
+    Builds the conditional request headers from the validators of the previous fetch, if there are any.
+    The User-Agent and Accept-Encoding headers come from the pooled session.
+    """
+    headers = {}
+    if state is not None:
+        if state.etag:
+            headers["If-None-Match"] = state.etag
+        if state.last_modified:
+            headers["If-Modified-Since"] = state.last_modified
+    return headers
+
+
+def _fetch_feed(feed_url: str, state: FeedState | None, timeout: float = REQUEST_TIMEOUT_SECONDS) -> requests.Response:
+    """
+    Fetches the feed with a conditional GET and checks the response before it is parsed.
+    The attempts, with their retries, take at most timeout seconds.
     """
     try:
-        response = requests.get(feed_url, timeout=30, headers=HEADERS)
+        response = get_within_budget(session, feed_url, timeout, headers=_conditional_headers(state), stream=True)
         response.raise_for_status()  # Raises HTTPError for bad status codes (4xx or 5xx)
 
     except requests.exceptions.Timeout as e:
         logger.error(f"Timeout error fetching feed from {feed_url}", exc_info=e)
-        raise FeedFetchError(f"Timeout fetching {feed_url}") from e
+        raise HostUnavailableError(f"Timeout fetching {feed_url}") from e
     except requests.exceptions.RequestException as e:
         # Includes HTTPError, ConnectionError, etc.
-        logger.error(f"Network error fetching feed from {feed_url}. Status: {getattr(e.response, 'status_code', 'N/A')}", exc_info=e)
-        raise FeedFetchError(f"Network error fetching {feed_url}: {e}") from e
+        status_code = getattr(e.response, "status_code", None)
+        logger.error(f"Network error fetching feed from {feed_url}. Status: {status_code or 'N/A'}", exc_info=e)
+        # Client errors such as 404 are specific to the feed, the others say the host is unavailable
+        host_unavailable = status_code is None or status_code >= SERVER_ERROR_STATUS_CODE or status_code == TOO_MANY_REQUESTS_STATUS_CODE
+        error_class = HostUnavailableError if host_unavailable else FeedFetchError
+        raise error_class(f"Network error fetching {feed_url}: {e}") from e
+
+    if response.status_code == NOT_MODIFIED_STATUS_CODE:
+        logger.info(f"Feed {feed_url} not modified since the last fetch")
+        raise FeedNotModifiedError(f"Feed {feed_url} not modified")
+
+    if state is not None:
+        state.etag = response.headers.get("ETag")
+        state.last_modified = response.headers.get("Last-Modified")
 
     # Check Content-Type
     content_type = response.headers.get("Content-Type", "").split(";")[0].strip().lower()
@@ -85,6 +132,117 @@ def get_feed_from_rss(feed_source: str, feed_url: str, category: str, language:
         # Optionally raise FeedParseError here if strict checking is desired:
         # raise FeedParseError(f"Invalid Content-Type '{content_type}' for feed {feed_url}")
 
+    return response
+
+
+def _collect_link(element: ET._Element, links: dict[str, str] | None) -> None:
+    """
+    Records the hub and self links of the feed. Links of individual items are ignored.
+    """
+    if links is None:
+        return
+    rel = element.get("rel")
+    parent = element.getparent()
+    if rel in WEBSUB_RELS and rel not in links and parent is not None and parent.tag in FEED_LINK_PARENTS and element.get("href"):
+        links[rel] = element.get("href")
+
+
+def _read_items(parser: ET.XMLPullParser, links: dict[str, str] | None) -> Iterator[ET._Element]:
+    """
+    Yields the items parsed so far, recording the feed links on the way
+    """
+    for _, element in parser.read_events():
+        if element.tag == ATOM_LINK:
+            _collect_link(element, links)
+            continue
+        yield element
+
+
+def _iter_body(response: requests.Response) -> Iterator[bytes]:
+    """
+    Yields the decoded body as it arrives, up to CHUNK_SIZE at a time. Unlike iter_content, which waits
+    for a full chunk, every read returns what the socket has, so a trickling body is seen between reads.
+    """
+    while chunk := response.raw.read1(CHUNK_SIZE, decode_content=True):
+        yield chunk
+
+
+def _release(element: ET._Element) -> None:
+    """
+    Frees a parsed item and the siblings before it, so the partial tree never grows with the feed
+    """
+    element.clear(keep_tail=True)
+    parent = element.getparent()
+    if parent is not None:
+        while element.getprevious() is not None:
+            del parent[0]
+
+
+def iter_feed_items(  # noqa: PLR0913
+    response: requests.Response,
+    feed_url: str,
+    max_bytes: int = MAX_FEED_BYTES,
+    max_items: int = MAX_FEED_ITEMS,
+    links: dict[str, str] | None = None,
+    *,
+    expires_at: float | None = None,
+) -> Iterator[ET._Element]:
+    """
+    Streams the response body into an incremental lxml parser and yields the feed items one at a time,
+    while the rest of the body is still being downloaded. Each item is cleared once the caller is done
+    with it. Parsing stops at max_bytes of body or max_items items.
+    The WebSub hub and self links of the feed are added to links, when given.
+    expires_at is the monotonic time by which the body has to be read. The read timeout only bounds each
+    read, so a host trickling the body out is cut off here.
+    """
+    # Use recover=True to try and parse even slightly broken XML
+    parser = ET.XMLPullParser(events=("end",), tag=(*ITEM_TAGS, ATOM_LINK), recover=True, strip_cdata=False, resolve_entities=False)
+    received_bytes = 0
+    item_count = 0
+
+    try:
+        for chunk in _iter_body(response):
+            if expires_at is not None and time.monotonic() > expires_at:
+                logger.error(f"Reading feed {feed_url} took longer than its time budget")
+                raise HostUnavailableError(f"Timeout reading {feed_url}")
+
+            received_bytes += len(chunk)
+            if received_bytes > max_bytes:
+                logger.warning(f"Feed {feed_url} exceeds {max_bytes} bytes. Parsing stopped at the size cap.")
+                break
+
+            parser.feed(chunk)
+            for element in _read_items(parser, links):
+                yield element
+                _release(element)
+                item_count += 1
+                if item_count >= max_items:
+                    logger.warning(f"Feed {feed_url} has more than {max_items} items. Parsing stopped at the item cap.")
+                    return
+        else:
+            parser.close()
+            for element in _read_items(parser, links):
+                yield element
+                _release(element)
+    except ET.XMLSyntaxError as e:
+        logger.error(f"Failed to parse XML from {feed_url} using lxml", exc_info=e)
+        raise FeedParseError(f"Failed to parse XML from {feed_url}: {e}") from e
+    except (requests.exceptions.RequestException, urllib3.exceptions.HTTPError) as e:
+        # The connection broke or stalled after the headers, which says as much about the host as a failed request
+        logger.error(f"Network error reading feed from {feed_url}", exc_info=e)
+        raise HostUnavailableError(f"Network error reading {feed_url}: {e}") from e
+    finally:
+        response.close()
+
+    if received_bytes == 0:
+        logger.error(f"No content received from {feed_url} despite successful status.")
+        raise FeedFetchError(f"No content received from {feed_url}")
+
+
+def _read_feed_items(response: requests.Response, feed_url: str, links: dict[str, str] | None = None) -> list[ET._Element]:
+    """
+    Buffers the whole response and parses it in one go. Used when streaming is disabled.
+    """
     if not response.content:
         logger.error(f"No content received from {feed_url} despite successful status.")
         raise FeedFetchError(f"No content received from {feed_url}")
@@ -100,6 +258,48 @@ def get_feed_from_rss(feed_source: str, feed_url: str, category: str, language:
         # logger.debug(f"Content sample (first 500 bytes): {response.content[:500]!r}")
         raise FeedParseError(f"Failed to parse XML from {feed_url}: {e}") from e
 
+    for element in xml_root.iterfind(f"./channel/{ATOM_LINK}"):
+        _collect_link(element, links)
+    return xml_root.findall("./channel/item")[:MAX_FEED_ITEMS]
+
+
+def parse_content_items(content: bytes, feed_url: str, links: dict[str, str] | None = None) -> list[ET._Element]:
+    """
+    Parses a feed document that is already in memory, such as the content pushed by a WebSub hub.
+    Unlike the polled path it accepts every RSS and Atom flavour, since hubs may push either.
+    """
+    if not content:
+        raise FeedParseError(f"No content received for {feed_url}")
+
+    try:
+        parser = ET.XMLParser(recover=True, strip_cdata=False, resolve_entities=False)
+        xml_root = ET.fromstring(content, parser=parser)
+    except ET.XMLSyntaxError as e:
+        logger.error(f"Failed to parse XML content for {feed_url} using lxml", exc_info=e)
+        raise FeedParseError(f"Failed to parse XML content for {feed_url}: {e}") from e
+
+    if xml_root is None:
+        raise FeedParseError(f"Failed to parse XML content for {feed_url}")
+
+    for element in xml_root.iter(ATOM_LINK):
+        _collect_link(element, links)
+    return ITEMS_XPATH(xml_root)[:MAX_FEED_ITEMS]
+
+
+def get_parser(feed_source: str, parser_config: dict | None = None) -> parsers.FeedParser:
+    """
+    Returns the generic parser for the mapping stored with the source, or the parser class named after the source
+
+    Raises:
+        ParserNotFoundError: If there is no mapping and no parser class for the source, or the mapping is invalid.
+    """
+    if parser_config:
+        try:
+            return parsers.FeedParser(parsers.FeedMapping.model_validate(parser_config))
+        except (ValidationError, ET.XPathSyntaxError) as e:
+            logger.error(f"Invalid parser mapping for '{feed_source}'", exc_info=e)
+            raise ParserNotFoundError(f"Invalid parser mapping for '{feed_source}': {e}") from e
+
     try:
         # Get the appropriate parser class based on feed_source
         parser_class = getattr(parsers, feed_source)
@@ -107,11 +307,104 @@ def get_feed_from_rss(feed_source: str, feed_url: str, category: str, language:
         logger.error(f"Parser class '{feed_source}' not found in parsers module.", exc_info=e)
         raise ParserNotFoundError(f"Parser '{feed_source}' not found.") from e
 
+    return parser_class()
+
+
+def get_feed_from_rss(  # noqa: PLR0913
+    feed_source: str,
+    feed_url: str,
+    category: str,
+    language: str,
+    country: str,
+    *,
+    state: FeedState | None = None,
+    parser_config: dict | None = None,
+    timeout: float = REQUEST_TIMEOUT_SECONDS,
+) -> SourceNewsFeedModel:
+    """
+    Fetches and parses an RSS feed using lxml and custom parsers, raising specific exceptions on failure.
+
+    Args:
+        feed_source: The name of the parser class (e.g., 'TimesOfIndia', 'NDTV').
+        feed_url: The URL of the RSS feed.
+        state: Optional feed state. Its validators are sent as a conditional GET and
+            updated in place with the ETag / Last-Modified of a fresh response.
+        parser_config: Optional field mapping from the source metadata. When given, the feed is parsed
+            by the generic parser instead of the parser class named after the source.
+        timeout: Seconds the whole fetch may take, retries and reading the body included.
+            Shrunk by the reader near its deadline.
+
+    Returns:
+        A list of SourceNewsModel objects representing the feed items.
+
+    Raises:
+        FeedNotModifiedError: If the server answered 304 Not Modified to the conditional GET.
+        FeedFetchError: If the feed cannot be fetched (network, timeout, bad status).
+            HostUnavailableError, a subclass, when the host itself is unavailable.
+        FeedParseError: If the fetched content is not valid XML or has wrong content type.
+        ParserNotFoundError: If the specified parser class doesn't exist.
+        ParserExecutionError: If an error occurs within the custom parser logic.
+    """
+    feed_parser_instance = get_parser(feed_source, parser_config)
+    expires_at = time.monotonic() + timeout
+    response = _fetch_feed(feed_url, state, timeout)
+    # A hub may be advertised in the Link headers or in the feed itself
+    links = {rel: link["url"] for rel, link in response.links.items() if rel in WEBSUB_RELS}
+    if STREAM_PARSING:
+        items = iter_feed_items(response, feed_url, links=links, expires_at=expires_at)
+    else:
+        items = _read_feed_items(response, feed_url, links)
+
+    feed = _parse_feed_items(feed_parser_instance, items, feed_source, feed_url, category, language, country)
+
+    if state is not None:
+        state.hub = links.get("hub")
+        state.topic = links.get("self", feed_url) if state.hub else None
+
+    return feed
+
+
+def parse_feed_content(  # noqa: PLR0913, PLR0917
+    feed_source: str,
+    content: bytes,
+    feed_url: str,
+    category: str,
+    language: str,
+    country: str,
+    *,
+    parser_config: dict | None = None,
+) -> SourceNewsFeedModel:
+    """
+    Parses feed content that was pushed rather than fetched, with the same parser as get_feed_from_rss.
+
+    Raises:
+        FeedParseError: If the content is not valid XML.
+        ParserNotFoundError: If the specified parser class doesn't exist.
+        ParserExecutionError: If an error occurs within the custom parser logic.
+    """
+    feed_parser_instance = get_parser(feed_source, parser_config)
+    items = parse_content_items(content, feed_url)
+    return _parse_feed_items(feed_parser_instance, items, feed_source, feed_url, category, language, country)
+
+
+def _parse_feed_items(  # noqa: PLR0913, PLR0917
+    feed_parser_instance: parsers.FeedParser,
+    items: Iterable[ET._Element],
+    feed_source: str,
+    feed_url: str,
+    category: str,
+    language: str,
+    country: str,
+) -> SourceNewsFeedModel:
+    """
+    Runs the parser over the feed items, wrapping its errors in the feed exceptions
+    """
     try:
-        # Instantiate the parser and parse the feed
-        feed_parser_instance = parser_class()
-        feed = feed_parser_instance.parse_feed(xml_root, category, language, country)
-        SourceNewsFeedModel.model_validate(feed)
+        # Parse the feed
+        # Every item is validated once by the parser, so the feed itself is not validated again
+        feed = feed_parser_instance.parse_items(items, category, language, country)
+    except FeedError:
+        raise
     except ValidationError as e:
         logger.error(f"Validation error for feed {feed_url}", exc_info=e)
         raise FeedParseError(f"Validation error for feed {feed_url}: {e}") from e
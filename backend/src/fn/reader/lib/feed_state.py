@@ -0,0 +1,128 @@
+"""
+# --*-- coding: utf-8 --*--
+# Feed state
+# Persists per-feed state (HTTP validators, content fingerprint, etc.) between reader runs.
+# State lives in the news table under FEEDSTATE#{source}, or in a local JSON file as a stand-in.
+"""
+
+# ==================================================================================================
+# Python imports
+import os
+import threading
+
+from pydantic import BaseModel, Field
+
+# ==================================================================================================
+# Module imports
+from shared.logger import logger
+
+from .partition_store import DynamoDBPartitionStore, JsonFilePartitionStore, PartitionStore
+
+# ==================================================================================================
+# Data models
+
+
+class FeedState(BaseModel):
+    """
+    This class defines the state kept for a single feed URL between runs
+    """
+
+    feed_url: str
+    etag: str | None = Field(default=None)
+    last_modified: str | None = Field(default=None)
+    content_hash: str | None = Field(default=None)
+    # Scheduling: smoothed publish rate (items per hour), last successful fetch and next due time (UNIX seconds)
+    rate: float | None = Field(default=None)
+    last_fetched: int | None = Field(default=None)
+    next_due: int | None = Field(default=None)
+    # Truncated URL hashes of the items already emitted, oldest first (see seen_items)
+    seen: list[str] = Field(default_factory=list)
+    # WebSub: the hub and topic the feed advertises, when its subscription lease expires
+    # and when a subscription was last requested (UNIX seconds, see websub)
+    hub: str | None = Field(default=None)
+    topic: str | None = Field(default=None)
+    lease_expires: int | None = Field(default=None)
+    subscription_requested: int | None = Field(default=None)
+
+
+# ==================================================================================================
+# Stores
+
+
+class FeedStateStore(PartitionStore):
+    """
+    Base class for feed state stores: pk=FEEDSTATE#{source}, sk=URL#{feed_url}.
+    Only the attributes that changed since they were loaded are written back.
+    """
+
+    SK_PREFIX = "URL#"
+    ID_FIELD = "feed_url"
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._loaded: dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    def load(self, news_source: str) -> dict[str, FeedState]:
+        """
+        Loads the state of every known feed of the source, keyed by feed URL
+        """
+        states = {item["feed_url"]: FeedState.model_validate(item) for item in self._read(self._pk(news_source))}
+        with self._lock:
+            self._loaded.update({self._key(news_source, url): state.model_dump() for url, state in states.items()})
+        return states
+
+    def save(self, news_source: str, states: list[FeedState]) -> None:
+        """
+        Writes back the attributes of each state that differ from what was loaded. The push handler, the workers
+        and the subscription renewal update the same feeds, so only the attributes a writer changed are written.
+        """
+        changes: dict[str, dict] = {}
+        with self._lock:
+            for state in states:
+                current = state.model_dump()
+                loaded = self._loaded_state(news_source, state.feed_url)
+                changed = {name: value for name, value in current.items() if loaded.get(name) != value}
+                if changed:
+                    changes[state.feed_url] = changed
+                    self._loaded[self._key(news_source, state.feed_url)] = current
+
+        if not changes:
+            return
+
+        logger.info(f"Saving state for {len(changes)} feeds of {news_source}")
+        self._write(self._pk(news_source), changes)
+
+    @staticmethod
+    def _pk(news_source: str) -> str:
+        return f"FEEDSTATE#{news_source}"
+
+    @staticmethod
+    def _key(news_source: str, feed_url: str) -> str:
+        return f"{news_source}#{feed_url}"
+
+    def _loaded_state(self, news_source: str, feed_url: str) -> dict:
+        # Feeds without stored state compare against a fresh state, so failed first fetches are not written
+        return self._loaded.get(self._key(news_source, feed_url)) or FeedState(feed_url=feed_url).model_dump()
+
+
+class DynamoDBFeedStateStore(DynamoDBPartitionStore, FeedStateStore):
+    """
+    Stores feed state in the news table
+    """
+
+
+class JsonFileFeedStateStore(JsonFilePartitionStore, FeedStateStore):
+    """
+    Stores feed state in a local JSON file
+    """
+
+
+def get_feed_state_store() -> FeedStateStore:
+    """
+    Returns the JSON file store when FEED_STATE_FILE is set, otherwise the DynamoDB store on the news table
+    """
+    state_file = os.environ.get("FEED_STATE_FILE")
+    if state_file:
+        return JsonFileFeedStateStore(state_file)
+    return DynamoDBFeedStateStore(os.environ["NEWS_TABLE_NAME"])
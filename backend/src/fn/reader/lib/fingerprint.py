@@ -0,0 +1,30 @@
+"""
+# --*-- coding: utf-8 --*--
+# Feed fingerprint
+# Hashes the normalised content of a parsed feed so unchanged feeds can be detected without HTTP validators
+"""
+
+# ==================================================================================================
+# Python imports
+import hashlib
+
+# ==================================================================================================
+# Module imports
+from shared.news_model import SourceNewsFeedModel
+
+# ==================================================================================================
+# Global declarations
+
+# Only the fields that identify what a reader sees are hashed. Volatile fields such as
+# 'published' (which falls back to the fetch time when an item has no pubDate) and the
+# order of the items are left out.
+FINGERPRINT_FIELDS = {"news_url", "headline", "summary", "media"}
+
+
+def feed_fingerprint(feed: SourceNewsFeedModel) -> str:
+    """
+    Returns a SHA-256 hex digest of the normalised item list of the feed
+    """
+    # Fields are dumped in model order, so the JSON of an item is stable without sorting its keys
+    normalised_items = sorted(item.model_dump_json(include=FINGERPRINT_FIELDS).encode() for item in feed.feed)
+    return hashlib.sha256(b"\n".join(normalised_items)).hexdigest()
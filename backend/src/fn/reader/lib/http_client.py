@@ -0,0 +1,115 @@
+"""
+# --*-- coding: utf-8 --*--
+# HTTP client
+# A pooled requests session shared by every feed fetch of a warm container
+"""
+
+# ==================================================================================================
+# Python imports
+import contextlib
+import importlib.util
+import os
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import InvalidHeader
+from urllib3.util.retry import Retry
+
+# ==================================================================================================
+# Global declarations
+
+USER_AGENT = "SnapNewsReader/1.0"  # It's good practice to identify your bot
+
+POOL_CONNECTIONS = int(os.environ.get("READER_HTTP_POOL_CONNECTIONS", "10"))
+POOL_MAXSIZE = int(os.environ.get("READER_HTTP_POOL_MAXSIZE", "8"))
+MAX_RETRIES = int(os.environ.get("READER_HTTP_MAX_RETRIES", "2"))
+BACKOFF_FACTOR = float(os.environ.get("READER_HTTP_BACKOFF_FACTOR", "0.5"))
+# A retry is not made with less of the budget left than this
+MIN_ATTEMPT_SECONDS = float(os.environ.get("READER_HTTP_MIN_ATTEMPT_SECONDS", "2"))
+
+# Transient server errors worth another attempt
+RETRY_STATUS_CODES = (500, 502, 503, 504)
+
+
+def _accept_encoding() -> str:
+    """
+    Advertises brotli only when a decoder is installed, since urllib3 can only decode it then
+    """
+    encodings = ["gzip", "deflate"]
+    if importlib.util.find_spec("brotli") or importlib.util.find_spec("brotlicffi"):
+        encodings.append("br")
+    return ", ".join(encodings)
+
+
+def create_session(pool_connections: int = POOL_CONNECTIONS, pool_maxsize: int = POOL_MAXSIZE) -> requests.Session:
+    """
+    Creates a session with keep-alive connection pools and compression.
+    pool_connections is the number of hosts kept in the pool, pool_maxsize the connections per host.
+    Retries are left to get_within_budget, which knows how much time the caller has.
+    """
+    adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update({"User-Agent": USER_AGENT, "Accept-Encoding": _accept_encoding()})
+    return session
+
+
+def _retry_wait(response: requests.Response | None, attempt: int) -> float:
+    """
+    Returns the seconds to wait before the next attempt: the exponential backoff, or the Retry-After of the response
+    """
+    wait = BACKOFF_FACTOR * 2**attempt
+    retry_after = response.headers.get("Retry-After") if response is not None else None
+    if retry_after:
+        with contextlib.suppress(InvalidHeader):
+            wait = max(wait, Retry().parse_retry_after(retry_after))
+    return wait
+
+
+def _retry_fits(expires_at: float, wait: float, attempt: int, max_retries: int) -> bool:
+    """
+    Returns whether another attempt is allowed, and leaves enough of the budget after its wait
+    """
+    return attempt < max_retries and expires_at - time.monotonic() - wait >= MIN_ATTEMPT_SECONDS
+
+
+def get_within_budget(
+    http_session: requests.Session,
+    url: str,
+    budget: float,
+    max_retries: int = MAX_RETRIES,
+    **kwargs: object,
+) -> requests.Response:
+    """
+    GETs the url, retrying connection errors and 5xx responses while the attempts fit in budget seconds.
+    Every attempt gets the time left of the budget as its timeout. A retry, with its backoff or Retry-After,
+    is only made when MIN_ATTEMPT_SECONDS are left for it afterwards. Otherwise the last response is
+    returned, or the last error raised, for the caller to report.
+    """
+    expires_at = time.monotonic() + budget
+    attempt = 0
+    while True:
+        try:
+            # urllib3 refuses a timeout of zero
+            response = http_session.get(url, timeout=max(expires_at - time.monotonic(), 0.001), **kwargs)
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+            wait = _retry_wait(None, attempt)
+            if not _retry_fits(expires_at, wait, attempt, max_retries):
+                raise
+        else:
+            if response.status_code not in RETRY_STATUS_CODES:
+                return response
+            wait = _retry_wait(response, attempt)
+            if not _retry_fits(expires_at, wait, attempt, max_retries):
+                return response
+            response.close()
+
+        time.sleep(wait)
+        attempt += 1
+
+
+# Created at import time so connections survive between warm invocations
+session = create_session()
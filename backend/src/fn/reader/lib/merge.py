@@ -0,0 +1,42 @@
+"""
+# --*-- coding: utf-8 --*--
+# Cross-category merge
+# The same article is often listed in several feeds of a source (e.g. INDIA and TOP).
+# Within a run, the new items of every feed are indexed by their canonical URL, so each article
+# is uploaded once, by the first feed that lists it, with the union of its categories.
+"""
+
+# ==================================================================================================
+# Python imports
+from collections.abc import Iterable
+
+# ==================================================================================================
+# Module imports
+from shared.news_model import SourceNewsItemModel
+
+# ==================================================================================================
+
+
+def merge_feeds(feeds: Iterable[tuple[str, list[SourceNewsItemModel]]]) -> tuple[dict[str, list[SourceNewsItemModel]], dict[str, str]]:
+    """
+    Merges the items of several feeds, given as (S3 key, items) pairs in priority order.
+    The items are indexed by their canonical URL, as computed by the parser.
+    Returns the items uploaded under each key and the key every canonical URL is uploaded under.
+    """
+    merged: dict[str, list[SourceNewsItemModel]] = {}
+    index: dict[str, SourceNewsItemModel] = {}
+    owners: dict[str, str] = {}
+
+    for s3_key, items in feeds:
+        owned = merged.setdefault(s3_key, [])
+        for item in items:
+            first = index.get(item.canonical_url)
+            if first is None:
+                index[item.canonical_url] = item
+                owners[item.canonical_url] = s3_key
+                owned.append(item)
+                continue
+            # Later copies only contribute their categories
+            first.categories.extend(category for category in item.categories if category not in first.categories)
+
+    return merged, owners
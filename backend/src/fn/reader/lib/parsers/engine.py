@@ -0,0 +1,170 @@
+"""
+# --*-- coding: utf-8 --*--
+This Module contains the generic RSS/Atom parser.
+Sources are described by a field mapping of XPath expressions, stored with the source metadata,
+so onboarding a new source needs no new parser class.
+"""
+
+# ==================================================================================================
+# Python imports
+import logging
+from collections.abc import Iterable
+from functools import lru_cache
+from urllib.parse import urlsplit, urlunsplit
+
+from lxml import etree as ET  # noqa: N812
+from pydantic import BaseModel, Field, ValidationError
+
+# ==================================================================================================
+# Module imports
+from shared.canonical_url import canonical_url
+from shared.content import santise_contents
+from shared.logger import LOG_RATE_LIMIT_PER_MINUTE, log_payload, log_sampled, logger
+from shared.news_model import SourceNewsFeedModel, SourceNewsItemModel
+from shared.time import TimestampParser, time_to_iso_and_ms
+
+# ==================================================================================================
+# Global declarations
+
+NAMESPACES = {
+    "atom": "http://www.w3.org/2005/Atom",
+    "content": "http://purl.org/rss/1.0/modules/content/",
+    "dc": "http://purl.org/dc/elements/1.1/",
+    "media": "http://search.yahoo.com/mrss/",
+    "rss1": "http://purl.org/rss/1.0/",
+}
+
+# XPath expressions evaluated relative to an item. They cover RSS 2.0, RSS 1.0 and Atom,
+# and every one of them can be overridden per source.
+DEFAULT_FIELDS = {
+    "headline": "string(title | rss1:title | atom:title)",
+    "news_url": "string(link | rss1:link | atom:link[not(@rel) or @rel='alternate']/@href)",
+    "published": "string(pubDate | dc:date | atom:published | atom:updated)",
+    "summary": "string(description | rss1:description | atom:summary | atom:content)",
+    "image_url": "string(media:content/@url | media:thumbnail/@url | enclosure/@url)",
+}
+
+# Items of a fully parsed feed, relative to the document root
+ITEMS_XPATH = ET.XPath("channel/item | rss1:item | atom:entry", namespaces=NAMESPACES)
+
+
+class FeedMapping(BaseModel):
+    """
+    This class defines how the fields of a news item are extracted from a feed item
+    """
+
+    source_name: str
+    source_id: str
+    fields: dict[str, str] = Field(default_factory=dict)
+    namespaces: dict[str, str] = Field(default_factory=dict)
+    # Query parameters that identify an article. Without an allowlist only known tracking parameters are dropped.
+    query_allowlist: list[str] | None = Field(default=None)
+
+
+@lru_cache(maxsize=128)
+def _compile(fields: tuple[tuple[str, str], ...], namespaces: tuple[tuple[str, str], ...]) -> dict[str, ET.XPath]:
+    """
+    Compiles the XPath expressions of a mapping. Cached, so each mapping is compiled once per warm container.
+    """
+    logger.info(f"Compiling XPath expressions for fields: {[name for name, _ in fields]}")
+    return {name: ET.XPath(expression, namespaces=dict(namespaces)) for name, expression in fields}
+
+
+def compile_mapping(mapping: FeedMapping) -> dict[str, ET.XPath]:
+    """
+    Returns the compiled XPath expression of every field of the mapping, defaults included
+    """
+    fields = {**DEFAULT_FIELDS, **mapping.fields}
+    namespaces = {**NAMESPACES, **mapping.namespaces}
+    return _compile(tuple(sorted(fields.items())), tuple(sorted(namespaces.items())))
+
+
+class FeedParser:
+    """
+    This class parses RSS and Atom feeds using a field mapping
+    """
+
+    def __init__(self, mapping: FeedMapping) -> None:
+        self.mapping = mapping
+        self.xpaths = compile_mapping(mapping)
+        self.query_allowlist = frozenset(mapping.query_allowlist) if mapping.query_allowlist is not None else None
+        # A parser instance reads a single feed, so the timestamp format it detects is reused for every item
+        self.timestamp_parser = TimestampParser()
+
+    def parse_feed(self, xml_root: ET._Element, category: str, language: str, country: str) -> SourceNewsFeedModel:
+        """
+        Parses the XML root and returns a list of validated news items.
+        """
+        return self.parse_items(ITEMS_XPATH(xml_root), category, language, country)
+
+    def parse_items(self, items: Iterable[ET._Element], category: str, language: str, country: str) -> SourceNewsFeedModel:
+        """
+        Parses the feed items one at a time, so they can be streamed from an incremental parser
+        """
+        logger.info(f"Parsing {self.mapping.source_id} feed for {category} in {language} for {country}")
+
+        parsed_items = self._extract_items(items, category, language, country)
+        feed: list[SourceNewsItemModel] = []
+        for parsed_item in parsed_items:
+            log_payload("Parsed item", parsed_item, max_per_minute=LOG_RATE_LIMIT_PER_MINUTE)
+            try:
+                feed.append(SourceNewsItemModel.model_validate(parsed_item))
+            except ValidationError as e:
+                log_sampled(logging.DEBUG, "Error parsing item for %s in %s for %s: %s", category, language, country, e, exc_info=e)
+                # In future, we can identify the exact error and put in a queue for scraping
+                continue
+
+        logger.info(f"Parsed {len(feed)} items out of {len(parsed_items)} for {category} in {language} for {country}")
+
+        # The items were validated one by one above, so the feed is constructed without validating them again
+        return SourceNewsFeedModel.model_construct(feed=feed)
+
+    def _extract_items(self, items: Iterable[ET._Element], category: str, language: str, country: str) -> list[dict]:
+        """
+        Parses each item as it is streamed in, then sanitises the summaries of the whole feed in one batch
+        """
+        parsed_items = [self._parse_item(item, category, language, country) for item in items]
+        summaries = santise_contents(parsed_item["summary"] for parsed_item in parsed_items)
+        for parsed_item, summary in zip(parsed_items, summaries, strict=True):
+            parsed_item["summary"] = summary or None
+        return parsed_items
+
+    def _extract(self, item: ET._Element, field: str) -> str | None:
+        """
+        Evaluates the compiled XPath of a field. Missing and blank values are returned as None.
+        """
+        value = str(self.xpaths[field](item)).strip()
+        return value or None
+
+    def _parse_item(self, item: ET._Element, category: str, language: str, country: str) -> dict:
+        """
+        This function parses a single XML item into the fields of a SourceNewsItemModel
+        """
+        # Sanitise the url to remove fragments. Its canonical form, which tracking and scheme variants
+        # of an article share, is what the item is keyed and hashed by.
+        url = self._extract(item, "news_url")
+        try:
+            sanitised_url = urlunsplit(urlsplit(url)._replace(fragment="")) if url else None
+        except ValueError:
+            # A malformed IPv6 host. One bad link should not fail the whole feed.
+            sanitised_url = url.partition("#")[0]
+
+        # Parsed once, into both the ISO string and the epoch milliseconds
+        published, published_ms = time_to_iso_and_ms(self._extract(item, "published"), self.timestamp_parser)
+
+        data = {
+            "source_name": self.mapping.source_name,
+            "source_id": self.mapping.source_id,
+            "country": country,
+            "language": language,
+            "news_url": sanitised_url,
+            "canonical_url": canonical_url(url, self.query_allowlist) if url else None,
+            "headline": self._extract(item, "headline"),
+            "published": published,
+            "published_ms": published_ms,
+            # Sanitised with the rest of the feed's summaries
+            "summary": self._extract(item, "summary"),
+            "categories": [category],
+            "media": {"image_url": self._extract(item, "image_url"), "video_url": None},
+        }
+        return data
@@ -0,0 +1,113 @@
+"""
+# --*-- coding: utf-8 --*--
+# Partition stores
+# The reader keeps its state (per feed, per host) as records in a partition of the news table, one item per record:
+# pk={partition}, sk={prefix}{id}. The local JSON state file stands in for the table, keyed the same way.
+# The stores of each record type subclass the DynamoDB and JSON file stores here.
+"""
+
+# ==================================================================================================
+# Python imports
+import abc
+import json
+import threading
+from decimal import Decimal
+from pathlib import Path
+from typing import Any
+
+# ==================================================================================================
+# AWS imports
+import boto3
+from boto3.dynamodb.conditions import Key
+
+# ==================================================================================================
+# Global declarations
+
+# The JSON file stores of every record type share one file
+FILE_LOCK = threading.Lock()
+
+
+def query_partition(table: Any, pk: str, sk_prefix: str) -> list[dict]:  # noqa: ANN401
+    """
+    Returns every item of the partition whose sort key starts with sk_prefix, following the pages of the query
+    """
+    query_args = {"KeyConditionExpression": Key("pk").eq(pk) & Key("sk").begins_with(sk_prefix)}
+    items: list[dict] = []
+    while True:
+        response = table.query(**query_args)
+        items.extend(response.get("Items", []))
+        if "LastEvaluatedKey" not in response:
+            return items
+        query_args["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+
+class PartitionStore(abc.ABC):
+    """
+    Base class for the stores of a record type. The record type sets the sort key prefix and the field
+    holding the id of a record, the backend implements the reads and writes.
+    """
+
+    SK_PREFIX: str
+    ID_FIELD: str
+
+    @abc.abstractmethod
+    def _read(self, pk: str) -> list[dict]:
+        """
+        Returns the records of the partition
+        """
+
+    @abc.abstractmethod
+    def _write(self, pk: str, changes: dict[str, dict]) -> None:
+        """
+        Updates the given attributes of each record, keyed by id, and leaves the others as they are
+        """
+
+
+class DynamoDBPartitionStore(PartitionStore):
+    """
+    Keeps the records in the news table
+    """
+
+    def __init__(self, table_name: str) -> None:
+        super().__init__()
+        self.table = boto3.resource("dynamodb").Table(table_name)
+
+    def _read(self, pk: str) -> list[dict]:
+        return query_partition(self.table, pk, self.SK_PREFIX)
+
+    def _write(self, pk: str, changes: dict[str, dict]) -> None:
+        for record_id, attributes in changes.items():
+            # DynamoDB does not accept floats, so numbers go through Decimal
+            values = json.loads(json.dumps({self.ID_FIELD: record_id, **attributes}), parse_float=Decimal)
+            self.table.update_item(
+                Key={"pk": pk, "sk": f"{self.SK_PREFIX}{record_id}"},
+                UpdateExpression="SET " + ", ".join(f"#a{i} = :a{i}" for i in range(len(values))),
+                ExpressionAttributeNames={f"#a{i}": name for i, name in enumerate(values)},
+                ExpressionAttributeValues={f":a{i}": value for i, value in enumerate(values.values())},
+            )
+
+
+class JsonFilePartitionStore(PartitionStore):
+    """
+    Keeps the records in a local JSON file: {pk: {id: record}}
+    """
+
+    def __init__(self, path: str) -> None:
+        super().__init__()
+        self.path = Path(path)
+
+    def _read_all(self) -> dict:
+        if not self.path.exists():
+            return {}
+        return json.loads(self.path.read_text(encoding="utf-8"))
+
+    def _read(self, pk: str) -> list[dict]:
+        return list(self._read_all().get(pk, {}).values())
+
+    def _write(self, pk: str, changes: dict[str, dict]) -> None:
+        with FILE_LOCK:
+            data = self._read_all()
+            records = data.setdefault(pk, {})
+            for record_id, attributes in changes.items():
+                records[record_id] = {**records.get(record_id, {self.ID_FIELD: record_id}), **attributes}
+            self.path.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
@@ -0,0 +1,103 @@
+"""
+# --*-- coding: utf-8 --*--
+# Feed scheduler
+# Estimates how often each feed publishes and decides when it is due to be fetched again.
+# The reader is invoked on a frequent tick and only fetches the feeds that are due.
+"""
+
+# ==================================================================================================
+# Python imports
+import os
+from collections.abc import Iterable
+
+# ==================================================================================================
+# Module imports
+from shared.logger import logger
+
+from .feed_state import FeedState
+
+# ==================================================================================================
+# Global declarations
+
+MIN_INTERVAL_MINUTES = int(os.environ.get("READER_MIN_INTERVAL_MINUTES", "15"))
+MAX_INTERVAL_MINUTES = int(os.environ.get("READER_MAX_INTERVAL_MINUTES", "1440"))
+# Number of new items a fetch should find on average. Lower values poll fast feeds more often.
+TARGET_NEW_ITEMS = float(os.environ.get("READER_TARGET_NEW_ITEMS", "3"))
+# Weight of the latest observation in the publish rate moving average
+RATE_SMOOTHING = float(os.environ.get("READER_RATE_SMOOTHING", "0.3"))
+# Feeds due within this many seconds of a tick are fetched on that tick rather than the next one
+DUE_GRACE_SECONDS = 60
+
+
+class FeedScheduler:
+    """
+    Keeps a per-feed publish rate (items per hour, exponentially smoothed) and turns it into a next-due time
+    """
+
+    def __init__(
+        self,
+        min_interval_minutes: int = MIN_INTERVAL_MINUTES,
+        max_interval_minutes: int = MAX_INTERVAL_MINUTES,
+        target_new_items: float = TARGET_NEW_ITEMS,
+        smoothing: float = RATE_SMOOTHING,
+    ) -> None:
+        self.min_interval = min_interval_minutes * 60
+        self.max_interval = max(max_interval_minutes * 60, self.min_interval)
+        self.target_new_items = target_new_items
+        self.smoothing = smoothing
+
+    def is_due(self, state: FeedState, now: int) -> bool:
+        """
+        Feeds that were never scheduled are always due.
+        Feeds with an active WebSub subscription have their items pushed, so they are only polled
+        at the maximum interval, as a safety net for missed pushes.
+        """
+        if state.lease_expires is not None and state.lease_expires > now and state.last_fetched is not None:
+            return state.last_fetched + self.max_interval <= now + DUE_GRACE_SECONDS
+        return state.next_due is None or state.next_due <= now + DUE_GRACE_SECONDS
+
+    def interval(self, rate: float | None) -> int:
+        """
+        Returns the polling interval in seconds for a publish rate, clamped to the configured bounds
+        """
+        if not rate:
+            return self.max_interval if rate == 0 else self.min_interval
+        seconds = int(self.target_new_items / rate * 3600)
+        return min(max(seconds, self.min_interval), self.max_interval)
+
+    def record_fetch(self, state: FeedState, published_ms: Iterable[int], now: int, new_items: int | None = None) -> None:
+        """
+        Updates the publish rate and next-due time of a feed after a successful fetch.
+        new_items defaults to the number of items published since the previous fetch.
+        """
+        timestamps = [ms / 1000 for ms in published_ms]
+
+        if state.last_fetched is None:
+            # First fetch: bootstrap the rate from the time span covered by the feed window
+            observed = self._window_rate(timestamps)
+        else:
+            if new_items is None:
+                new_items = sum(1 for ts in timestamps if ts > state.last_fetched)
+            elapsed_hours = max(now - state.last_fetched, 60) / 3600
+            observed = new_items / elapsed_hours
+
+        if observed is not None:
+            state.rate = observed if state.rate is None else self.smoothing * observed + (1 - self.smoothing) * state.rate
+            state.rate = round(state.rate, 4)
+
+        state.last_fetched = now
+        state.next_due = now + self.interval(state.rate)
+        logger.debug(f"Feed {state.feed_url}: rate {state.rate}/h, next due in {state.next_due - now}s")
+
+    def record_failure(self, state: FeedState, now: int) -> None:
+        """
+        Schedules a failed feed for its usual interval instead of retrying it on every tick
+        """
+        state.next_due = now + self.interval(state.rate)
+
+    @staticmethod
+    def _window_rate(timestamps: list[float]) -> float | None:
+        if len(timestamps) < 2:  # noqa: PLR2004
+            return None
+        span_hours = max(max(timestamps) - min(timestamps), 60) / 3600
+        return (len(timestamps) - 1) / span_hours
@@ -0,0 +1,57 @@
+"""
+# --*-- coding: utf-8 --*--
+# Seen items
+# Remembers the items each feed has already emitted, so a run only uploads the stories that are new.
+# The seen set is a bounded list of truncated URL hashes stored with the feed state, oldest first.
+"""
+
+# ==================================================================================================
+# Python imports
+import os
+
+# ==================================================================================================
+# Module imports
+from shared.news_model import SourceNewsFeedModel
+from shared.url_hasher import hasher
+
+from .feed_state import FeedState
+
+# ==================================================================================================
+# Global declarations
+
+# Twice the item cap of a feed, so items that drop out of the window and come back are still recognised
+MAX_SEEN_ITEMS = int(os.environ.get("READER_MAX_SEEN_ITEMS", "1000"))
+# 64 bits of the URL hash keep collisions negligible within a single feed's window
+SEEN_KEY_LENGTH = 16
+
+
+def seen_key(canonical_url: str) -> str:
+    """
+    Returns the truncated hash stored in the seen set for the canonical URL of an item
+    """
+    return hasher(canonical_url)[:SEEN_KEY_LENGTH]
+
+
+def filter_seen(feed: SourceNewsFeedModel, state: FeedState) -> tuple[SourceNewsFeedModel, list[str]]:
+    """
+    Drops the items the feed has already emitted.
+    Returns the new items and their seen keys, which are only remembered once the items are uploaded.
+    """
+    seen = set(state.seen)
+    new_items = []
+    new_keys = []
+    for item in feed.feed:
+        key = seen_key(item.canonical_url)
+        if key in seen:
+            continue
+        seen.add(key)
+        new_items.append(item)
+        new_keys.append(key)
+    return SourceNewsFeedModel.model_construct(feed=new_items), new_keys
+
+
+def remember_seen(state: FeedState, keys: list[str], max_items: int = MAX_SEEN_ITEMS) -> None:
+    """
+    Adds the keys to the seen set of the feed, evicting the oldest ones beyond max_items
+    """
+    state.seen = (state.seen + keys)[-max_items:]
@@ -0,0 +1,117 @@
+"""
+# --*-- coding: utf-8 --*--
+# Source registry
+# Keeps the news sources of a country/language in memory while the container is warm
+"""
+
+# ==================================================================================================
+# Python imports
+import os
+import threading
+import time
+
+# ==================================================================================================
+# AWS imports
+import boto3
+
+# ==================================================================================================
+# Module imports
+from shared.logger import logger
+
+from .partition_store import query_partition
+
+# ==================================================================================================
+# Global declarations
+
+SOURCE_CACHE_TTL_SECONDS = int(os.environ.get("SOURCE_CACHE_TTL_SECONDS", "300"))
+SOURCE_VERSION_CHECK_SECONDS = int(os.environ.get("SOURCE_VERSION_CHECK_SECONDS", "60"))
+
+# Sort key of the item whose 'Version' attribute is bumped whenever the sources of a partition are edited
+VERSION_SK = "VERSION"
+
+
+class SourceRegistry:
+    """
+    Bulk-loads every SOURCE#{country}#{language} item with a single query and serves lookups from memory.
+    A partition is reloaded when its TTL expires or when its version stamp changes.
+    """
+
+    def __init__(
+        self,
+        table_name: str,
+        ttl_seconds: int = SOURCE_CACHE_TTL_SECONDS,
+        version_check_seconds: int = SOURCE_VERSION_CHECK_SECONDS,
+    ) -> None:
+        self.table = boto3.resource("dynamodb").Table(table_name)
+        self.ttl_seconds = ttl_seconds
+        self.version_check_seconds = version_check_seconds
+        self._sources: dict[str, dict[str, dict]] = {}
+        self._versions: dict[str, str | None] = {}
+        self._loaded_at: dict[str, float] = {}
+        self._checked_at: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def get(self, news_source: str, country: str, language: str) -> dict | None:
+        """
+        Returns the source item, loading or refreshing the partition first if needed
+        """
+        pk = f"SOURCE#{country}#{language}"
+        with self._lock:
+            if self._is_stale(pk):
+                self._load(pk)
+            return self._sources.get(pk, {}).get(news_source)
+
+    def invalidate(self) -> None:
+        """
+        Drops every cached partition, so the next lookup reloads it
+        """
+        with self._lock:
+            self._sources.clear()
+            self._versions.clear()
+            self._loaded_at.clear()
+            self._checked_at.clear()
+
+    def _is_stale(self, pk: str) -> bool:
+        now = time.monotonic()
+        if pk not in self._sources or now - self._loaded_at[pk] >= self.ttl_seconds:
+            return True
+
+        if now - self._checked_at[pk] < self.version_check_seconds:
+            return False
+
+        self._checked_at[pk] = now
+        version = self._read_version(pk)
+        if version != self._versions[pk]:
+            logger.info(f"Sources of {pk} changed (version {self._versions[pk]} -> {version})")
+            return True
+        return False
+
+    def _read_version(self, pk: str) -> str | None:
+        response = self.table.get_item(
+            Key={"pk": pk, "sk": VERSION_SK},
+            ProjectionExpression="#version",
+            ExpressionAttributeNames={"#version": "Version"},
+        )
+        version = response.get("Item", {}).get("Version")
+        return str(version) if version is not None else None
+
+    def _load(self, pk: str) -> None:
+        # Read the version first, so an edit made during the load is picked up by the next check
+        version = self._read_version(pk)
+
+        sources = {item["sk"].removeprefix("NAME#"): item for item in query_partition(self.table, pk, "NAME#")}
+
+        # Partitions without sources are not kept, so lookups for made-up countries and languages cannot fill the cache
+        if not sources:
+            logger.warning(f"No sources found for {pk}")
+            for cache in (self._sources, self._versions, self._loaded_at, self._checked_at):
+                cache.pop(pk, None)
+            return
+
+        logger.info(f"Loaded {len(sources)} sources for {pk}: {sorted(sources)}")
+
+        now = time.monotonic()
+        self._sources[pk] = sources
+        self._versions[pk] = version
+        self._loaded_at[pk] = now
+        self._checked_at[pk] = now
@@ -0,0 +1,77 @@
+"""
+# --*-- coding: utf-8 --*--
+# Feed tasks
+# Expands the source metadata feeds into one task per feed URL
+"""
+
+# ==================================================================================================
+# Python imports
+from dataclasses import dataclass
+
+# ==================================================================================================
+# Module imports
+from shared.logger import logger
+
+# ==================================================================================================
+
+
+@dataclass(frozen=True)
+class FeedTask:
+    """
+    A single feed URL to fetch, parse and upload
+    """
+
+    category: str
+    feed_url: str
+    index: int
+    total: int
+    s3_key: str
+
+
+def build_feed_tasks(news_source: str, feeds: dict) -> tuple[list[FeedTask], int]:
+    """
+    Flattens the category -> URL(s) mapping into feed tasks.
+    Returns the tasks and the number of invalid entries that were skipped.
+    """
+    tasks: list[FeedTask] = []
+    invalid_entries = 0
+
+    for category, feed_value in feeds.items():
+        # Handle both single URLs and arrays of URLs
+        if isinstance(feed_value, list):
+            urls_to_process = feed_value
+            logger.info(f"Found {len(urls_to_process)} URLs for category {category}")
+        elif isinstance(feed_value, str):
+            urls_to_process = [feed_value]
+            logger.info(f"Found 1 URL for category {category}")
+        else:
+            logger.error(f"Invalid feed value type for category {category}: {type(feed_value)}")
+            invalid_entries += 1
+            continue
+
+        for i, feed_url in enumerate(urls_to_process):
+            if not isinstance(feed_url, str):
+                logger.error(f"Invalid feed URL type for category {category}: {type(feed_url)}")
+                invalid_entries += 1
+                continue
+
+            # For multiple URLs in same category, add index to S3 key to avoid overwrites
+            s3_key = f"{news_source}-{category}"
+            if len(urls_to_process) > 1:
+                s3_key += f"-{i+1}"
+            s3_key += ".json"
+
+            tasks.append(FeedTask(category=category, feed_url=feed_url, index=i, total=len(urls_to_process), s3_key=s3_key))
+
+    return tasks, invalid_entries
+
+
+def run_s3_key(news_source: str, batch_task: FeedTask | None = None) -> str:
+    """
+    Returns the S3 key of the consolidated object of a run, which holds the items of every feed of the source.
+    Workers each read a batch of the feeds. Batches read at the same time never share a feed,
+    so the object of a batch is keyed by its first feed.
+    """
+    if batch_task is None:
+        return f"{news_source}.json"
+    return f"{news_source}.batch-{batch_task.s3_key}"
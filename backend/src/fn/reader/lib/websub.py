@@ -0,0 +1,227 @@
+"""
+# --*-- coding: utf-8 --*--
+# WebSub
+# Subscribes push-capable feeds (e.g. feedburner) to the hub they advertise, so new items are pushed to the
+# reader's callback within seconds instead of waiting for the next poll. Implements the subscriber side of
+# https://www.w3.org/TR/websub/: subscription requests, intent verification, lease renewal and signatures.
+"""
+
+# ==================================================================================================
+# Python imports
+import hashlib
+import hmac
+import os
+from urllib.parse import urlencode
+
+import boto3
+import requests
+
+# ==================================================================================================
+# Module imports
+from shared.logger import logger
+
+from .feed_state import FeedState
+from .http_client import session
+
+# ==================================================================================================
+# Global declarations
+
+# Public URL of the push handler. Feeds are only subscribed when it is set.
+CALLBACK_URL = os.environ.get("WEBSUB_CALLBACK_URL")
+# Requested lease. Hubs may grant a shorter one, which is what the verification request reports.
+LEASE_SECONDS = int(os.environ.get("WEBSUB_LEASE_SECONDS", str(10 * 24 * 3600)))
+# Subscriptions are renewed when their lease ends within this window
+RENEW_BEFORE_SECONDS = int(os.environ.get("WEBSUB_RENEW_BEFORE_SECONDS", str(24 * 3600)))
+# A request that the hub has not verified yet is not repeated within this window
+REQUEST_RETRY_SECONDS = int(os.environ.get("WEBSUB_REQUEST_RETRY_SECONDS", "3600"))
+REQUEST_TIMEOUT_SECONDS = 10
+
+MODE_SUBSCRIBE = "subscribe"
+MODE_UNSUBSCRIBE = "unsubscribe"
+MODE_DENIED = "denied"
+
+# Signature algorithms a hub may use, strongest first
+SIGNATURE_ALGORITHMS = {"sha512": hashlib.sha512, "sha384": hashlib.sha384, "sha256": hashlib.sha256, "sha1": hashlib.sha1}
+
+
+def get_websub_secret() -> str | None:
+    """
+    Returns the master secret the per-subscription secrets are derived from: WEBSUB_SECRET,
+    or the SSM parameter named by SSM_WEBSUB_SECRET
+    """
+    secret = os.environ.get("WEBSUB_SECRET")
+    if secret:
+        return secret
+    parameter_name = os.environ.get("SSM_WEBSUB_SECRET")
+    if not parameter_name:
+        return None
+    try:
+        return boto3.client("ssm").get_parameter(Name=parameter_name, WithDecryption=True)["Parameter"]["Value"]
+    except Exception as e:  # noqa: BLE001
+        # Polling carries on without WebSub
+        logger.error(f"Error reading the WebSub secret from {parameter_name}: {e}. See 'WebSub secret' in docs/DEVELOPMENT.md")
+        return None
+
+
+class SubscriptionManager:
+    """
+    Manages the WebSub subscription of each feed. Its state (hub, topic, lease) is kept in the feed state.
+    Without a callback URL it can only answer the hubs, which is all the push handler does.
+    """
+
+    def __init__(
+        self,
+        secret: str,
+        callback_url: str | None = None,
+        http_session: requests.Session = session,
+        lease_seconds: int = LEASE_SECONDS,
+    ) -> None:
+        self.secret = secret.encode("utf-8")
+        self.callback_url = callback_url
+        self.session = http_session
+        self.lease_seconds = lease_seconds
+
+    # ----------------------------------------------------------------------------------------------
+    # Subscribing
+
+    def callback(self, news_source: str, country: str, language: str, feed_url: str) -> str:
+        """
+        Returns the callback of a feed. The hub keeps its query, so pushes identify the feed they are for,
+        and carry the token that shows the callback was handed out by this reader.
+        """
+        if not self.callback_url:
+            msg = "No WebSub callback URL configured"
+            raise ValueError(msg)
+        query = urlencode(
+            {
+                "source": news_source,
+                "country": country,
+                "language": language,
+                "feed": feed_url,
+                "token": self.callback_token(news_source, country, language, feed_url),
+            },
+        )
+        separator = "&" if "?" in self.callback_url else "?"
+        return f"{self.callback_url}{separator}{query}"
+
+    def callback_token(self, news_source: str, country: str, language: str, feed_url: str) -> str:
+        """
+        Derives the token of a callback from the master secret and the feed it is for
+        """
+        message = f"CALLBACK#{news_source}#{country}#{language}#{feed_url}".encode()
+        return hmac.new(self.secret, message, hashlib.sha256).hexdigest()
+
+    def verify_callback(self, params: dict[str, str]) -> bool:
+        """
+        Checks the token in the query of a callback request, so only the hubs given the callback can call it
+        """
+        feed = [params.get(key) for key in ("source", "country", "language", "feed")]
+        token = params.get("token")
+        if not token or not all(feed):
+            return False
+        return hmac.compare_digest(self.callback_token(*feed), token)
+
+    def topic_secret(self, topic: str) -> str:
+        """
+        Derives the secret of a subscription from the master secret, so no per-feed secret has to be stored
+        """
+        return hmac.new(self.secret, topic.encode("utf-8"), hashlib.sha256).hexdigest()
+
+    @staticmethod
+    def needs_subscription(state: FeedState, now: int) -> bool:
+        """
+        Returns whether the feed advertises a hub and has no lease, or one about to expire,
+        and no request of the last REQUEST_RETRY_SECONDS is still waiting for verification
+        """
+        if not state.hub or not state.topic:
+            return False
+        if state.lease_expires is not None and state.lease_expires - now > RENEW_BEFORE_SECONDS:
+            return False
+        return state.subscription_requested is None or now - state.subscription_requested >= REQUEST_RETRY_SECONDS
+
+    def subscribe(self, state: FeedState, callback: str, mode: str = MODE_SUBSCRIBE) -> bool:
+        """
+        Asks the hub to (re)subscribe the callback to the feed's topic. The subscription only becomes active
+        once the hub has verified the intent with the callback. Returns whether the hub accepted the request.
+        Some hubs verify before they answer, so the caller records and saves subscription_requested first.
+        """
+        data = {"hub.mode": mode, "hub.topic": state.topic, "hub.callback": callback}
+        if mode == MODE_SUBSCRIBE:
+            data.update({"hub.lease_seconds": str(self.lease_seconds), "hub.secret": self.topic_secret(state.topic)})
+
+        try:
+            response = self.session.post(state.hub, data=data, timeout=REQUEST_TIMEOUT_SECONDS)
+        except requests.exceptions.RequestException as e:
+            logger.error(f"Error sending the {mode} request for {state.topic} to {state.hub}: {e}")
+            return False
+
+        # 202 Accepted is the norm, some hubs verify synchronously and answer 204
+        if response.status_code not in {202, 204}:
+            logger.error(f"Hub {state.hub} rejected the {mode} request for {state.topic}: {response.status_code} {response.text[:200]}")
+            return False
+
+        logger.info(f"Requested {mode} of {state.topic} at {state.hub}")
+        return True
+
+    # ----------------------------------------------------------------------------------------------
+    # Callback
+
+    def verify_intent(self, params: dict[str, str], state: FeedState, now: int) -> str | None:
+        """
+        Handles a verification request of the hub, whose callback token the caller has checked.
+        Returns the challenge to echo when the request matches a request of this reader that is still pending,
+        otherwise None. Updates the lease in the feed state, never beyond the lease that was requested.
+        """
+        mode = params.get("hub.mode")
+        topic = params.get("hub.topic")
+        if not topic or topic != state.topic:
+            logger.warning(f"Rejecting {mode} verification for unexpected topic {topic}")
+            return None
+
+        if mode == MODE_DENIED:
+            logger.warning(f"Hub denied the subscription to {topic}: {params.get('hub.reason')}")
+            state.lease_expires = None
+            state.subscription_requested = None
+            return ""
+
+        challenge = params.get("hub.challenge")
+        if mode not in {MODE_SUBSCRIBE, MODE_UNSUBSCRIBE} or not challenge:
+            return None
+        # A hub only verifies what it was asked for, anything else could cut a lease short or extend it
+        if state.subscription_requested is None:
+            logger.warning(f"Rejecting {mode} of {topic} that was not requested")
+            return None
+        state.subscription_requested = None
+
+        if mode == MODE_SUBSCRIBE:
+            lease_seconds = params.get("hub.lease_seconds", "")
+            granted = int(lease_seconds) if lease_seconds.isdigit() else self.lease_seconds
+            state.lease_expires = now + min(granted, self.lease_seconds)
+            logger.info(f"Subscription to {topic} verified until {state.lease_expires}")
+        else:
+            state.lease_expires = None
+            logger.info(f"Unsubscription from {topic} verified")
+        return challenge
+
+    def verify_signature(self, topic: str, body: bytes, signature: str | None) -> bool:
+        """
+        Checks the X-Hub-Signature of pushed content against the secret of the subscription
+        """
+        if not signature or "=" not in signature:
+            return False
+        algorithm, digest = signature.split("=", 1)
+        hash_function = SIGNATURE_ALGORITHMS.get(algorithm.lower())
+        if hash_function is None:
+            return False
+        expected = hmac.new(self.topic_secret(topic).encode("utf-8"), body, hash_function).hexdigest()
+        return hmac.compare_digest(expected, digest.strip().lower())
+
+
+def get_subscription_manager() -> SubscriptionManager | None:
+    """
+    Returns the subscription manager when a WebSub secret is configured, otherwise None
+    """
+    secret = get_websub_secret()
+    if not secret:
+        return None
+    return SubscriptionManager(secret, CALLBACK_URL)
@@ -0,0 +1,103 @@
+"""
+# --*-- coding: utf-8 --*--
+# Work queue
+# Fans the due feeds of a source out to reader workers. The dispatcher sends small batches of feed tasks
+# to an SQS queue and each worker invocation reads one batch, so ingestion scales with the number of feeds.
+"""
+
+# ==================================================================================================
+# Python imports
+import json
+import os
+from dataclasses import asdict
+
+# ==================================================================================================
+# AWS imports
+import boto3
+
+# ==================================================================================================
+# Module imports
+from shared.logger import logger
+
+from .tasks import FeedTask
+
+# ==================================================================================================
+# Global declarations
+
+# Unset for local runs, where the dispatcher reads the feeds itself
+WORK_QUEUE_NAME = os.environ.get("READER_WORK_QUEUE_NAME")
+# Feeds per work item. Small enough for a worker to finish well within its timeout,
+# large enough that the categories of a source are still merged within a batch.
+WORKER_BATCH_SIZE = int(os.environ.get("READER_WORKER_BATCH_SIZE", "5"))
+# SQS accepts at most 10 messages per SendMessageBatch call
+SQS_MAX_BATCH_ENTRIES = 10
+
+
+def build_work_items(
+    news_source: str,
+    country: str,
+    language: str,
+    tasks: list[FeedTask],
+    batch_size: int = WORKER_BATCH_SIZE,
+) -> list[dict]:
+    """
+    Splits the feed tasks of a source into work items of at most batch_size feeds, in task order
+    """
+    batch_size = max(1, batch_size)
+    return [
+        {
+            "NewsSource": news_source,
+            "Country": country,
+            "Language": language,
+            "Batch": batch,
+            "Feeds": [asdict(task) for task in tasks[start : start + batch_size]],
+        }
+        for batch, start in enumerate(range(0, len(tasks), batch_size))
+    ]
+
+
+def parse_work_item(body: str) -> tuple[dict, list[FeedTask]]:
+    """
+    Returns the work item of a queue message and its feed tasks
+    """
+    work_item = json.loads(body)
+    return work_item, [FeedTask(**task) for task in work_item["Feeds"]]
+
+
+class WorkQueue:
+    """
+    Sends work items to the reader work queue
+    """
+
+    def __init__(self, queue_name: str) -> None:
+        self.queue = boto3.resource("sqs").get_queue_by_name(QueueName=queue_name)
+
+    def send(self, work_items: list[dict]) -> int:
+        """
+        Sends the work items in batches of up to 10 messages. Returns the number of work items that could not be sent.
+        Their feeds are still due, so they are dispatched again on the next tick.
+        """
+        failed = 0
+        for start in range(0, len(work_items), SQS_MAX_BATCH_ENTRIES):
+            chunk = work_items[start : start + SQS_MAX_BATCH_ENTRIES]
+            entries = [{"Id": str(i), "MessageBody": json.dumps(item, ensure_ascii=False)} for i, item in enumerate(chunk)]
+            try:
+                response = self.queue.send_messages(Entries=entries)
+            except Exception as e:  # noqa: BLE001
+                logger.error(f"Error sending {len(entries)} work items to the reader work queue: {e}")
+                failed += len(entries)
+                continue
+
+            for failure in response.get("Failed", []):
+                logger.error(f"Work item {failure['Id']} was not queued: {failure.get('Message')}")
+            failed += len(response.get("Failed", []))
+        return failed
+
+
+def get_work_queue() -> WorkQueue | None:
+    """
+    Returns the work queue when READER_WORK_QUEUE_NAME is set, otherwise None
+    """
+    if not WORK_QUEUE_NAME:
+        return None
+    return WorkQueue(WORK_QUEUE_NAME)
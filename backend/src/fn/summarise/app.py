@@ -19,7 +19,7 @@ from lib import scrapers
 # Module imports
 from lib.ai import GEMINI
 from shared.content import santise_content
-from shared.logger import logger
+from shared.logger import log_payload, logger
 from shared.news_model import ProcessedNewsItemModel
 from shared.utils import article_exists
 
@@ -43,10 +43,6 @@ summarised_queue = boto3.resource("sqs").Queue(SUMMARISED_QUEUE_NAME)
 
 
 # Custom Exceptions for better error signaling
-class ScraperNotFoundError(Exception):
-    """Base exception for scraper not found errors."""
-
-
 class ScraperError(Exception):
     """Base exception for scraper errors."""
 
@@ -55,12 +51,9 @@ def get_summary(item: ProcessedNewsItemModel) -> str:
     """
     This function gets the summary for a news item
     """
-    try:
-        # Get the appropriate parser class based on feed_source
-        scraper_class = getattr(scrapers, item.source_id)
-    except AttributeError as e:
-        logger.error(f"Parser class '{item.source_id}' not found in parsers module.", exc_info=e)
-        raise ScraperNotFoundError(f"Parser '{item.source_id}' not found.") from e
+    # Get the appropriate scraper class based on the source. Sources onboarded through a
+    # parser mapping have no dedicated scraper and use the generic one.
+    scraper_class = getattr(scrapers, item.source_id, scrapers.GenericScraper)
 
     try:
         scraper = scraper_class()
@@ -93,10 +86,12 @@ def main(event: SQSEvent, context: LambdaContext) -> dict:  # noqa: ARG001
 
         if stored_item is None:
             summary = get_summary(processed_item)
-            logger.info(f"Summary for {processed_item.news_url}: {summary}")
+            logger.info(f"Generated summary for {processed_item.news_url}")
+            log_payload("Summary", summary)
             processed_item.summary = summary
         else:
-            logger.info(f"Item already exists in the database: {stored_item}")
+            logger.info(f"Item {processed_item.item_hash} already exists in the database")
+            log_payload("Stored item", stored_item)
             logger.info("Skipping summarisation, sending for possible category update")
             processed_item.summary = stored_item.summary
 
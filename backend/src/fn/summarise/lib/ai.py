@@ -14,7 +14,7 @@ from google.genai.types import Content, GenerateContentConfig, Part
 
 # ==================================================================================================
 # Module imports
-from shared.logger import logger
+from shared.logger import log_payload, logger
 
 # ==================================================================================================
 # Global declarations
@@ -60,7 +60,7 @@ class GEMINI:
 
     def generate_summary(self, article: str) -> str:
         prompt = "Summarize the following article in 99 words. Only provide the summary, no other text. \n" + article
-        logger.info(f"Prompt: {prompt}")
+        log_payload("Prompt", prompt, prompt_chars=len(prompt))
 
         contents = [
             Content(
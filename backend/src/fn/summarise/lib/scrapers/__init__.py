@@ -2,5 +2,6 @@
 Controllers package
 """
 
+from .generic import GenericScraper  # noqa: F401
 from .ndtv import NDTV  # noqa: F401
 from .toi import TOI  # noqa: F401
@@ -0,0 +1,27 @@
+"""
+# --*-- coding: utf-8 --*--
+This Module is used to scrape the content from sources without a dedicated scraper
+"""
+
+# ==================================================================================================
+# Python imports
+from newspaper import Article
+
+# ==================================================================================================
+# Module imports
+from shared.content import santise_content
+
+# ==================================================================================================
+
+
+class GenericScraper:
+    """
+    This class is used to scrape the content from any news site newspaper can extract
+    """
+
+    def get_article(self, url: str) -> str:
+        article = Article(url)
+        article.download()
+        article.parse()
+
+        return santise_content(article.text)
@@ -17,7 +17,7 @@ from botocore.exceptions import ClientError
 
 # ==================================================================================================
 # Module imports
-from shared.logger import logger
+from shared.logger import log_payload, logger
 from shared.utils import article_exists
 
 # ==================================================================================================
@@ -40,10 +40,10 @@ def main(event: SQSEvent, context: LambdaContext) -> dict:  # noqa: ARG001
     """
     logger.info("Updating news feed")
     message = json.loads(event["Records"][0]["body"])
-    logger.info(message)
+    log_payload("Message", message)
 
     article = article_exists(table_name=NEWS_TABLE_NAME, pk=message["pk"], item_hash=message["item_hash"])
-    logger.info(f"Article: {article}")
+    log_payload("Stored article", article)
 
     try:
         if article is None:
@@ -0,0 +1,82 @@
+"""
+# --*-- coding: utf-8 --*--
+# Canonical URLs
+# Normalises article URLs so tracking parameters, http/https and trailing-slash variants of
+# the same article share one URL, and therefore one seen key and one entry in the merge of a run.
+"""
+
+# ==================================================================================================
+# Python imports
+from functools import lru_cache
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+# ==================================================================================================
+# Global declarations
+
+# Query parameters that only identify the campaign, referrer or click, never the article.
+# Used for sources without an allowlist of their own.
+TRACKING_PARAMS = frozenset(
+    {
+        "fbclid",
+        "gclid",
+        "dclid",
+        "msclkid",
+        "yclid",
+        "igshid",
+        "mc_cid",
+        "mc_eid",
+        "_ga",
+        "ref",
+        "ref_src",
+        "from",
+        "cmpid",
+        "ocid",
+        "ito",
+        "spm",
+        "frmapp",
+    },
+)
+TRACKING_PREFIXES = ("utm_", "pk_", "mtm_")
+
+DEFAULT_PORTS = {"http": 80, "https": 443}
+CACHE_SIZE = 4096
+
+
+def _keep_param(name: str, allowed_params: frozenset[str] | None) -> bool:
+    if allowed_params is not None:
+        return name in allowed_params
+    lowered = name.lower()
+    return lowered not in TRACKING_PARAMS and not lowered.startswith(TRACKING_PREFIXES)
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def canonical_url(url: str, allowed_params: frozenset[str] | None = None) -> str:
+    """
+    Returns the canonical form of an article URL:
+     - https, lower-cased host, no default port, no fragment
+     - no trailing slash on the path (except the root)
+     - query parameters filtered and sorted. With allowed_params (a per-source allowlist) only those are kept,
+       otherwise known tracking parameters are dropped.
+    Canonicalising a canonical URL returns it unchanged. A URL that cannot be split is returned as it is.
+    """
+    try:
+        parts = urlsplit(url.strip())
+        port = parts.port
+    except ValueError:
+        # A malformed port or IPv6 host. The URL is kept as it is, so the item it links still gets a key.
+        return url.strip()
+
+    scheme = parts.scheme.lower()
+    if scheme not in DEFAULT_PORTS:
+        # Not a web URL, so there is nothing to normalise
+        return urlunsplit(parts._replace(fragment=""))
+
+    host = (parts.hostname or "").lower()
+    if port and port != DEFAULT_PORTS[scheme]:
+        host = f"{host}:{port}"
+
+    path = parts.path.rstrip("/") or "/"
+
+    params = sorted((name, value) for name, value in parse_qsl(parts.query, keep_blank_values=True) if _keep_param(name, allowed_params))
+
+    return urlunsplit(("https", host, path, urlencode(params), ""))
@@ -1,9 +1,21 @@
+import html
 import re
+from collections.abc import Iterable
+
+# HTML/XML tags, compiled once
+TAG_PATTERN = re.compile(r"<[^<>]*>")
+
+# Joins the contents of a batch, so each pass scans the whole batch at once. Feeds cannot contain it, and it is
+# neither whitespace to str.split nor part of a tag or an entity, so no pass carries over from one content to the next.
+BATCH_SEPARATOR = "\x00"
+BATCH_TAG_PATTERN = re.compile(r"<[^<>\x00]*>")
+
+QUOTES = ("'", '"')
 
 
 def santise_content(content: str) -> str:
     """
-    Sanitizes content by removing HTML tags, normalizing whitespace,
+    Sanitizes content by removing HTML tags, decoding HTML entities, normalizing whitespace,
     removing wrapping quotes, and cleaning up formatting.
 
     Args:
@@ -15,23 +27,51 @@ def santise_content(content: str) -> str:
     if not content or not isinstance(content, str):
         return ""
 
-    # Remove HTML/XML tags (more comprehensive pattern)
-    content = re.sub(r"<[^<>]*>", r"", content)
+    # Remove HTML/XML tags. Plain text (e.g. scraped articles) skips the scan.
+    if "<" in content:
+        content = TAG_PATTERN.sub("", content)
 
-    # Remove HTML entities
-    content = re.sub(r"&[a-zA-Z0-9#]+;", r" ", content)
+    # Decode HTML entities (&amp; -> &, &#8217; -> a right single quote). Tags are already gone, so a decoded '<' stays as text.
+    if "&" in content:
+        content = html.unescape(content)
 
-    # Normalize all whitespace characters (spaces, tabs, newlines, etc.)
-    content = re.sub(r"\s+", r" ", content)
+    # Normalize all whitespace characters (spaces, tabs, newlines, non-breaking spaces, etc.)
+    # and remove leading/trailing whitespace
+    content = " ".join(content.split())
 
     # Remove matching quotes only if they wrap the entire content
-    content = re.sub(r"^(['\"])(.*?)\1$", r"\2", content)
+    return _unwrap_quotes(content)
 
-    # Remove leading/trailing whitespace
-    content = content.strip()
 
-    # Handle edge case where content becomes empty after quote removal
-    if not content:
-        return ""
+def santise_contents(contents: Iterable[str | None]) -> list[str]:
+    """
+    Sanitizes a batch of contents, such as every summary of a feed, with the same result as santise_content
+    on each. The tag, entity and whitespace passes run once over the joined batch instead of once per content.
+
+    Args:
+        contents: The contents to sanitize. Missing contents come back as empty strings.
 
+    Returns:
+        The sanitized contents, in order
+    """
+    contents = [content if content and isinstance(content, str) else "" for content in contents]
+    if not contents or any(BATCH_SEPARATOR in content for content in contents):
+        return [santise_content(content) for content in contents]
+
+    joined = BATCH_SEPARATOR.join(contents)
+    if "<" in joined:
+        joined = BATCH_TAG_PATTERN.sub("", joined)
+    if "&" in joined:
+        joined = html.unescape(joined)
+    joined = " ".join(joined.split())
+
+    return [_unwrap_quotes(content.strip()) for content in joined.split(BATCH_SEPARATOR)]
+
+
+def _unwrap_quotes(content: str) -> str:
+    """
+    Removes matching quotes only if they wrap the entire content
+    """
+    if len(content) > 1 and content[0] in QUOTES and content[-1] == content[0]:
+        return content[1:-1].strip()
     return content
@@ -0,0 +1,108 @@
+"""
+# --*-- coding: utf-8 --*--
+# Feed codec
+# Encodes feeds as compact, optionally compressed JSON for S3 and decodes them back.
+# The compression is recorded as the object's Content-Encoding, so objects without one are read as plain JSON.
+# A feed object is either a list of items, or a consolidated run: {"manifest": {...}, "items": [...]}.
+"""
+
+# ==================================================================================================
+# Python imports
+import gzip
+import json
+import os
+
+try:
+    import zstandard
+except ImportError:  # zstd is optional, gzip is always available
+    zstandard = None
+
+from pydantic import TypeAdapter
+
+# ==================================================================================================
+# Module imports
+from shared.logger import logger
+from shared.news_model import SourceNewsItemModel
+
+# ==================================================================================================
+# Global declarations
+
+ENCODING_IDENTITY = "identity"
+ENCODING_GZIP = "gzip"
+ENCODING_ZSTD = "zstd"
+
+FEED_ENCODING = os.environ.get("FEED_ENCODING", ENCODING_GZIP)
+GZIP_LEVEL = 6
+ZSTD_LEVEL = 10
+
+# Keys of a consolidated run object
+MANIFEST_KEY = "manifest"
+ITEMS_KEY = "items"
+
+# Serialises validated items straight to compact JSON bytes, without an intermediate list of dicts
+feed_items_adapter = TypeAdapter(list[SourceNewsItemModel])
+
+
+def encode_feed_items(items: list[SourceNewsItemModel], encoding: str = FEED_ENCODING) -> tuple[bytes, str | None]:
+    """
+    Serialises validated items as compact JSON, straight from the models, and compresses them.
+    Returns the body and the Content-Encoding to store with it (None for plain JSON).
+    """
+    return compress_feed(feed_items_adapter.dump_json(items), encoding)
+
+
+def encode_feed_run(manifest: dict, items: list[SourceNewsItemModel], encoding: str = FEED_ENCODING) -> tuple[bytes, str | None]:
+    """
+    Serialises a consolidated run, the manifest and the items of every feed of a source, as a single object
+    """
+    manifest_json = json.dumps(manifest, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    body = b'{"%b":%b,"%b":%b}' % (MANIFEST_KEY.encode(), manifest_json, ITEMS_KEY.encode(), feed_items_adapter.dump_json(items))
+    return compress_feed(body, encoding)
+
+
+def compress_feed(body: bytes, encoding: str = FEED_ENCODING) -> tuple[bytes, str | None]:
+    """
+    Compresses an already serialised JSON feed.
+    Returns the body and the Content-Encoding to store with it (None for plain JSON).
+    """
+    if encoding == ENCODING_ZSTD and zstandard is None:
+        logger.warning("zstandard is not installed. Falling back to gzip")
+        encoding = ENCODING_GZIP
+
+    if encoding == ENCODING_ZSTD:
+        return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(body), ENCODING_ZSTD
+    if encoding == ENCODING_GZIP:
+        return gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0), ENCODING_GZIP
+    return body, None
+
+
+def decode_feed(body: bytes, content_encoding: str | None) -> list[dict] | dict:
+    """
+    Decompresses and parses a feed body according to its Content-Encoding
+    """
+    content_encoding = (content_encoding or ENCODING_IDENTITY).lower()
+
+    if content_encoding == ENCODING_GZIP:
+        body = gzip.decompress(body)
+    elif content_encoding == ENCODING_ZSTD:
+        if zstandard is None:
+            msg = "Feed is zstd encoded but zstandard is not installed"
+            raise ValueError(msg)
+        body = zstandard.ZstdDecompressor().decompressobj().decompress(body)
+    elif content_encoding != ENCODING_IDENTITY:
+        msg = f"Unsupported feed content encoding: {content_encoding}"
+        raise ValueError(msg)
+
+    return json.loads(body)
+
+
+def split_feed(data: list[dict] | dict) -> tuple[dict | None, list[dict]]:
+    """
+    Returns the manifest and the items of a decoded feed. Per-feed objects are plain lists and have no manifest.
+    """
+    if isinstance(data, dict) and MANIFEST_KEY in data:
+        return data[MANIFEST_KEY], data.get(ITEMS_KEY, [])
+    if isinstance(data, list):
+        return None, data
+    msg = f"Unsupported feed object: expected a list of items or a manifest, got {type(data).__name__}"
+    raise ValueError(msg)
@@ -2,6 +2,11 @@
 
 ## ==================================================================================================
 ## Python imports
+import logging
+import os
+import sys
+import threading
+import time
 
 ## ==================================================================================================
 ## Powertools imports
@@ -11,3 +16,110 @@ from aws_lambda_powertools import Logger
 ## Logger and tracer initialisation
 
 logger = Logger()
+
+## ==================================================================================================
+## Hot-path logging helpers
+## Payload dumps are only formatted when their level is enabled, are truncated, and go into a
+## structured field instead of the message. Repeated call sites can be rate limited.
+
+LOG_MAX_FIELD_CHARS = int(os.environ.get("LOG_MAX_FIELD_CHARS", "1000"))
+LOG_RATE_LIMIT_PER_MINUTE = int(os.environ.get("LOG_RATE_LIMIT_PER_MINUTE", "20"))
+
+_RATE_WINDOW_SECONDS = 60
+_rate_windows: dict[str, list] = {}  # call site -> [window start, emitted, suppressed]
+_rate_lock = threading.Lock()
+
+
+class Truncated:
+    """
+    Wraps a value so it is converted to a size-limited string only when a log record is formatted
+    """
+
+    __slots__ = ("max_chars", "value")
+
+    def __init__(self, value: object, max_chars: int = LOG_MAX_FIELD_CHARS) -> None:
+        self.value = value
+        self.max_chars = max_chars
+
+    def __str__(self) -> str:
+        return truncate(self.value, self.max_chars)
+
+    __repr__ = __str__
+
+
+def truncate(value: object, max_chars: int = LOG_MAX_FIELD_CHARS) -> str:
+    """
+    Converts a value to a string of at most max_chars characters, noting how much was cut
+    """
+    text = value if isinstance(value, str) else str(value)
+    if len(text) <= max_chars:
+        return text
+    return f"{text[:max_chars]}... (+{len(text) - max_chars} chars)"
+
+
+def log_payload(
+    message: str,
+    payload: object,
+    *,
+    level: int = logging.DEBUG,
+    max_chars: int = LOG_MAX_FIELD_CHARS,
+    max_per_minute: int | None = None,
+    **fields: object,
+) -> None:
+    """
+    Logs a payload dump (event, feed, item, API response) as a truncated 'payload' field.
+    Nothing is formatted when the level is disabled. With max_per_minute the call site is rate limited.
+    """
+    if not logger.isEnabledFor(level):
+        return
+    if max_per_minute is not None and not _allow(sys._getframe(1), max_per_minute, fields):  # noqa: SLF001
+        return
+    # Converted to a string when the record is formatted, so a record a handler drops never builds it
+    logger.log(level, message, extra={"payload": Truncated(payload, max_chars), **fields}, stacklevel=2)
+
+
+def log_sampled(
+    level: int,
+    message: str,
+    *args: object,
+    max_per_minute: int = LOG_RATE_LIMIT_PER_MINUTE,
+    exc_info: BaseException | bool | None = None,
+    **fields: object,
+) -> None:
+    """
+    Logs a message from a hot loop at most max_per_minute times per call site.
+    The message is %-formatted lazily, and the number of suppressed records is reported with the next one.
+    """
+    if not logger.isEnabledFor(level):
+        return
+    if not _allow(sys._getframe(1), max_per_minute, fields):  # noqa: SLF001
+        return
+    logger.log(level, message, *args, exc_info=exc_info, extra=fields or None, stacklevel=2)
+
+
+def _allow(caller: object, max_per_minute: int, fields: dict) -> bool:
+    """
+    Applies the rate limit of the caller's line, adding the suppressed count of the previous window to the fields
+    """
+    allowed, suppressed = _rate_limit(f"{caller.f_code.co_filename}:{caller.f_lineno}", max_per_minute)
+    if suppressed:
+        fields["suppressed"] = suppressed
+    return allowed
+
+
+def _rate_limit(call_site: str, max_per_minute: int) -> tuple[bool, int]:
+    """
+    Returns whether the call site may log now and how many records it suppressed in the previous window
+    """
+    now = time.monotonic()
+    with _rate_lock:
+        window = _rate_windows.get(call_site)
+        if window is None or now - window[0] >= _RATE_WINDOW_SECONDS:
+            suppressed = window[2] if window else 0
+            _rate_windows[call_site] = [now, 1, 0]
+            return True, suppressed
+        if window[1] < max_per_minute:
+            window[1] += 1
+            return True, 0
+        window[2] += 1
+        return False, 0
@@ -7,7 +7,12 @@
 # Python imports
 from typing import Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
+
+# ==================================================================================================
+# Module imports
+from shared.canonical_url import canonical_url
+from shared.time import time_to_iso_and_ms
 
 # ==================================================================================================
 # Data models
@@ -43,13 +48,30 @@ class SourceNewsItemModel(BaseModel):
     country: str
     language: str
     news_url: str
+    # The canonical form of news_url, computed once when the item is parsed, with the query allowlist of its source.
+    # Seen keys and the merge index derive from it. news_url keeps the link as published, and the item hash with it.
+    canonical_url: str | None = Field(default=None)
     headline: str
     published: str
+    # UNIX epoch milliseconds of 'published', computed once when the item is parsed.
+    # Keys, TTLs and time windows derive from it instead of parsing 'published' again.
+    published_ms: int | None = Field(default=None)
     summary: str
     # content: str # This will be added later. Not being used to save space in DynamoDB
     categories: list[str]
     media: NewsMediaModel
 
+    @model_validator(mode="after")
+    def fill_derived_fields(self) -> "SourceNewsItemModel":
+        """
+        Items serialised before published_ms and canonical_url were introduced only carry 'published' and 'news_url'
+        """
+        if self.published_ms is None:
+            self.published_ms = time_to_iso_and_ms(self.published)[1]
+        if self.canonical_url is None:
+            self.canonical_url = canonical_url(self.news_url)
+        return self
+
 
 class SourceNewsFeedModel(BaseModel):
     """
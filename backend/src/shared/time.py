@@ -5,8 +5,9 @@ This Module contains the utility functions for the parsers
 
 # ==================================================================================================
 # Python imports
+import re
 import time
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 
 from dateutil import parser
 
@@ -14,10 +15,102 @@ from dateutil import parser
 # Module imports
 from shared.logger import logger
 
+# ==================================================================================================
+# Global declarations
+
+# RFC 822 / RFC 2822, as used by RSS: "Mon, 07 Aug 2023 18:53:00 +0530", "Thu, 17 Apr 2025 10:43:44 GMT"
+RFC822_PATTERN = re.compile(
+    r"^\s*(?:[A-Za-z]{3},\s*)?(\d{1,2})\s+([A-Za-z]{3})\s+(\d{4})\s+(\d{1,2}):(\d{2})(?::(\d{2}))?"
+    r"\s*(?:([+-])(\d{2}):?(\d{2})|(GMT|UTC|UT|Z))?\s*$",
+    re.IGNORECASE,
+)
+# ISO 8601 as accepted by datetime.fromisoformat: "2025-04-17T20:08:34+05:30", "2025-04-17T14:38:34Z"
+ISO8601_PATTERN = re.compile(r"^\d{4}-\d{2}-\d{2}(?:[T ]\d{2}:\d{2}(?::\d{2}(?:\.\d+)?)?(?:Z|[+-]\d{2}:?\d{2})?)?$")
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+ONE_MILLISECOND = timedelta(milliseconds=1)
+
+MONTH_NAMES = ("jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec")
+MONTHS = {name: number for number, name in enumerate(MONTH_NAMES, 1)}
+
+FORMAT_RFC822 = "rfc822"
+FORMAT_ISO8601 = "iso8601"
+
+
+def _parse_rfc822(time_stamp: str) -> datetime | None:
+    match = RFC822_PATTERN.match(time_stamp)
+    if match is None:
+        return None
+    day, month_name, year, hour, minute, second, sign, offset_hours, offset_minutes, zone_name = match.groups()
+    month = MONTHS.get(month_name.lower())
+    if month is None:
+        return None
+
+    # Like dateutil, a timestamp without a zone gives a naive datetime
+    tz = None
+    if sign:
+        offset = timedelta(hours=int(offset_hours), minutes=int(offset_minutes))
+        tz = timezone(-offset if sign == "-" else offset) if offset else timezone.utc
+    elif zone_name:
+        tz = timezone.utc
+    return datetime(int(year), month, int(day), int(hour), int(minute), int(second or 0), tzinfo=tz)
 
-def time_to_unix(time_stamp: str | None) -> int:
+
+def _parse_iso8601(time_stamp: str) -> datetime | None:
+    time_stamp = time_stamp.strip()
+    if not ISO8601_PATTERN.match(time_stamp):
+        return None
+    return datetime.fromisoformat(time_stamp)
+
+
+def _parse_fallback(time_stamp: str) -> datetime:
+    return parser.parse(time_stamp)
+
+
+FAST_PARSERS = {FORMAT_RFC822: _parse_rfc822, FORMAT_ISO8601: _parse_iso8601}
+
+
+class TimestampParser:
+    """
+    Parses feed timestamps with precompiled RFC 822 and ISO 8601 fast paths, keeping dateutil as the last resort.
+    Items of a feed share one format, so an instance remembers the format that last matched and tries it first.
     """
-    This function converts a string timestamp to UNIX epoch time using dateutil.parser
+
+    def __init__(self) -> None:
+        # A single attribute, so instances shared between threads stay consistent
+        self.preferred = FORMAT_RFC822
+
+    def parse(self, time_stamp: str) -> datetime:
+        """
+        Returns the timestamp as a datetime, which is naive when the timestamp has no zone.
+        Raises ValueError when no format matches.
+        """
+        preferred = self.preferred
+        for name in (preferred, *(name for name in FAST_PARSERS if name != preferred)):
+            try:
+                parsed = FAST_PARSERS[name](time_stamp)
+            except (ValueError, OverflowError):
+                parsed = None
+            if parsed is not None:
+                # Memoise the detected format for the next items of the feed
+                self.preferred = name
+                return parsed
+
+        # Fast paths failing is cheap, so the fallback is never memoised
+        try:
+            return _parse_fallback(time_stamp)
+        except OverflowError as e:
+            msg = f"Timestamp out of range: {time_stamp!r}"
+            raise ValueError(msg) from e
+
+
+# Shared by callers that have no feed of their own
+default_timestamp_parser = TimestampParser()
+
+
+def time_to_unix(time_stamp: str | None, timestamp_parser: TimestampParser | None = None) -> int:
+    """
+    This function converts a string timestamp to UNIX epoch time
     Handles various formats like:
      - "Mon, 07 Aug 2023 18:53:00 +0530"
      - "2025-04-17T20:08:34+05:30"
@@ -29,18 +122,16 @@ def time_to_unix(time_stamp: str | None) -> int:
         return int(time.time())
 
     try:
-        # Use dateutil.parser.parse for robust parsing
-        # It automatically handles timezone information (including GMT)
-        dt_object = parser.parse(time_stamp)
+        dt_object = (timestamp_parser or default_timestamp_parser).parse(time_stamp)
         epoch = int(dt_object.timestamp())
         return epoch
-    except (ValueError, parser.ParserError) as e:
-        logger.error(f"Failed to parse timestamp '{time_stamp}' using dateutil: {e}")
+    except ValueError as e:
+        logger.error(f"Failed to parse timestamp '{time_stamp}': {e}")
         # Return current time as a fallback if parsing fails
         return int(time.time())
 
 
-def time_to_iso(time_stamp: str | None) -> str:
+def time_to_iso(time_stamp: str | None, timestamp_parser: TimestampParser | None = None) -> str:
     """
     This function converts a string timestamp to ISO 8601 format in UTC
     """
@@ -49,14 +140,33 @@ def time_to_iso(time_stamp: str | None) -> str:
         return datetime.now(timezone.utc).isoformat()
 
     try:
-        # Use dateutil.parser.parse for robust parsing
-        dt_object = parser.parse(time_stamp)
+        dt_object = (timestamp_parser or default_timestamp_parser).parse(time_stamp)
 
         # Ensure the datetime object is in UTC
         dt_object = dt_object.replace(tzinfo=timezone.utc) if dt_object.tzinfo is None else dt_object.astimezone(timezone.utc)
 
         return dt_object.isoformat()
-    except (ValueError, parser.ParserError) as e:
+    except ValueError as e:
         logger.error(f"Failed to parse timestamp '{time_stamp}' for ISO conversion: {e}")
         # Return current UTC time in ISO format as a fallback
         return datetime.now(timezone.utc).isoformat()
+
+
+def time_to_iso_and_ms(time_stamp: str | None, timestamp_parser: TimestampParser | None = None) -> tuple[str, int]:
+    """
+    This function converts a string timestamp to ISO 8601 format in UTC and to UNIX epoch milliseconds,
+    parsing it only once. Like time_to_iso, naive timestamps are taken as UTC and unparseable ones as now.
+    """
+    dt_object = None
+    if time_stamp is not None:
+        try:
+            dt_object = (timestamp_parser or default_timestamp_parser).parse(time_stamp)
+        except ValueError as e:
+            logger.error(f"Failed to parse timestamp '{time_stamp}': {e}")
+
+    if dt_object is None:
+        dt_object = datetime.now(timezone.utc)
+
+    dt_object = dt_object.replace(tzinfo=timezone.utc) if dt_object.tzinfo is None else dt_object.astimezone(timezone.utc)
+
+    return dt_object.isoformat(), (dt_object - EPOCH) // ONE_MILLISECOND
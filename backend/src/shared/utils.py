@@ -13,7 +13,7 @@ import boto3
 
 # ==================================================================================================
 # Module imports
-from shared.logger import logger
+from shared.logger import log_payload
 from shared.news_model import ProcessedNewsItemModel
 
 # ==================================================================================================
@@ -32,7 +32,7 @@ def article_exists(table_name: str, pk: str, item_hash: str) -> ProcessedNewsIte
         ExpressionAttributeValues={":pk": pk, ":item_hash": item_hash},
     )
 
-    logger.info(f"Response: {response}")
+    log_payload("Article lookup response", response, count=response.get("Count"))
 
     if response["Items"]:
         return ProcessedNewsItemModel.model_validate(response["Items"][0])
@@ -16,8 +16,13 @@ def uuid7(unix_timestamp: int) -> str:
     Generate a UUIDv7 string from a Unix timestamp
     """
     ## Convert the timestamp to milliseconds
-    timestamp_ms = unix_timestamp * 1000
+    return uuid7_ms(unix_timestamp * 1000)
 
+
+def uuid7_ms(timestamp_ms: int) -> str:
+    """
+    Generate a UUIDv7 string from a Unix timestamp in milliseconds
+    """
     # Get 48-bit timestamp (6 bytes)
     timestamp_bytes = timestamp_ms.to_bytes(6, 'big')
 
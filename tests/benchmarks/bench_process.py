@@ -0,0 +1,112 @@
+"""
+# --*-- coding: utf-8 --*--
+# Benchmark: per-item cost of turning the items read from S3 into queue messages in Process.
+# Compares the previous chain (validate on read, re-validate in inject_data, construct, dump, re-validate
+# in validate_feed_items, dump, validate again before json.dumps) with validate_feed_items + inject_data
+# + serialise_feed_items, which validate each item once and serialise it once.
+#
+#   python tests/benchmarks/bench_process.py
+"""
+
+# ==================================================================================================
+# Python imports
+import json  # noqa: I001
+import timeit
+
+# Puts the backend sources on the path, so it is imported first
+from feeds import synthetic_feed
+from lxml import etree as ET  # noqa: N812
+
+# ==================================================================================================
+# Module imports
+from backend.src.fn.process.lib.preprocess import TTL_SECONDS, inject_data, serialise_feed_items, validate_feed_items
+from backend.src.fn.reader.lib.parsers import NDTV
+from shared.news_model import MetricsModel, ProcessedNewsFeedModel, ProcessedNewsItemModel, SourceNewsFeedModel, SourceNewsItemModel
+from shared.score import calculate_score, set_random_counts
+from shared.url_hasher import hasher
+from shared.uuid import uuid7_ms
+
+# ==================================================================================================
+# Global declarations
+
+ITEM_COUNTS = (100, 1000)
+REPEAT = 5
+# Random per run, so they are left out when the outputs of both paths are compared
+RANDOM_FIELDS = ("sk", "sk_top", "metrics")
+
+
+def previous_path(feed_data: list[dict]) -> list[str]:
+    feed = SourceNewsFeedModel(feed=[SourceNewsItemModel.model_validate(item) for item in feed_data])
+
+    processed_items = []
+    for item in feed.feed:
+        SourceNewsItemModel.model_validate(item)
+        pk = f"NEWS#{item.country}#{item.language}"
+        sk = uuid7_ms(item.published_ms)
+        random_counts = set_random_counts()
+        metrics = MetricsModel(
+            views=random_counts["view"],
+            likes=random_counts["like"],
+            shares=random_counts["share"],
+            bookmarks=random_counts["bookmark"],
+        )
+        processed_items.append(
+            ProcessedNewsItemModel(
+                pk=pk,
+                sk=sk,
+                item_hash=hasher(f"{pk}#{item.news_url}"),
+                **item.model_dump(),
+                sk_top=calculate_score(random_counts, sk),
+                ttl=item.published_ms // 1000 + TTL_SECONDS,
+                metrics=metrics,
+            ),
+        )
+
+    feed_with_metadata = ProcessedNewsFeedModel(feed=processed_items).model_dump()["feed"]
+    validated_feed = [ProcessedNewsItemModel.model_validate(item).model_dump() for item in feed_with_metadata]
+    messages = []
+    for item in validated_feed:
+        ProcessedNewsItemModel.model_validate(item)
+        messages.append(json.dumps(item))
+    return messages
+
+
+def single_pass(feed_data: list[dict]) -> list[str]:
+    feed, _ = validate_feed_items(feed_data)
+    return serialise_feed_items(inject_data(feed))
+
+
+def comparable(messages: list[str]) -> list[dict]:
+    return [{key: value for key, value in json.loads(message).items() if key not in RANDOM_FIELDS} for message in messages]
+
+
+def main() -> None:
+    parser = NDTV()
+    results = []
+    for item_count in ITEM_COUNTS:
+        root = ET.fromstring(synthetic_feed(item_count))
+        parsed_items = parser._extract_items(root.iterfind("channel/item"), "INDIA", "EN", "IN")  # noqa: SLF001
+        # The items as Process reads them from S3
+        feed_data = json.loads(json.dumps(parsed_items))
+        assert comparable(previous_path(feed_data)) == comparable(single_pass(feed_data))
+
+        loops = max(1, 2000 // item_count)
+        timings = {}
+        for name, func in (("previous", previous_path), ("single_pass", single_pass)):
+            best = min(timeit.repeat(lambda func=func, items=feed_data: func(items), number=loops, repeat=REPEAT))
+            timings[name] = best / loops / item_count * 1e6
+
+        results.append(
+            {
+                "items": item_count,
+                "previous_us_per_item": round(timings["previous"], 2),
+                "single_pass_us_per_item": round(timings["single_pass"], 2),
+                "speedup": round(timings["previous"] / timings["single_pass"], 2),
+            },
+        )
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
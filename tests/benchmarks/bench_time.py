@@ -0,0 +1,74 @@
+"""
+# --*-- coding: utf-8 --*--
+# Benchmark: timestamp parsing on the recorded feed corpus.
+# Compares the previous dateutil-only time_to_iso / time_to_unix with the fast-path parser,
+# and checks that both give the same results.
+#
+#   python tests/benchmarks/bench_time.py
+"""
+
+# ==================================================================================================
+# Python imports
+import json  # noqa: I001
+import timeit
+from datetime import timezone
+
+# Puts the backend sources on the path, so it is imported first
+from feeds import recorded_feeds
+from dateutil import parser
+from lxml import etree as ET  # noqa: N812
+
+# ==================================================================================================
+# Module imports
+from shared.time import TimestampParser, time_to_iso, time_to_unix
+
+# ==================================================================================================
+# Global declarations
+
+REPEAT = 5
+
+
+def previous_time_to_iso(time_stamp: str) -> str:
+    dt_object = parser.parse(time_stamp)
+    dt_object = dt_object.replace(tzinfo=timezone.utc) if dt_object.tzinfo is None else dt_object.astimezone(timezone.utc)
+    return dt_object.isoformat()
+
+
+def previous_time_to_unix(time_stamp: str) -> int:
+    return int(parser.parse(time_stamp).timestamp())
+
+
+def _per_item_us(func: object, values: list[str]) -> float:
+    timer = timeit.Timer(lambda: [func(value) for value in values])
+    number = timer.autorange()[0]
+    return min(timer.repeat(number=number, repeat=REPEAT)) / number / len(values) * 1e6
+
+
+def main() -> None:
+    results = []
+    for name, body in recorded_feeds().items():
+        timestamps = [str(text) for text in ET.fromstring(body).xpath("channel/item/pubDate/text()")]
+
+        # One parser per feed, as the reader does
+        feed_parser = TimestampParser()
+        assert [previous_time_to_iso(value) for value in timestamps] == [time_to_iso(value, feed_parser) for value in timestamps]
+        assert [previous_time_to_unix(value) for value in timestamps] == [time_to_unix(value, feed_parser) for value in timestamps]
+
+        previous = _per_item_us(previous_time_to_iso, timestamps)
+        fast = _per_item_us(lambda value, feed_parser=feed_parser: time_to_iso(value, feed_parser), timestamps)
+        results.append(
+            {
+                "feed": name,
+                "format": feed_parser.preferred,
+                "items": len(timestamps),
+                "previous_us_per_item": round(previous, 2),
+                "fast_path_us_per_item": round(fast, 2),
+                "speedup": round(previous / fast, 1),
+            },
+        )
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
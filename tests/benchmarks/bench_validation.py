@@ -0,0 +1,70 @@
+"""
+# --*-- coding: utf-8 --*--
+# Benchmark: per-item cost of validating and serialising parsed feed items.
+# Compares the previous path (validate items, re-validate the feed, dump to dicts, json.dumps)
+# with the single-pass path (validate each item once, dump the models straight to JSON bytes).
+#
+#   python tests/benchmarks/bench_validation.py
+"""
+
+# ==================================================================================================
+# Python imports
+import json  # noqa: I001
+import timeit
+
+# Puts the backend sources on the path, so it is imported first
+from feeds import synthetic_feed
+from lxml import etree as ET  # noqa: N812
+
+# ==================================================================================================
+# Module imports
+from backend.src.fn.reader.lib.parsers import NDTV
+from shared.feed_codec import ENCODING_IDENTITY, encode_feed_items
+from shared.news_model import SourceNewsFeedModel, SourceNewsItemModel
+
+# ==================================================================================================
+# Global declarations
+
+ITEM_COUNTS = (100, 1000)
+REPEAT = 5
+
+
+def previous_path(parsed_items: list[dict]) -> bytes:
+    feed = SourceNewsFeedModel(feed=[SourceNewsItemModel.model_validate(item) for item in parsed_items])
+    SourceNewsFeedModel.model_validate(feed)
+    return json.dumps(feed.model_dump()["feed"], ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def single_pass(parsed_items: list[dict]) -> bytes:
+    feed = SourceNewsFeedModel.model_construct(feed=[SourceNewsItemModel.model_validate(item) for item in parsed_items])
+    return encode_feed_items(feed.feed, ENCODING_IDENTITY)[0]
+
+
+def main() -> None:
+    parser = NDTV()
+    results = []
+    for item_count in ITEM_COUNTS:
+        root = ET.fromstring(synthetic_feed(item_count))
+        parsed_items = parser._extract_items(root.iterfind("channel/item"), "INDIA", "EN", "IN")  # noqa: SLF001
+        assert json.loads(previous_path(parsed_items)) == json.loads(single_pass(parsed_items))
+
+        loops = max(1, 2000 // item_count)
+        timings = {}
+        for name, func in (("previous", previous_path), ("single_pass", single_pass)):
+            best = min(timeit.repeat(lambda func=func, items=parsed_items: func(items), number=loops, repeat=REPEAT))
+            timings[name] = best / loops / item_count * 1e6
+
+        results.append(
+            {
+                "items": item_count,
+                "previous_us_per_item": round(timings["previous"], 2),
+                "single_pass_us_per_item": round(timings["single_pass"], 2),
+                "speedup": round(timings["previous"] / timings["single_pass"], 2),
+            },
+        )
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
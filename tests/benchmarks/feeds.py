@@ -0,0 +1,73 @@
+"""
+# --*-- coding: utf-8 --*--
+# Feeds for the offline benchmarks: recorded payloads of every source in NewsSources.json
+# (fixtures/{Name.Short}.xml, refreshed with record_fixtures.py) and synthetic feeds of any size
+"""
+
+# ==================================================================================================
+# Python imports
+import json
+import sys
+from pathlib import Path
+
+# The benchmarks run as plain scripts, so the backend sources are put on the path like pytest does
+ROOT = Path(__file__).resolve().parents[2]
+for path in (ROOT, ROOT / "backend" / "src"):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+# ==================================================================================================
+# Global declarations
+
+NEWS_SOURCES_FILE = ROOT / "NewsSources.json"
+FIXTURES_DIR = Path(__file__).resolve().parent / "fixtures"
+
+RSS_TEMPLATE = """<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0" xmlns:media="http://search.yahoo.com/mrss/">
+<channel>
+<title>Synthetic feed</title>
+<link>https://www.example.com/</link>
+{items}
+</channel>
+</rss>"""
+
+ITEM_TEMPLATE = """<item>
+<title>Headline {i}: Parliament passes bill &amp; markets react</title>
+<link>https://www.example.com/india-news/story-{i}#comments</link>
+<description><![CDATA[<p>Summary of story {i}. <a href="https://www.example.com/{i}">Read more</a> &nbsp;
+about the <b>developments</b> &amp; what they mean.</p>]]></description>
+<pubDate>Mon, 07 Aug 2023 {hour:02d}:{minute:02d}:00 +0530</pubDate>
+<media:content url="https://images.example.com/{i}.jpg" />
+<enclosure url="https://images.example.com/{i}.jpg" type="image/jpeg" />
+</item>"""
+
+
+def synthetic_feed(item_count: int) -> bytes:
+    """
+    Returns an RSS 2.0 feed with item_count items, shaped like the NDTV and TOI feeds
+    """
+    items = "\n".join(ITEM_TEMPLATE.format(i=i, hour=(i // 60) % 24, minute=i % 60) for i in range(item_count))
+    return RSS_TEMPLATE.format(items=items).encode("utf-8")
+
+
+def news_sources() -> list[dict]:
+    """
+    Returns the sources listed in NewsSources.json
+    """
+    return json.loads(NEWS_SOURCES_FILE.read_text(encoding="utf-8"))["Sources"]
+
+
+def recorded_feeds() -> dict[str, bytes]:
+    """
+    Returns the recorded payload of every source, keyed by its short name.
+    A source without a fixture is an error, so new sources cannot silently skip the benchmarks.
+    """
+    feeds = {}
+    for source in news_sources():
+        name = source["Name"]["Short"]
+        fixture = FIXTURES_DIR / f"{name}.xml"
+        if not fixture.exists():
+            msg = f"No recorded feed for {name}. Run tests/benchmarks/record_fixtures.py to record one"
+            raise FileNotFoundError(msg)
+        feeds[name] = fixture.read_bytes()
+    return feeds
@@ -0,0 +1,43 @@
+"""
+# --*-- coding: utf-8 --*--
+# Records the first feed of every source in NewsSources.json into fixtures/{Name.Short}.xml.
+# Needs network access; the benchmarks themselves only read the recorded files.
+#
+#   python tests/benchmarks/record_fixtures.py [SOURCE ...]
+"""
+
+# ==================================================================================================
+# Python imports
+import sys
+
+import requests
+
+# Puts the backend sources on the path, so it is imported first
+from feeds import FIXTURES_DIR, news_sources
+
+# ==================================================================================================
+# Global declarations
+
+HEADERS = {"User-Agent": "SnapNewsReader/1.0"}
+
+
+def first_feed_url(source: dict) -> str:
+    feed = next(iter(source["FEEDS"].values()))
+    return feed[0] if isinstance(feed, list) else feed
+
+
+def main(names: list[str]) -> None:
+    for source in news_sources():
+        name = source["Name"]["Short"]
+        if names and name not in names:
+            continue
+
+        url = first_feed_url(source)
+        response = requests.get(url, headers=HEADERS, timeout=30)
+        response.raise_for_status()
+        (FIXTURES_DIR / f"{name}.xml").write_bytes(response.content)
+        print(f"Recorded {name}: {url} ({len(response.content)} bytes)")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,230 @@
+"""
+# --*-- coding: utf-8 --*--
+# Offline benchmark suite for the reader hot path.
+# Times feed parsing through get_feed_from_rss (with the HTTP session replaying recorded payloads),
+# the NDTV and TOI parsers, santise_content and time_to_iso, on the recorded feeds and on synthetic
+# 1k / 10k item feeds. Results are written as JSON and can be compared against a previous run.
+#
+#   python tests/benchmarks/run_benchmarks.py --output results.json
+#   python tests/benchmarks/run_benchmarks.py --baseline results.json --threshold 0.2
+"""
+
+# ==================================================================================================
+# Python imports
+import argparse
+import io
+import json
+import os
+import platform
+import sys
+import timeit
+from collections.abc import Callable
+from datetime import datetime, timezone
+
+# The synthetic feeds are larger than the production caps
+os.environ.setdefault("READER_MAX_FEED_ITEMS", "100000")
+os.environ.setdefault("READER_MAX_FEED_BYTES", str(256 * 1024 * 1024))
+
+# Puts the backend sources on the path, so it is imported first
+from feeds import recorded_feeds, synthetic_feed  # noqa: I001
+
+import lxml
+import pydantic
+import requests
+from lxml import etree as ET  # noqa: N812
+from requests.structures import CaseInsensitiveDict
+from urllib3.response import HTTPResponse
+
+# ==================================================================================================
+# Module imports
+from backend.src.fn.reader.lib import feed_handler, parsers
+from shared.content import santise_content
+from shared.logger import logger
+from shared.time import time_to_iso
+
+# ==================================================================================================
+# Global declarations
+
+SYNTHETIC_SIZES = {"synthetic_1k": 1_000, "synthetic_10k": 10_000}
+# Quick runs only check that every benchmark works, so they skip the largest feed
+QUICK_SYNTHETIC_SIZES = {"synthetic_1k": 1_000}
+REPEAT = 5
+LARGE_ARTICLE_PARAGRAPHS = 200
+REPLAY_URL = "https://replay.invalid/feed"
+
+
+class ReplaySession:
+    """
+    Stands in for the pooled HTTP session and answers every GET with a recorded payload
+    """
+
+    def __init__(self, body: bytes) -> None:
+        self.body = body
+
+    def get(self, url: str, **_: object) -> requests.Response:
+        response = requests.Response()
+        response.status_code = 200
+        response.url = url
+        response.headers = CaseInsensitiveDict({"Content-Type": "application/rss+xml; charset=UTF-8"})
+        response.raw = HTTPResponse(body=io.BytesIO(self.body), preload_content=False)
+        return response
+
+
+def _time(func: Callable[[], object], items: int, *, quick: bool) -> dict:
+    """
+    Returns the best time of a call, and the time per item, over REPEAT rounds
+    """
+    timer = timeit.Timer(func)
+    number = 1 if quick else timer.autorange()[0]
+    best = min(timer.repeat(number=number, repeat=1 if quick else REPEAT)) / number
+    return {"items": items, "best_ms": round(best * 1e3, 4), "per_item_us": round(best / max(items, 1) * 1e6, 3)}
+
+
+def _synthetic_sizes(*, quick: bool) -> dict[str, int]:
+    return QUICK_SYNTHETIC_SIZES if quick else SYNTHETIC_SIZES
+
+
+def _feeds(*, quick: bool) -> dict[str, tuple[str, bytes]]:
+    """
+    Returns the benchmark feeds as case name -> (parser name, payload)
+    """
+    feeds = {name: (name, body) for name, body in recorded_feeds().items()}
+    feeds.update({case: ("NDTV", synthetic_feed(size)) for case, size in _synthetic_sizes(quick=quick).items()})
+    return feeds
+
+
+def bench_get_feed_from_rss(*, quick: bool) -> list[dict]:
+    results = []
+    original_session = feed_handler.session
+    try:
+        for case, (parser_name, body) in _feeds(quick=quick).items():
+            feed_handler.session = ReplaySession(body)
+
+            def parse(name: str = parser_name) -> list:
+                return feed_handler.get_feed_from_rss(name, REPLAY_URL, "INDIA", "EN", "IN").feed
+
+            timing = _time(parse, len(parse()), quick=quick)
+            results.append({"benchmark": "get_feed_from_rss", "case": case, **timing})
+    finally:
+        feed_handler.session = original_session
+    return results
+
+
+def bench_parse_feed(*, quick: bool) -> list[dict]:
+    results = []
+    feeds = _feeds(quick=quick)
+    for parser_name in ("NDTV", "TOI"):
+        parser = getattr(parsers, parser_name)()
+        for case in [parser_name, *_synthetic_sizes(quick=quick)]:
+            root = ET.fromstring(feeds[case][1])
+            items = len(parser.parse_feed(root, "INDIA", "EN", "IN").feed)
+            timing = _time(lambda parser=parser, root=root: parser.parse_feed(root, "INDIA", "EN", "IN"), items, quick=quick)
+            results.append({"benchmark": f"{parser_name}.parse_feed", "case": case, **timing})
+    return results
+
+
+def bench_santise_content(*, quick: bool) -> list[dict]:
+    results = []
+    for name, body in recorded_feeds().items():
+        descriptions = [str(text) for text in ET.fromstring(body).xpath("channel/item/description/text()")]
+        timing = _time(lambda texts=descriptions: [santise_content(text) for text in texts], len(descriptions), quick=quick)
+        results.append({"benchmark": "santise_content", "case": name, **timing})
+
+    # Full article bodies, as summarised by the Summarise function, are tens of KB
+    paragraph = '<p>Officials said the <a href="https://example.com/x">decision</a> would be reviewed &amp; announced next week.</p>\n'
+    article = paragraph * LARGE_ARTICLE_PARAGRAPHS
+    timing = _time(lambda: santise_content(article), 1, quick=quick)
+    results.append({"benchmark": "santise_content", "case": f"article_{len(article) // 1024}kb", **timing})
+    return results
+
+
+def bench_time_to_iso(*, quick: bool) -> list[dict]:
+    results = []
+    for name, body in recorded_feeds().items():
+        timestamps = [str(text) for text in ET.fromstring(body).xpath("channel/item/pubDate/text()")]
+        timing = _time(lambda values=timestamps: [time_to_iso(value) for value in values], len(timestamps), quick=quick)
+        results.append({"benchmark": "time_to_iso", "case": name, **timing})
+    return results
+
+
+BENCHMARKS = {
+    "get_feed_from_rss": bench_get_feed_from_rss,
+    "parse_feed": bench_parse_feed,
+    "santise_content": bench_santise_content,
+    "time_to_iso": bench_time_to_iso,
+}
+
+
+def run(selected: list[str] | None = None, *, quick: bool = False) -> dict:
+    """
+    Runs the selected benchmarks (all by default) and returns the results with the environment they ran in
+    """
+    logger.setLevel("WARNING")
+    results = []
+    for name, bench in BENCHMARKS.items():
+        if not selected or name in selected:
+            results.extend(bench(quick=quick))
+
+    return {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "lxml": lxml.__version__,
+            "pydantic": pydantic.VERSION,
+            "quick": quick,
+        },
+        "results": results,
+    }
+
+
+def compare(report: dict, baseline: dict, threshold: float) -> list[str]:
+    """
+    Returns a line for every benchmark that is slower than the baseline by more than the threshold
+    """
+    previous = {(result["benchmark"], result["case"]): result for result in baseline["results"]}
+    regressions = []
+    for result in report["results"]:
+        old = previous.get((result["benchmark"], result["case"]))
+        if not old or not old["per_item_us"]:
+            continue
+        ratio = result["per_item_us"] / old["per_item_us"]
+        print(
+            f"{result['benchmark']:<24} {result['case']:<16} "
+            f"{old['per_item_us']:>10.3f} -> {result['per_item_us']:>10.3f} us/item ({ratio:.2f}x)",
+        )
+        if ratio > 1 + threshold:
+            regressions.append(f"{result['benchmark']} [{result['case']}] is {ratio:.2f}x slower")
+    return regressions
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("benchmarks", nargs="*", help=f"Benchmarks to run (default: all): {', '.join(BENCHMARKS)}")
+    arg_parser.add_argument("--output", help="Write the JSON results to this file")
+    arg_parser.add_argument("--baseline", help="Compare against the JSON results of a previous run")
+    arg_parser.add_argument("--threshold", type=float, default=0.2, help="Allowed slowdown before failing (default: 0.2)")
+    arg_parser.add_argument("--quick", action="store_true", help="Run every benchmark once, to check that they work")
+    args = arg_parser.parse_args()
+    unknown = set(args.benchmarks) - set(BENCHMARKS)
+    if unknown:
+        arg_parser.error(f"Unknown benchmarks: {', '.join(sorted(unknown))}")
+
+    report = run(args.benchmarks, quick=args.quick)
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:  # noqa: PTH123
+            f.write(output)
+    else:
+        print(output)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:  # noqa: PTH123
+            regressions = compare(report, json.load(f), args.threshold)
+        if regressions:
+            print("\n".join(["Regressions:", *regressions]))
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,19 @@
+from run_benchmarks import compare, run
+
+
+def test_benchmarks_run_offline() -> None:
+    """Every benchmark runs once against the recorded and synthetic feeds, without network access"""
+    report = run(quick=True)
+
+    benchmarks = {result["benchmark"] for result in report["results"]}
+    assert benchmarks == {"get_feed_from_rss", "NDTV.parse_feed", "TOI.parse_feed", "santise_content", "time_to_iso"}
+    assert all(result["items"] > 0 for result in report["results"])
+
+
+def test_compare_flags_regressions() -> None:
+    """A benchmark slower than the baseline by more than the threshold is reported"""
+    baseline = {"results": [{"benchmark": "time_to_iso", "case": "NDTV", "per_item_us": 10.0}]}
+    report = {"results": [{"benchmark": "time_to_iso", "case": "NDTV", "per_item_us": 13.0}]}
+
+    assert compare(report, baseline, threshold=0.2)
+    assert not compare(report, baseline, threshold=0.5)
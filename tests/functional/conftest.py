@@ -0,0 +1,25 @@
+"""
+# --*-- coding: utf-8 --*--
+# Runs the reader's app locally for the tests that drive it: its modules are put on the path the way the Lambda
+# packages them, and its stores are the JSON file stand-ins instead of DynamoDB.
+"""
+
+# ==================================================================================================
+# Python imports
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# ==================================================================================================
+# Global declarations
+
+READER_DIR = Path(__file__).resolve().parents[2] / "backend" / "src" / "fn" / "reader"
+if str(READER_DIR) not in sys.path:
+    sys.path.insert(0, str(READER_DIR))
+
+os.environ.setdefault("AWS_DEFAULT_REGION", "us-east-1")
+os.environ.setdefault("NEWS_FEED_BUCKET", "news-feed-bucket")
+os.environ.setdefault("NEWS_TABLE_NAME", "news-table")
+os.environ.setdefault("POWERTOOLS_LOG_LEVEL", "WARNING")
+os.environ.setdefault("FEED_STATE_FILE", str(Path(tempfile.mkdtemp()) / "feed_state.json"))
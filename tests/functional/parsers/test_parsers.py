@@ -4,9 +4,8 @@ from pathlib import Path
 from xml.etree import ElementTree as ET
 
 import requests
-
-from backend.src.fn.reader.lib.parsers.ndtv import NDTV
-from backend.src.fn.reader.lib.parsers.toi import TOI
+from lib.parsers.ndtv import NDTV
+from lib.parsers.toi import TOI
 
 # Set up logger
 logger = logging.getLogger(__name__)
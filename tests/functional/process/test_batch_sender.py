@@ -0,0 +1,71 @@
+import json
+import threading
+
+import pytest
+
+# Process's own modules are also a package named lib, which the functional conftest already resolves to the
+# reader's. So they are imported by their path in the repo, the one name this session loads them under.
+from backend.src.fn.process.lib import batch_sender
+from backend.src.fn.process.lib.batch_sender import BatchSender, BatchSendError, build_batches
+
+
+class FakeSQSClient:
+    """Records SendMessageBatch calls, and fails the listed message bodies once or on every attempt"""
+
+    def __init__(self, fail_once: set[str] = frozenset(), fail_always: set[str] = frozenset()) -> None:
+        self.fail_once = set(fail_once)
+        self.fail_always = set(fail_always)
+        self.calls: list[list[str]] = []
+        self._lock = threading.Lock()
+
+    def send_message_batch(self, QueueUrl: str, Entries: list[dict]) -> dict:  # noqa: ARG002, N803
+        with self._lock:
+            self.calls.append([entry["MessageBody"] for entry in Entries])
+            failed = []
+            for entry in Entries:
+                body = entry["MessageBody"]
+                if body in self.fail_always:
+                    failed.append({"Id": entry["Id"], "SenderFault": True, "Code": "InvalidMessageContents"})
+                elif body in self.fail_once:
+                    self.fail_once.discard(body)
+                    failed.append({"Id": entry["Id"], "SenderFault": False, "Code": "InternalError"})
+        return {"Successful": [], "Failed": failed}
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(batch_sender, "RETRY_BASE_SECONDS", 0)
+
+
+def test_batches_respect_entry_and_size_limits() -> None:
+    """Batches hold at most 10 entries and stay under the byte limit, and oversized messages are reported"""
+    entries = {str(i): json.dumps({"i": i}) for i in range(25)}
+    batches, oversized = build_batches(entries)
+    assert [len(batch) for batch in batches] == [10, 10, 5]
+    assert not oversized
+
+    entries = {"0": "a" * 60, "1": "b" * 60, "2": "c" * 120, "3": "d" * 30}
+    batches, oversized = build_batches(entries, max_bytes=100)
+    assert [[entry["Id"] for entry in batch] for batch in batches] == [["0"], ["1", "3"]]
+    assert list(oversized) == ["2"]
+
+
+def test_only_failed_entries_are_retried() -> None:
+    """A transient failure resends that entry alone, so 25 messages take 3 calls plus 1 retry"""
+    bodies = [json.dumps({"i": i}) for i in range(25)]
+    client = FakeSQSClient(fail_once={bodies[7]})
+
+    assert BatchSender(client, "queue-url").send(bodies) == 4  # noqa: PLR2004
+    assert client.calls[-1] == [bodies[7]]
+    assert sorted(body for call in client.calls[:3] for body in call) == sorted(bodies)
+
+
+def test_sender_faults_are_not_retried() -> None:
+    """Entries SQS rejects as invalid fail the send once the other entries are through"""
+    bodies = [json.dumps({"i": i}) for i in range(3)]
+    client = FakeSQSClient(fail_always={bodies[1]})
+
+    with pytest.raises(BatchSendError) as error:
+        BatchSender(client, "queue-url").send(bodies)
+    assert list(error.value.failed) == ["1"]
+    assert len(client.calls) == 1
@@ -0,0 +1,121 @@
+from pathlib import Path
+
+import pytest
+import requests
+from lib.circuit_breaker import CIRCUIT_CLOSED, CIRCUIT_HALF_OPEN, CIRCUIT_OPEN, CircuitBreaker, JsonFileHostStateStore
+from lib.feed_handler import FeedNotModifiedError, FeedParseError, HostUnavailableError, iter_feed_items
+from urllib3.exceptions import ProtocolError
+
+URL = "https://feeds.example.com/india.xml"
+HOST = "feeds.example.com"
+NOW = 1_700_000_000
+COOLDOWN_SECONDS = 600
+
+
+def make_breaker(path: Path) -> CircuitBreaker:
+    breaker = CircuitBreaker(
+        JsonFileHostStateStore(str(path)),
+        failure_threshold=3,
+        cooldown_seconds=COOLDOWN_SECONDS,
+        failure_types=(HostUnavailableError,),
+        success_types=(FeedNotModifiedError,),
+    )
+    breaker.load()
+    return breaker
+
+
+@pytest.fixture
+def breaker(tmp_path: Path) -> CircuitBreaker:
+    return make_breaker(tmp_path / "feed_state.json")
+
+
+def fetch(breaker: CircuitBreaker, now: int, error: Exception | None = None) -> None:
+    """A fetch of URL guarded by the breaker, which fails with error when given"""
+    if error is None:
+        with breaker.guard(URL, now):
+            return
+    with pytest.raises(type(error)), breaker.guard(URL, now):
+        raise error
+
+
+def test_circuit_opens_at_the_threshold_and_stays_open_across_runs(breaker: CircuitBreaker, tmp_path: Path) -> None:
+    """Consecutive failures open the circuit once they reach the threshold, and the next run sees it open"""
+    for _ in range(2):
+        fetch(breaker, NOW, HostUnavailableError("down"))
+    assert breaker.state(HOST, NOW) == CIRCUIT_CLOSED
+
+    fetch(breaker, NOW, HostUnavailableError("down"))
+    assert breaker.state(HOST, NOW) == CIRCUIT_OPEN
+    assert not breaker.allow(URL, NOW + 1)
+
+    breaker.save()
+    assert make_breaker(tmp_path / "feed_state.json").state(HOST, NOW + 1) == CIRCUIT_OPEN
+
+
+def test_half_open_circuit_lets_a_single_probe_through(breaker: CircuitBreaker) -> None:
+    """After the cooldown one probe is allowed, and a failed probe opens the circuit for another cooldown"""
+    for _ in range(3):
+        fetch(breaker, NOW, HostUnavailableError("down"))
+    later = NOW + COOLDOWN_SECONDS
+    assert breaker.state(HOST, later) == CIRCUIT_HALF_OPEN
+
+    assert breaker.allow(URL, later)
+    assert not breaker.allow(URL, later)
+
+    fetch(breaker, later, HostUnavailableError("still down"))
+    assert breaker.state(HOST, later + COOLDOWN_SECONDS - 1) == CIRCUIT_OPEN
+    assert breaker.state(HOST, later + COOLDOWN_SECONDS) == CIRCUIT_HALF_OPEN
+
+
+def test_successful_probe_closes_the_circuit(breaker: CircuitBreaker) -> None:
+    """A probe the host answers, even with 304 Not Modified, closes the circuit and clears the failures"""
+    for _ in range(3):
+        fetch(breaker, NOW, HostUnavailableError("down"))
+    later = NOW + COOLDOWN_SECONDS
+    assert breaker.allow(URL, later)
+
+    fetch(breaker, later, FeedNotModifiedError("not modified"))
+    assert breaker.state(HOST, later) == CIRCUIT_CLOSED
+    assert breaker.summary(later) == {}
+
+    # The count starts again from zero
+    for _ in range(2):
+        fetch(breaker, later, HostUnavailableError("down"))
+    assert breaker.state(HOST, later) == CIRCUIT_CLOSED
+
+
+def test_success_resets_the_failure_count(breaker: CircuitBreaker) -> None:
+    """Only consecutive failures count, and errors of the feed itself count neither way"""
+    for _ in range(2):
+        fetch(breaker, NOW, HostUnavailableError("down"))
+    fetch(breaker, NOW)
+    for _ in range(2):
+        fetch(breaker, NOW, HostUnavailableError("down"))
+    fetch(breaker, NOW, FeedParseError("broken XML"))
+
+    assert breaker.state(HOST, NOW) == CIRCUIT_CLOSED
+
+
+class BrokenBody:
+    """A response body whose connection drops after the first chunk"""
+
+    def __init__(self) -> None:
+        self.chunks = [b"<rss><channel><item><title>One</title></item>"]
+
+    def read1(self, amt: int, decode_content: bool) -> bytes:  # noqa: ARG002, FBT001
+        if self.chunks:
+            return self.chunks.pop()
+        msg = "Connection broken"
+        raise ProtocolError(msg)
+
+    def close(self) -> None:
+        pass
+
+
+def test_network_error_mid_stream_counts_against_the_host() -> None:
+    """A body that breaks off is a HostUnavailableError, which the circuit breaker counts"""
+    response = requests.Response()
+    response.raw = BrokenBody()
+
+    with pytest.raises(HostUnavailableError):
+        list(iter_feed_items(response, URL))
@@ -0,0 +1,43 @@
+from lib.parsers import NDTV
+from lxml import etree as ET  # noqa: N812
+
+RSS = """<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0" xmlns:media="http://search.yahoo.com/mrss/">
+<channel><title>NDTV India</title>
+{items}
+</channel></rss>"""
+
+ITEM = """<item><title>Headline {i}</title><link>{link}</link>
+<description><![CDATA[<p>Summary {i} &amp; <b>more</b></p>]]></description>
+<pubDate>Mon, 07 Aug 2023 18:{i:02d}:00 +0530</pubDate>
+<media:content url="https://img/{i}.jpg" /></item>"""
+
+
+def parse(*links: str) -> list:
+    items = "\n".join(ITEM.format(i=i, link=link) for i, link in enumerate(links))
+    root = ET.fromstring(RSS.format(items=items).encode("utf-8"))
+    return NDTV().parse_feed(root, "INDIA", "EN", "IN").feed
+
+
+def test_items_are_keyed_by_canonical_url_and_summaries_sanitised() -> None:
+    [item] = parse("http://WWW.NDTV.com/india-news/story-0/?utm_source=rss#comments")
+
+    assert item.news_url == "http://WWW.NDTV.com/india-news/story-0/?utm_source=rss"
+    assert item.canonical_url == "https://www.ndtv.com/india-news/story-0"
+    assert item.summary == "Summary 0 & more"
+
+
+def test_malformed_links_do_not_fail_the_feed() -> None:
+    """A link urlsplit cannot take apart keeps its item, keyed by the link as it is"""
+    items = parse(
+        "https://www.ndtv.com/india-news/story-0",
+        "https://www.ndtv.com:port/india-news/story-1",
+        "https://[::1/india-news/story-2#comments",
+    )
+
+    assert [item.canonical_url for item in items] == [
+        "https://www.ndtv.com/india-news/story-0",
+        "https://www.ndtv.com:port/india-news/story-1",
+        "https://[::1/india-news/story-2#comments",
+    ]
+    assert items[2].news_url == "https://[::1/india-news/story-2"
@@ -0,0 +1,125 @@
+from pathlib import Path
+
+import app
+import pytest
+from lib.feed_state import FeedState, JsonFileFeedStateStore
+from lib.merge import merge_feeds
+from lib.seen_items import seen_key
+from lib.tasks import FeedTask
+from shared.news_model import SourceNewsFeedModel, SourceNewsItemModel
+
+NOW = 1_700_000_000
+TOP = FeedTask(category="TOP", feed_url="https://feeds.example.com/top.xml", index=0, total=1, s3_key="NDTV-TOP.json")
+INDIA = FeedTask(category="INDIA", feed_url="https://feeds.example.com/india.xml", index=0, total=1, s3_key="NDTV-INDIA.json")
+SOURCE_METADATA = {"name_short": "NDTV", "language": "EN", "country": "IN", "feeds": {}, "parser": None}
+
+
+def make_item(i: int, category: str, query: str = "") -> SourceNewsItemModel:
+    """Item i of a feed. Items with the same i are the same article, whatever the query of their link."""
+    return SourceNewsItemModel.model_validate(
+        {
+            "source_name": "NDTV",
+            "source_id": "ndtv",
+            "country": "IN",
+            "language": "EN",
+            "news_url": f"https://www.ndtv.com/india-news/story-{i}{query}",
+            "canonical_url": f"https://www.ndtv.com/india-news/story-{i}",
+            "headline": f"Headline {i}",
+            "published": "2023-08-07T18:00:00+05:30",
+            "published_ms": 1691411400000,
+            "summary": f"Summary {i}",
+            "categories": [category],
+            "media": {"image_url": f"https://img/{i}.jpg"},
+        },
+    )
+
+
+@pytest.fixture
+def uploads(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> dict[str, list[str]]:
+    """Uploads by S3 key. Uploads of keys listed under 'failing' raise."""
+    uploaded: dict[str, list[str]] = {"failing": []}
+
+    def upload_feed_to_s3(feed: list[SourceNewsItemModel], s3_key: str, _: str) -> None:
+        if s3_key in uploaded["failing"]:
+            msg = f"Upload of {s3_key} failed"
+            raise RuntimeError(msg)
+        uploaded[s3_key] = [item.news_url for item in feed]
+
+    monkeypatch.setattr(app, "upload_feed_to_s3", upload_feed_to_s3)
+    monkeypatch.setattr(app, "CONSOLIDATED_UPLOAD", False)
+    monkeypatch.setattr(app, "feed_state_store", JsonFileFeedStateStore(str(tmp_path / "feed_state.json")))
+    return uploaded
+
+
+def stored_states(*states: FeedState) -> dict[str, FeedState]:
+    app.feed_state_store.save("NDTV", list(states))
+    return app.feed_state_store.load("NDTV")
+
+
+def fetched(task: FeedTask, state: FeedState, items: list[SourceNewsItemModel]) -> app.FeedResult:
+    """The result of a fetch of the feed, which answered with new validators"""
+    pending_state = state.model_copy()
+    pending_state.etag = '"new"'
+    return app.ingest_feed(task, SourceNewsFeedModel.model_construct(feed=items), state, pending_state, NOW)
+
+
+def publish(results: list[app.FeedResult], states: dict[str, FeedState]) -> list[tuple[str, FeedState]]:
+    return app.publish_results("NDTV", SOURCE_METADATA, results, states, "NDTV.json")
+
+
+def test_merge_keeps_feed_order_and_merges_categories() -> None:
+    """Each article goes to the first feed listing it, in feed and item order, with the categories of every copy"""
+    merged, owners = merge_feeds(
+        [
+            ("NDTV-TOP.json", [make_item(0, "TOP"), make_item(1, "TOP")]),
+            ("NDTV-INDIA.json", [make_item(1, "INDIA", "?utm_source=rss"), make_item(2, "INDIA"), make_item(0, "INDIA")]),
+        ],
+    )
+
+    assert {key: [item.news_url.rsplit("/", 1)[1] for item in items] for key, items in merged.items()} == {
+        "NDTV-TOP.json": ["story-0", "story-1"],
+        "NDTV-INDIA.json": ["story-2"],
+    }
+    assert [item.categories for item in merged["NDTV-TOP.json"]] == [["TOP", "INDIA"], ["TOP", "INDIA"]]
+    assert owners == {
+        "https://www.ndtv.com/india-news/story-0": "NDTV-TOP.json",
+        "https://www.ndtv.com/india-news/story-1": "NDTV-TOP.json",
+        "https://www.ndtv.com/india-news/story-2": "NDTV-INDIA.json",
+    }
+
+
+def test_failed_upload_leaves_the_feed_state_untouched(uploads: dict) -> None:
+    """A feed whose items are not uploaded keeps its stored state, so the items are uploaded by the next run"""
+    old_seen = [seen_key("https://www.ndtv.com/india-news/story-9")]
+    states = stored_states(FeedState(feed_url=TOP.feed_url, etag='"old"', seen=old_seen))
+    uploads["failing"].append(TOP.s3_key)
+
+    [(outcome, _)] = publish([fetched(TOP, states[TOP.feed_url], [make_item(0, "TOP"), make_item(1, "TOP")])], states)
+
+    assert outcome == app.FEED_FAILED
+    state = app.feed_state_store.load("NDTV")[TOP.feed_url]
+    assert (state.etag, state.content_hash, state.seen) == ('"old"', None, old_seen)
+    assert state.next_due > NOW
+
+    uploads["failing"].clear()
+    [(outcome, _)] = publish([fetched(TOP, state, [make_item(0, "TOP"), make_item(1, "TOP")])], {TOP.feed_url: state})
+    assert outcome == app.FEED_UPLOADED
+    assert len(uploads[TOP.s3_key]) == 2  # noqa: PLR2004
+
+
+def test_partial_upload_remembers_only_the_uploaded_items(uploads: dict) -> None:
+    """A feed whose own upload failed still remembers its items that another feed of the run uploaded"""
+    states = stored_states(FeedState(feed_url=TOP.feed_url, etag='"old"'), FeedState(feed_url=INDIA.feed_url, etag='"old"'))
+    uploads["failing"].append(INDIA.s3_key)
+    results = [
+        fetched(TOP, states[TOP.feed_url], [make_item(0, "TOP"), make_item(1, "TOP")]),
+        fetched(INDIA, states[INDIA.feed_url], [make_item(1, "INDIA"), make_item(2, "INDIA")]),
+    ]
+
+    assert [outcome for outcome, _ in publish(results, states)] == [app.FEED_UPLOADED, app.FEED_FAILED]
+
+    stored = app.feed_state_store.load("NDTV")
+    assert stored[TOP.feed_url].etag == '"new"'
+    assert stored[TOP.feed_url].seen == [seen_key(f"https://www.ndtv.com/india-news/story-{i}") for i in (0, 1)]
+    assert stored[INDIA.feed_url].etag == '"old"'
+    assert stored[INDIA.feed_url].seen == [seen_key("https://www.ndtv.com/india-news/story-1")]
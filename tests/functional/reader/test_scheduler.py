@@ -0,0 +1,88 @@
+import pytest
+from lib.feed_state import FeedState
+from lib.scheduler import DUE_GRACE_SECONDS, FeedScheduler
+
+NOW = 1_700_000_000
+HOUR = 3600
+MIN_INTERVAL = 15 * 60
+MAX_INTERVAL = 1440 * 60
+
+
+@pytest.fixture
+def scheduler() -> FeedScheduler:
+    return FeedScheduler(min_interval_minutes=15, max_interval_minutes=1440, target_new_items=3, smoothing=0.5)
+
+
+def published_ms(*hours_ago: float) -> list[int]:
+    return [int((NOW - hours * HOUR) * 1000) for hours in hours_ago]
+
+
+def test_first_fetch_bootstraps_the_rate_from_the_feed_window(scheduler: FeedScheduler) -> None:
+    """Seven items over six hours is one item an hour, so three new items are expected every three hours"""
+    state = FeedState(feed_url="https://feeds.example.com/india.xml")
+    scheduler.record_fetch(state, published_ms(0, 1, 2, 3, 4, 5, 6), NOW)
+
+    assert state.rate == 1
+    assert state.last_fetched == NOW
+    assert state.next_due == NOW + 3 * HOUR
+
+
+def test_interval_follows_the_publish_rate(scheduler: FeedScheduler) -> None:
+    """A feed publishing faster is polled more often, and a feed going quiet less often"""
+    state = FeedState(feed_url="https://feeds.example.com/india.xml", rate=1, last_fetched=NOW - 3 * HOUR)
+
+    scheduler.record_fetch(state, [], NOW, new_items=9)
+    assert state.rate == 2  # noqa: PLR2004
+    assert state.next_due == NOW + int(1.5 * HOUR)
+
+    scheduler.record_fetch(state, published_ms(2, 1), NOW + 3 * HOUR)
+    assert state.rate == 1
+    assert state.next_due == NOW + 6 * HOUR
+
+    scheduler.record_fetch(state, [], NOW + 6 * HOUR)
+    assert state.rate == 0.5  # noqa: PLR2004
+    assert state.next_due == NOW + 12 * HOUR
+
+
+@pytest.mark.parametrize(
+    ("rate", "interval"),
+    [
+        (None, MIN_INTERVAL),
+        (0, MAX_INTERVAL),
+        (0.01, MAX_INTERVAL),
+        (3, HOUR),
+        (100, MIN_INTERVAL),
+    ],
+)
+def test_interval_is_clamped_to_the_bounds(scheduler: FeedScheduler, rate: float | None, interval: int) -> None:
+    """Unknown rates are polled at the minimum interval, silent feeds at the maximum"""
+    assert scheduler.interval(rate) == interval
+
+
+def test_failure_keeps_the_usual_interval(scheduler: FeedScheduler) -> None:
+    state = FeedState(feed_url="https://feeds.example.com/india.xml", rate=1, last_fetched=NOW - HOUR)
+    scheduler.record_failure(state, NOW)
+
+    assert state.next_due == NOW + 3 * HOUR
+    assert state.last_fetched == NOW - HOUR
+
+
+@pytest.mark.parametrize(
+    ("fields", "due"),
+    [
+        ({}, True),
+        ({"next_due": NOW - 1}, True),
+        ({"next_due": NOW + DUE_GRACE_SECONDS}, True),
+        ({"next_due": NOW + DUE_GRACE_SECONDS + 1}, False),
+        # With an active lease items are pushed, so the feed is only polled at the maximum interval
+        ({"next_due": NOW, "lease_expires": NOW + HOUR, "last_fetched": NOW - HOUR}, False),
+        ({"next_due": NOW, "lease_expires": NOW + HOUR, "last_fetched": NOW - MAX_INTERVAL}, True),
+        # An expired lease, or one for a feed never fetched, falls back to next_due
+        ({"next_due": NOW, "lease_expires": NOW, "last_fetched": NOW - HOUR}, True),
+        ({"next_due": NOW + HOUR, "lease_expires": NOW + HOUR}, False),
+    ],
+)
+def test_is_due(scheduler: FeedScheduler, fields: dict, due: bool) -> None:  # noqa: FBT001
+    state = FeedState(feed_url="https://feeds.example.com/india.xml", **fields)
+
+    assert scheduler.is_due(state, NOW) is due
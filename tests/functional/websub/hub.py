@@ -0,0 +1,124 @@
+"""
+# --*-- coding: utf-8 --*--
+# Stand-in WebSub hub
+# A minimal local hub for tests: it accepts subscription requests, verifies the intent of the subscriber
+# with a challenge, and publishes content to the verified subscribers, signed with their secret.
+"""
+
+# ==================================================================================================
+# Python imports
+import hashlib
+import hmac
+import secrets
+import threading
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Self
+from urllib.parse import parse_qs, urlencode
+
+import requests
+
+# ==================================================================================================
+
+
+@dataclass
+class Subscription:
+    """
+    A subscription as the hub sees it
+    """
+
+    topic: str
+    callback: str
+    secret: str | None
+    lease_seconds: int
+    verified: bool = False
+
+
+class StandInHub:
+    """
+    Runs the hub on a local port. Intent is verified in the background after answering 202, as real hubs do.
+    """
+
+    def __init__(self, lease_seconds: int | None = None) -> None:
+        # The lease the hub grants, instead of the one requested
+        self.lease_seconds = lease_seconds
+        self.subscriptions: dict[tuple[str, str], Subscription] = {}
+        self.verified = threading.Condition()
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self.url = f"http://127.0.0.1:{self.server.server_port}/"
+
+    def __enter__(self) -> Self:
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+    def wait_for_verification(self, topic: str, timeout: float = 5) -> bool:
+        """
+        Waits until the hub has checked the intent of a subscriber to the topic. Returns whether one was verified.
+        """
+        with self.verified:
+            self.verified.wait_for(lambda: any(s.topic == topic for s in self.subscriptions.values()), timeout)
+            return any(s.topic == topic and s.verified for s in self.subscriptions.values())
+
+    def publish(self, topic: str, content: bytes, content_type: str = "application/rss+xml", secret: str | None = None) -> list[int]:
+        """
+        Pushes the content to the verified subscribers of the topic. Returns the status code of each callback.
+        secret overrides the subscriber's secret, to forge a signature.
+        """
+        statuses = []
+        for subscription in list(self.subscriptions.values()):
+            if subscription.topic != topic or not subscription.verified:
+                continue
+            headers = {"Content-Type": content_type, "Link": f'<{self.url}>; rel="hub", <{topic}>; rel="self"'}
+            key = secret or subscription.secret
+            if key:
+                headers["X-Hub-Signature"] = "sha256=" + hmac.new(key.encode("utf-8"), content, hashlib.sha256).hexdigest()
+            statuses.append(requests.post(subscription.callback, data=content, headers=headers, timeout=5).status_code)
+        return statuses
+
+    def _verify(self, mode: str, subscription: Subscription) -> None:
+        challenge = secrets.token_urlsafe(16)
+        params = {"hub.mode": mode, "hub.topic": subscription.topic, "hub.challenge": challenge}
+        if mode == "subscribe":
+            params["hub.lease_seconds"] = str(subscription.lease_seconds)
+        separator = "&" if "?" in subscription.callback else "?"
+        response = requests.get(f"{subscription.callback}{separator}{urlencode(params)}", timeout=5)
+        verified = response.status_code // 100 == 2 and response.text == challenge  # noqa: PLR2004
+
+        with self.verified:
+            key = (subscription.topic, subscription.callback)
+            if mode == "unsubscribe":
+                if verified:
+                    self.subscriptions.pop(key, None)
+            else:
+                subscription.verified = verified
+                self.subscriptions[key] = subscription
+            self.verified.notify_all()
+
+    def _handler(self) -> type[BaseHTTPRequestHandler]:
+        hub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args: object) -> None:
+                pass
+
+            def do_POST(self) -> None:
+                length = int(self.headers.get("Content-Length", 0))
+                form = {key: values[0] for key, values in parse_qs(self.rfile.read(length).decode("utf-8")).items()}
+                mode, topic, callback = form.get("hub.mode"), form.get("hub.topic"), form.get("hub.callback")
+                if mode not in {"subscribe", "unsubscribe"} or not topic or not callback:
+                    self.send_response(400)
+                    self.end_headers()
+                    return
+
+                lease_seconds = hub.lease_seconds or int(form.get("hub.lease_seconds", 3600))
+                subscription = Subscription(topic, callback, form.get("hub.secret"), lease_seconds)
+                self.send_response(202)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                threading.Thread(target=hub._verify, args=(mode, subscription), daemon=True).start()
+
+        return Handler
@@ -0,0 +1,200 @@
+import base64
+import threading
+import time
+from collections.abc import Iterator
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlencode, urlparse
+
+import app
+import pytest
+from hub import StandInHub
+from lib.feed_handler import parse_content_items
+from lib.feed_state import FeedState, JsonFileFeedStateStore
+from lib.websub import SubscriptionManager
+
+FEED_URL = "https://feeds.feedburner.com/ndtvnews-india-news"
+LEASE_SECONDS = 10 * 24 * 3600
+SECRET = "test-secret"  # noqa: S105
+
+RSS = """<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0" xmlns:atom="http://www.w3.org/2005/Atom" xmlns:media="http://search.yahoo.com/mrss/">
+<channel><title>NDTV India</title>
+<atom:link rel="hub" href="{hub}" />
+<atom:link rel="self" href="{topic}" />
+{items}
+</channel></rss>"""
+
+ITEM = """<item><title>Headline {i}</title><link>https://www.ndtv.com/india-news/story-{i}</link>
+<description><![CDATA[<p>Summary {i}</p>]]></description>
+<pubDate>Mon, 07 Aug 2023 18:{i:02d}:00 +0530</pubDate>
+<media:content url="https://img/{i}.jpg" /></item>"""
+
+
+def make_feed(hub: str, count: int) -> bytes:
+    """An NDTV style feed advertising the hub, with count items"""
+    items = "\n".join(ITEM.format(i=i) for i in range(count))
+    return RSS.format(hub=hub, topic=FEED_URL, items=items).encode("utf-8")
+
+
+def get_source_metadata(news_source: str, country: str, language: str) -> dict:
+    """The source registry, holding NDTV India only"""
+    if (news_source, country, language) != ("NDTV", "IN", "EN"):
+        msg = f"News source {news_source} not found"
+        raise ValueError(msg)
+    return {"name_short": "NDTV", "name_long": "NDTV", "language": "EN", "country": "IN", "feeds": {"INDIA": FEED_URL}, "parser": None}
+
+
+def function_url_event(method: str, url: str, body: bytes = b"", headers: dict[str, str] | None = None) -> dict:
+    """The event a Lambda Function URL hands to push for an HTTP request"""
+    parsed = urlparse(url)
+    return {
+        "version": "2.0",
+        "rawPath": parsed.path,
+        "rawQueryString": parsed.query,
+        "queryStringParameters": {key: values[0] for key, values in parse_qs(parsed.query).items()},
+        "headers": {key.lower(): value for key, value in (headers or {}).items()},
+        "requestContext": {"http": {"method": method, "path": parsed.path}},
+        "body": base64.b64encode(body).decode("ascii"),
+        "isBase64Encoded": True,
+    }
+
+
+class FunctionUrl:
+    """Serves the reader's push handler over HTTP, as its Function URL does, so the hub can call it"""
+
+    def __init__(self) -> None:
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self.url = f"http://127.0.0.1:{self.server.server_port}/"
+
+    def _handler(self) -> type[BaseHTTPRequestHandler]:
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args: object) -> None:
+                pass
+
+            def _forward(self, method: str) -> None:
+                body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                response = app.push(function_url_event(method, self.path, body, dict(self.headers)), None)
+                content = (response.get("body") or "").encode("utf-8")
+                self.send_response(response["statusCode"])
+                self.send_header("Content-Length", str(len(content)))
+                self.end_headers()
+                self.wfile.write(content)
+
+            def do_GET(self) -> None:
+                self._forward("GET")
+
+            def do_POST(self) -> None:
+                self._forward("POST")
+
+        return Handler
+
+
+@pytest.fixture
+def hub() -> Iterator[StandInHub]:
+    # Grants a longer lease than the reader asks for
+    with StandInHub(lease_seconds=2 * LEASE_SECONDS) as stand_in_hub:
+        yield stand_in_hub
+
+
+@pytest.fixture
+def manager(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> Iterator[SubscriptionManager]:
+    """Points the reader's push handler at JSON file state, the stand-in registry and a Function URL"""
+    function_url = FunctionUrl()
+    threading.Thread(target=function_url.server.serve_forever, daemon=True).start()
+    subscription_manager = SubscriptionManager(SECRET, function_url.url, lease_seconds=LEASE_SECONDS)
+    monkeypatch.setattr(app, "subscription_manager", subscription_manager)
+    monkeypatch.setattr(app, "feed_state_store", JsonFileFeedStateStore(str(tmp_path / "feed_state.json")))
+    monkeypatch.setattr(app, "get_source_metadata", get_source_metadata)
+    yield subscription_manager
+    function_url.server.shutdown()
+    function_url.server.server_close()
+
+
+@pytest.fixture
+def uploads(monkeypatch: pytest.MonkeyPatch) -> list[tuple[str, list[str]]]:
+    uploaded: list[tuple[str, list[str]]] = []
+    monkeypatch.setattr(app, "upload_feed_to_s3", lambda feed, s3_key, _: uploaded.append((s3_key, [item.news_url for item in feed])))
+    return uploaded
+
+
+def stored_state(hub: StandInHub, **fields: int | None) -> FeedState:
+    """Stores the state of a feed that advertises the hub, and returns it as push loads it"""
+    app.feed_state_store.save("NDTV", [FeedState(feed_url=FEED_URL, hub=hub.url, topic=FEED_URL, **fields)])
+    return app.feed_state_store.load("NDTV")[FEED_URL]
+
+
+def callback(manager: SubscriptionManager, news_source: str = "NDTV") -> str:
+    return manager.callback(news_source, "IN", "EN", FEED_URL)
+
+
+def test_feed_links_advertise_the_hub(hub: StandInHub) -> None:
+    """The hub and self links of the channel are collected while the items are parsed"""
+    links: dict[str, str] = {}
+    items = parse_content_items(make_feed(hub.url, 2), FEED_URL, links)
+
+    assert len(items) == 2  # noqa: PLR2004
+    assert links == {"hub": hub.url, "self": FEED_URL}
+
+
+def test_subscribe_verify_and_push(hub: StandInHub, manager: SubscriptionManager, uploads: list) -> None:
+    """A requested subscription is verified with the requested lease, and signed pushes are uploaded once"""
+    now = int(time.time())
+    state = stored_state(hub, subscription_requested=now)
+
+    assert manager.subscribe(state, callback(manager))
+    assert hub.wait_for_verification(FEED_URL)
+    state = app.feed_state_store.load("NDTV")[FEED_URL]
+    assert state.subscription_requested is None
+    assert now + LEASE_SECONDS <= state.lease_expires <= int(time.time()) + LEASE_SECONDS
+    assert not SubscriptionManager.needs_subscription(state, now)
+
+    assert hub.publish(FEED_URL, make_feed(hub.url, 3)) == [202]
+    assert [urls for _, urls in uploads] == [[f"https://www.ndtv.com/india-news/story-{i}" for i in range(3)]]
+
+    # The same content pushed again has nothing new
+    assert hub.publish(FEED_URL, make_feed(hub.url, 3)) == [202]
+    assert len(uploads) == 1
+
+
+def test_unrequested_subscription_is_rejected(hub: StandInHub, manager: SubscriptionManager) -> None:
+    """A subscription the reader has no pending request for is not confirmed, and leaves the lease alone"""
+    lease_expires = int(time.time()) + 3600
+    state = stored_state(hub, lease_expires=lease_expires)
+
+    assert manager.subscribe(state, callback(manager))
+    assert not hub.wait_for_verification(FEED_URL)
+    assert app.feed_state_store.load("NDTV")[FEED_URL].lease_expires == lease_expires
+
+
+def test_requests_without_a_valid_token_are_rejected(hub: StandInHub, manager: SubscriptionManager) -> None:
+    """A denial that does not come through the callback handed to the hub does not end the lease"""
+    lease_expires = int(time.time()) + 3600
+    stored_state(hub, lease_expires=lease_expires)
+    denied = {"hub.mode": "denied", "hub.topic": FEED_URL, "hub.reason": "forged"}
+    query = {"source": "NDTV", "country": "IN", "language": "EN", "feed": FEED_URL}
+
+    for token in ({}, {"token": "0" * 64}, {"token": manager.callback_token("NDTV", "IN", "EN", "https://other/feed")}):
+        url = f"{manager.callback_url}?{urlencode({**query, **token, **denied})}"
+        assert app.push(function_url_event("GET", url), None)["statusCode"] == 404  # noqa: PLR2004
+
+    assert app.feed_state_store.load("NDTV")[FEED_URL].lease_expires == lease_expires
+
+
+def test_unknown_source_is_not_found(hub: StandInHub, manager: SubscriptionManager) -> None:
+    """A callback for a source the registry does not have is answered with 404"""
+    stored_state(hub, subscription_requested=int(time.time()))
+    params = {"hub.mode": "subscribe", "hub.topic": FEED_URL, "hub.challenge": "challenge", "hub.lease_seconds": "60"}
+    url = f"{callback(manager, 'UNKNOWN')}&{urlencode(params)}"
+
+    assert app.push(function_url_event("GET", url), None)["statusCode"] == 404  # noqa: PLR2004
+
+
+def test_push_with_forged_signature_is_ignored(hub: StandInHub, manager: SubscriptionManager, uploads: list) -> None:
+    """Content signed with another secret is acknowledged but not uploaded"""
+    state = stored_state(hub, subscription_requested=int(time.time()))
+    manager.subscribe(state, callback(manager))
+    assert hub.wait_for_verification(FEED_URL)
+
+    assert hub.publish(FEED_URL, make_feed(hub.url, 1), secret="forged") == [202]  # noqa: S106
+    assert uploads == []